@@ -0,0 +1,117 @@
+"""
+Blast-radius query latency on a synthetic access graph.
+
+Builds an ``AccessGraph`` from a seeded synthetic tenant (about one million
+edges at the default size) and times ``blast_radius`` for a random mix of
+Slack users, GitHub logins and email addresses, reporting build time, graph
+size and query latency percentiles:
+
+    python -m benchmarks.blast_radius
+    python -m benchmarks.blast_radius --resources 1000000 --queries 5000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.memory_inventory import RECORD_TYPES
+from benchmarks.run_benchmarks import _peak_rss_mb
+from sspm_engine.analytics.access_graph import AccessGraph
+from sspm_engine.records import normalize
+from sspm_engine.synthetic import INTERNAL_DOMAIN, generate_tenant, kind_counts
+
+# Roughly 3.8 edges per synthetic resource.
+DEFAULT_RESOURCES = 265_000
+
+
+def _principals(resources: int, queries: int, seed: int) -> List[str]:
+    people = kind_counts(resources)["slack_users"]
+    rng = random.Random(seed)
+    principals = []
+    for _ in range(queries):
+        person = rng.randrange(people)
+        principals.append(
+            rng.choice(
+                [
+                    f"U{person:08d}",
+                    f"user{person}",
+                    f"user{person}@{INTERNAL_DOMAIN}",
+                    f"user{person}@partner.io",
+                ]
+            )
+        )
+    return principals
+
+
+def _percentile(ordered: List[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def run(
+    resources: int = DEFAULT_RESOURCES,
+    seed: int = 7,
+    queries: int = 1000,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    graph = AccessGraph()
+    for kind, items in generate_tenant(resources, seed):
+        graph.add(kind, normalize(RECORD_TYPES[kind], items))
+    built = time.perf_counter() - started
+
+    # The first query builds the adjacency arrays.
+    started = time.perf_counter()
+    graph.blast_radius("")
+    indexed = time.perf_counter() - started
+
+    latencies = []
+    reached = 0
+    for principal in _principals(resources, queries, seed):
+        started = time.perf_counter()
+        radius = graph.blast_radius(principal, limit=limit)
+        latencies.append(time.perf_counter() - started)
+        reached += sum(radius.counts.values())
+    latencies.sort()
+
+    def ms(seconds: float) -> float:
+        return round(seconds * 1000, 3)
+
+    return {
+        "resources": resources,
+        "seed": seed,
+        "nodes": graph.node_count,
+        "edges": graph.edge_count,
+        "build_seconds": round(built, 2),
+        "index_seconds": round(indexed, 2),
+        "queries": queries,
+        "mean_reached": round(reached / queries, 1),
+        "p50_ms": ms(_percentile(latencies, 0.5)),
+        "p95_ms": ms(_percentile(latencies, 0.95)),
+        "p99_ms": ms(_percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1]),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resources", type=int, default=DEFAULT_RESOURCES)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100, help="Resources listed")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.resources, args.seed, args.queries, args.limit)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
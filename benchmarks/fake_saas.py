@@ -0,0 +1,461 @@
+"""
+Local fake of the Slack, GitHub and Google Workspace APIs the integrations use.
+
+The server holds a synthetic tenant (``sspm_engine.synthetic``) and serves it
+the way the real APIs do: cursor pagination for Slack ``users.list`` and
+``conversations.list``, ``Link`` header pagination for the GitHub REST
+organization, repository, collaborator, branch and member endpoints, and
+``pageToken`` pagination for Directory ``users.list`` and Drive
+``files.list`` (including the OAuth token endpoint service accounts use).
+Each request can be delayed, page sizes capped and a share of requests
+rejected with ``429 Too Many Requests`` and ``Retry-After``:
+
+    python -m benchmarks.fake_saas --scale 100k --latency 0.05 --rate-limit 0.02
+
+The integrations reach it through their ``base_url`` settings; ``tenant``
+builds a ``Tenant`` pointing every provider at a running server.
+``GET /_stats`` reports the requests served per endpoint.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from sspm_engine.models import Tenant
+from sspm_engine.synthetic import SCALES, generate_tenant
+
+ORG = "company"
+
+# Largest page each API returns, whatever the client asks for.
+MAX_PAGE_SIZES = {"slack": 1000, "github": 100, "directory": 500, "drive": 1000}
+
+# Repository fields served by GitHub; the rest of a synthetic repository is
+# served by the collaborator and branch endpoints.
+_REPO_EXTRA = ("collaborators", "branch_protection")
+
+Response = Tuple[int, Any, Dict[str, str]]
+
+
+class FakeSaaS:
+    """
+    Request handling and state of the fake APIs.
+
+    Args:
+        resources (int): Size of the synthetic tenant served.
+        seed (int): Seed for the tenant and for 429 injection.
+        latency (float): Seconds added to every response.
+        jitter (float): Up to this many further seconds, uniformly random.
+        rate_limit (float): Share of requests answered with 429.
+        retry_after (int): ``Retry-After`` seconds sent with a 429.
+        max_page_size (int, optional): Caps every API's page size below its
+            real maximum (``MAX_PAGE_SIZES``).
+    """
+
+    def __init__(
+        self,
+        resources: int = 10_000,
+        seed: int = 7,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        retry_after: int = 1,
+        max_page_size: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.data = {
+            kind: list(items) for kind, items in generate_tenant(resources, seed)
+        }
+        self.repos = {repo["name"]: repo for repo in self.data["github_repos"]}
+        self.base_url = ""
+        self.requests: Dict[str, int] = {}
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        # (name, method, path, handler); names follow the integrations'
+        # instrumentation, e.g. "github:repos.collaborators".
+        self._routes: List[Tuple[str, str, "re.Pattern[str]", Callable[..., Response]]]
+        self._routes = [
+            (name, method, re.compile(path), handler)
+            for name, method, path, handler in (
+                ("stats", "GET", r"/_stats", self._stats),
+                ("slack:users.list", "*", r"/slack/api/users\.list", self._slack_users),
+                (
+                    "slack:conversations.list",
+                    "*",
+                    r"/slack/api/conversations\.list",
+                    self._slack_channels,
+                ),
+                ("github:orgs.get", "GET", r"/github/orgs/([^/]+)", self._github_org),
+                (
+                    "github:orgs.repos",
+                    "GET",
+                    r"/github/orgs/([^/]+)/repos",
+                    self._github_repos,
+                ),
+                (
+                    "github:orgs.members",
+                    "GET",
+                    r"/github/orgs/([^/]+)/members",
+                    self._github_members,
+                ),
+                (
+                    "github:repos.collaborators",
+                    "GET",
+                    r"/github/repos/([^/]+)/([^/]+)/collaborators",
+                    self._github_collaborators,
+                ),
+                (
+                    "github:repos.branch",
+                    "GET",
+                    r"/github/repos/([^/]+)/([^/]+)/branches/([^/]+)",
+                    self._github_branch,
+                ),
+                ("google:token", "POST", r"/google/token", self._google_token),
+                (
+                    "google:directory.users.list",
+                    "GET",
+                    r"/google/admin/directory/v1/users",
+                    self._google_users,
+                ),
+                (
+                    "google:drive.files.list",
+                    "GET",
+                    r"/google/drive/v3/files",
+                    self._google_files,
+                ),
+            )
+        ]
+
+    def handle(
+        self, method: str, path: str, params: Dict[str, str], authorized: bool
+    ) -> Response:
+        """Answers one request; returns status, JSON body and extra headers."""
+        for endpoint, route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None or route_method not in ("*", method):
+                continue
+            with self._lock:
+                self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+                throttled = handler != self._stats and (
+                    self._rng.random() < self.rate_limit
+                )
+                if throttled:
+                    self.rate_limited += 1
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            if handler == self._stats:
+                return handler()
+            if delay:
+                time.sleep(delay)
+            if throttled:
+                return self._too_many_requests(path)
+            if not authorized and handler != self._google_token:
+                return 401, {"message": "Requires authentication"}, {}
+            return handler(*match.groups(), params=params)
+        return 404, {"message": "Not Found"}, {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "total": sum(self.requests.values()),
+                "rate_limited": self.rate_limited,
+            }
+
+    def _stats(self) -> Response:
+        return 200, self.stats(), {}
+
+    def _too_many_requests(self, path: str) -> Response:
+        headers = {"Retry-After": str(self.retry_after)}
+        if path.startswith("/slack/"):
+            return 429, {"ok": False, "error": "ratelimited"}, headers
+        if path.startswith("/github/"):
+            message = "You have exceeded a secondary rate limit."
+            return 429, {"message": message}, headers
+        error = {"code": 429, "message": "Rate Limit Exceeded"}
+        return 429, {"error": error}, headers
+
+    def _page_size(self, api: str, requested: Optional[str], default: int) -> int:
+        size = int(requested) if requested else default
+        return max(1, min(size, MAX_PAGE_SIZES[api], self.max_page_size or size))
+
+    # Slack: cursor pagination, errors reported in the body.
+
+    def _slack_page(self, items: List[Any], key: str, params: Dict[str, str]):
+        cursor = params.get("cursor")
+        offset = int(base64.b64decode(cursor).decode().split(":")[1]) if cursor else 0
+        end = offset + self._page_size("slack", params.get("limit"), 100)
+        body: Dict[str, Any] = {"ok": True, key: items[offset:end]}
+        next_cursor = (
+            base64.b64encode(f"offset:{end}".encode()).decode()
+            if end < len(items)
+            else ""
+        )
+        body["response_metadata"] = {"next_cursor": next_cursor}
+        return 200, body, {}
+
+    def _slack_users(self, params: Dict[str, str]) -> Response:
+        return self._slack_page(self.data["slack_users"], "members", params)
+
+    def _slack_channels(self, params: Dict[str, str]) -> Response:
+        return self._slack_page(self.data["slack_channels"], "channels", params)
+
+    # GitHub: page/per_page with Link headers; objects carry their API URLs.
+
+    def _github_url(self, path: str) -> str:
+        return f"{self.base_url}/github{path}"
+
+    def _github_page(self, items: List[Any], path: str, params: Dict[str, str]):
+        size = self._page_size("github", params.get("per_page"), 30)
+        page = int(params.get("page") or 1)
+        start, end = (page - 1) * size, page * size
+        headers = {}
+        last = max(1, -(-len(items) // size))
+        if page < last:
+            links = [
+                f"<{self._github_url(path)}?"
+                f'{urlencode({"per_page": size, "page": n})}>; rel="{rel}"'
+                for n, rel in ((page + 1, "next"), (last, "last"))
+            ]
+            headers["Link"] = ", ".join(links)
+        return 200, items[start:end], headers
+
+    def _github_org(self, org: str, params: Dict[str, str]) -> Response:
+        if org != ORG:
+            return 404, {"message": "Not Found"}, {}
+        url = self._github_url(f"/orgs/{org}")
+        return 200, {"login": org, "id": 1, "url": url, "repos_url": url + "/repos"}, {}
+
+    def _github_repos(self, org: str, params: Dict[str, str]) -> Response:
+        repos = [
+            {
+                **{k: v for k, v in repo.items() if k not in _REPO_EXTRA},
+                "owner": {"login": org},
+                "url": self._github_url(f"/repos/{org}/{repo['name']}"),
+            }
+            for repo in self.data["github_repos"]
+        ]
+        return self._github_page(repos, f"/orgs/{org}/repos", params)
+
+    def _github_members(self, org: str, params: Dict[str, str]) -> Response:
+        members = self.data["github_members"]
+        return self._github_page(members, f"/orgs/{org}/members", params)
+
+    def _github_collaborators(
+        self, org: str, name: str, params: Dict[str, str]
+    ) -> Response:
+        repo = self.repos.get(name)
+        if repo is None:
+            return 404, {"message": "Not Found"}, {}
+        logins = [{"login": login, "type": "User"} for login in repo["collaborators"]]
+        path = f"/repos/{org}/{name}/collaborators"
+        return self._github_page(logins, path, params)
+
+    def _github_branch(
+        self, org: str, name: str, branch: str, params: Dict[str, str]
+    ) -> Response:
+        repo = self.repos.get(name)
+        if repo is None or branch != repo["default_branch"]:
+            return 404, {"message": "Branch not found"}, {}
+        return 200, {"name": branch, "protected": repo["branch_protection"]}, {}
+
+    # Google: pageToken pagination.
+
+    def _google_token(self, params: Dict[str, str]) -> Response:
+        body = {
+            "access_token": "fake-token",
+            "expires_in": 3600,
+            "token_type": "Bearer",
+        }
+        return 200, body, {}
+
+    def _google_page(
+        self, items: List[Any], key: str, api: str, size: Optional[str], token: str
+    ) -> Response:
+        offset = int(token) if token else 0
+        end = offset + self._page_size(api, size, 100)
+        body: Dict[str, Any] = {key: items[offset:end]}
+        if end < len(items):
+            body["nextPageToken"] = str(end)
+        return 200, body, {}
+
+    def _google_users(self, params: Dict[str, str]) -> Response:
+        return self._google_page(
+            self.data["google_users"],
+            "users",
+            "directory",
+            params.get("maxResults"),
+            params.get("pageToken", ""),
+        )
+
+    def _google_files(self, params: Dict[str, str]) -> Response:
+        return self._google_page(
+            self.data["google_files"],
+            "files",
+            "drive",
+            params.get("pageSize"),
+            params.get("pageToken", ""),
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY each
+    # response would wait out the client's delayed ACK.
+    disable_nagle_algorithm = True
+    server: "FakeSaaSServer"
+
+    def _dispatch(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = self.rfile.read(length).decode()
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                params.update(json.loads(body))
+            else:
+                params.update({k: v[-1] for k, v in parse_qs(body).items()})
+        authorized = bool(self.headers.get("Authorization"))
+        status, payload, headers = self.server.app.handle(
+            self.command, url.path, params, authorized
+        )
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+
+class FakeSaaSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, app: FakeSaaS, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.app = app
+        app.base_url = self.url
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSaaSServer":
+        """Serves from a daemon thread; stop with ``shutdown()``."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def write_service_account(path: str, base_url: str):
+    """Writes service account credentials whose tokens come from the fake."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    credentials = {
+        "type": "service_account",
+        "project_id": "fake",
+        "private_key_id": "fake",
+        "private_key": pem,
+        "client_email": "sspm@fake.iam.gserviceaccount.com",
+        "client_id": "1",
+        "token_uri": f"{base_url}/google/token",
+    }
+    with open(path, "w") as f:
+        json.dump(credentials, f)
+
+
+def tenant(base_url: str, directory: str, **settings: Any) -> Tenant:
+    """
+    A tenant whose integrations call the fake server at ``base_url``.
+
+    ``settings`` are added to every provider section, e.g. ``page_size``.
+    Service account credentials are written to ``directory``.
+    """
+    credentials_file = os.path.join(directory, "fake-service-account.json")
+    if not os.path.exists(credentials_file):
+        write_service_account(credentials_file, base_url)
+    return Tenant(
+        id="fake-saas",
+        name=f"Fake SaaS APIs at {base_url}",
+        slack={"token": "xoxb-fake", "base_url": f"{base_url}/slack/api/", **settings},
+        github={
+            "token": "ghp_fake",
+            "org_name": ORG,
+            "base_url": f"{base_url}/github",
+            # The fake has no secondary rate limits to stay clear of.
+            "request_interval": None,
+            **settings,
+        },
+        google={
+            "credentials_file": credentials_file,
+            "subject_email": f"admin@{ORG}.com",
+            "base_url": f"{base_url}/google/",
+            **settings,
+        },
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="Share of requests given 429"
+    )
+    parser.add_argument("--retry-after", type=int, default=1, help="Seconds")
+    parser.add_argument("--max-page-size", type=int)
+    args = parser.parse_args(argv)
+
+    app = FakeSaaS(
+        SCALES[args.scale],
+        seed=args.seed,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        max_page_size=args.max_page_size,
+    )
+    server = FakeSaaSServer(app, args.host, args.port)
+    # The first line announces the address, e.g. for scripts using --port 0.
+    print(f"Serving on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Memory benchmark: raw provider dicts versus compact inventory records.
+
+Builds a seeded synthetic tenant (``sspm_engine.synthetic``), decodes it from
+JSON as an integration would, and compares the traced memory of the decoded
+dicts with the same inventory normalized into ``sspm_engine.records``.
+
+    python -m benchmarks.memory_inventory --resources 1000000
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Dict
+
+from sspm_engine.records import (
+    DriveFile,
+    GitHubMember,
+    GitHubRepo,
+    GoogleUser,
+    SlackChannel,
+    SlackUser,
+    normalize,
+)
+from sspm_engine.synthetic import generate_tenant
+
+RECORD_TYPES = {
+    "slack_users": SlackUser,
+    "slack_channels": SlackChannel,
+    "github_repos": GitHubRepo,
+    "github_members": GitHubMember,
+    "google_users": GoogleUser,
+    "google_files": DriveFile,
+}
+
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def run(resources: int, seed: int = 7) -> Dict[str, Any]:
+    # Decode from JSON so repeated values are distinct objects, as they are
+    # when an integration reads an API response.
+    payloads = {
+        kind: json.dumps(list(items))
+        for kind, items in generate_tenant(resources, seed)
+    }
+
+    tracemalloc.start()
+    baseline = _traced()
+    raw = {}
+    for kind in list(payloads):
+        raw[kind] = json.loads(payloads.pop(kind))
+    raw_bytes = _traced() - baseline
+
+    compact = {kind: normalize(RECORD_TYPES[kind], raw[kind]) for kind in raw}
+    total = sum(len(items) for items in compact.values())
+    del raw
+    compact_bytes = _traced() - baseline
+    tracemalloc.stop()
+
+    return {
+        "resources": total,
+        "raw_mb": round(raw_bytes / 2**20, 1),
+        "compact_mb": round(compact_bytes / 2**20, 1),
+        "ratio": round(raw_bytes / compact_bytes, 1),
+        "raw_bytes_per_resource": raw_bytes // total,
+        "compact_bytes_per_resource": compact_bytes // total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resources", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(args.resources, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Benchmark suite for fetch, scanners, risk analysis and reporting.
+
+Every case runs in a fresh process against a synthetic tenant
+(``sspm_engine.synthetic``) and records its throughput and the peak RSS of
+that process. Results can be saved as a baseline and later runs gated
+against it:
+
+    python -m benchmarks.run_benchmarks --scale 10k
+    python -m benchmarks.run_benchmarks --scale 10k --update-baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline-10k.json
+
+A run fails (exit status 1) when a case's throughput drops, or its peak RSS
+grows, by more than ``--tolerance`` relative to the baseline.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from sspm_engine.engine import PROVIDERS, SCANNER_CLASSES, SSPMEngine
+from sspm_engine.models import Tenant
+from sspm_engine.synthetic import MOCK_FILES, SCALES, write_tenant
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+REPORT_FORMATS = ("markdown", "json", "summary")
+EXPORT_FORMATS = ("ndjson", "sarif", "parquet")
+DEFAULT_TOLERANCE = 0.25
+MIN_RUNS = 3
+MAX_RUNS = 50
+MIN_SECONDS = 1.0
+
+
+def case_names() -> List[str]:
+    names = [f"fetch:{provider}" for provider in PROVIDERS]
+    names += [f"scan:{path.partition(':')[2]}" for path in SCANNER_CLASSES]
+    names.append("analyze")
+    names += [f"report:{fmt}" for fmt in REPORT_FORMATS]
+    names += [f"export:{fmt}" for fmt in EXPORT_FORMATS]
+    return names
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def run_case(name: str, tenant: Tenant, workdir: str) -> Dict[str, Any]:
+    """Sets up and times one case in the current process."""
+    engine = SSPMEngine(tenant=tenant)
+    kind, _, target = name.partition(":")
+
+    if kind == "fetch":
+
+        def operation():
+            return engine.fetch_provider(target)
+
+        def count(data):
+            return sum(len(items) for items in data.values())
+
+    elif kind == "scan":
+        data = engine.collect("all")
+        scanner = next(s for s in engine.scanners if type(s).__name__ == target)
+
+        def operation():
+            return scanner.scan(data)
+
+        def count(findings):
+            return sum(len(items) for items in data.values())
+
+    elif kind == "analyze":
+        findings = engine.scan_data(engine.collect("all"))
+
+        def operation():
+            return engine.risk_engine.analyze(findings)
+
+        def count(result):
+            return len(result.findings)
+
+    elif kind in ("report", "export"):
+        result = engine.run_scan("all")
+        path = os.path.join(workdir, f"benchmark.{target}")
+
+        def operation():
+            if kind == "report":
+                engine.generate_report(result, target, path)
+            else:
+                engine.export(result, {target: path})
+
+        def count(_):
+            return len(result.findings)
+
+    else:
+        raise ValueError(f"Unknown benchmark case: {name}")
+
+    setup_rss = _peak_rss_mb()
+    # Fast cases are repeated and the best run kept, so that millisecond
+    # timings do not make the regression gate flaky.
+    seconds = float("inf")
+    spent = 0.0
+    runs = 0
+    while runs < MIN_RUNS or (spent < MIN_SECONDS and runs < MAX_RUNS):
+        started = time.perf_counter()
+        output = operation()
+        elapsed = time.perf_counter() - started
+        seconds = min(seconds, elapsed)
+        spent += elapsed
+        runs += 1
+    items = count(output)
+    return {
+        "items": items,
+        "seconds": round(seconds, 4),
+        "runs": runs,
+        "throughput": round(items / seconds, 1) if seconds else None,
+        "setup_rss_mb": setup_rss,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _run_isolated(name: str, tenant: Tenant, workdir: str) -> Dict[str, Any]:
+    # A fresh interpreter per case keeps peak RSS attributable to that case.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(run_case, (name, tenant, workdir))
+
+
+def prepare_tenant(data_dir: str, resources: int, seed: int) -> Tenant:
+    """Writes the synthetic tenant unless ``data_dir`` already holds it."""
+    marker = os.path.join(data_dir, "tenant.json")
+    if os.path.exists(marker):
+        return Tenant.parse_file(marker)
+    tenant = write_tenant(data_dir, resources, seed)
+    with open(marker, "w") as f:
+        f.write(tenant.json())
+    return tenant
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Describes every case that regressed beyond ``tolerance``."""
+    regressions = []
+    for name, expected in baseline.items():
+        actual = results.get(name)
+        if actual is None:
+            continue
+        if expected.get("throughput") and actual.get("throughput") is not None:
+            floor = expected["throughput"] * (1 - tolerance)
+            if actual["throughput"] < floor:
+                regressions.append(
+                    f"{name}: throughput {actual['throughput']}/s is below "
+                    f"{floor:.1f}/s (baseline {expected['throughput']}/s)"
+                )
+        if expected.get("peak_rss_mb") and actual.get("peak_rss_mb") is not None:
+            ceiling = expected["peak_rss_mb"] * (1 + tolerance)
+            if actual["peak_rss_mb"] > ceiling:
+                regressions.append(
+                    f"{name}: peak RSS {actual['peak_rss_mb']} MB exceeds "
+                    f"{ceiling:.1f} MB (baseline {expected['peak_rss_mb']} MB)"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--case",
+        action="append",
+        help="Run only cases starting with this prefix, e.g. 'scan:'; repeatable",
+    )
+    parser.add_argument(
+        "--data-dir",
+        help="Where the synthetic tenant is written and reused "
+        "[default: .benchmarks/<scale>-seed<seed>]",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Fail on regressions against this file")
+    parser.add_argument(
+        "--update-baseline",
+        nargs="?",
+        const="",
+        help="Save results as the baseline [default: benchmarks/baseline-<scale>.json]",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir or os.path.join(
+        ".benchmarks", f"{args.scale}-seed{args.seed}"
+    )
+    print(f"Preparing {args.scale} tenant in {data_dir}...", file=sys.stderr)
+    tenant = prepare_tenant(data_dir, SCALES[args.scale], args.seed)
+
+    names = [
+        name
+        for name in case_names()
+        if not args.case or any(name.startswith(prefix) for prefix in args.case)
+    ]
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            try:
+                results[name] = _run_isolated(name, tenant, workdir)
+            except ImportError as e:
+                print(f"{name:32} skipped: {e}", file=sys.stderr)
+                continue
+            stats = results[name]
+            print(
+                f"{name:32} {stats['items']:>9} items {stats['seconds']:>9.3f}s "
+                f"{stats['throughput'] or 0:>12.1f}/s {stats['peak_rss_mb']:>8} MB"
+            )
+
+    document = {
+        "scale": args.scale,
+        "seed": args.seed,
+        "python": sys.version.split()[0],
+        "files": {
+            p: os.path.getsize(os.path.join(data_dir, f)) for p, f in MOCK_FILES.items()
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.update_baseline is not None:
+        path = args.update_baseline or os.path.join(
+            "benchmarks", f"baseline-{args.scale}.json"
+        )
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {path}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get("scale"), baseline.get("seed")) != (args.scale, args.seed):
+            print("Baseline was recorded for another scale or seed.", file=sys.stderr)
+            return 2
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+End-to-end ``run_scan`` throughput against the fake SaaS APIs.
+
+Starts ``benchmarks.fake_saas`` in a separate process (so serving requests
+does not compete with the scan for the interpreter) and scans it through the
+live Slack, GitHub and Google Workspace integrations, reporting resources per
+second, requests served, injected rate limits and per-call latency:
+
+    python -m benchmarks.scan_throughput --scale 10k --latency 0.02
+    python -m benchmarks.scan_throughput --latency 0.05 --rate-limit 0.02
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.fake_saas import tenant
+from sspm_engine.engine import PROVIDERS, SSPMEngine
+from sspm_engine.synthetic import SCALES
+
+
+def _start_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.fake_saas",
+        "--port=0",
+        f"--scale={args.scale}",
+        f"--seed={args.seed}",
+        f"--latency={args.latency}",
+        f"--jitter={args.jitter}",
+        f"--rate-limit={args.rate_limit}",
+        f"--retry-after={args.retry_after}",
+    ]
+    if args.max_page_size:
+        command.append(f"--max-page-size={args.max_page_size}")
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    assert server.stdout is not None
+    line = server.stdout.readline()
+    if not line.startswith("Serving on "):
+        server.kill()
+        raise RuntimeError("Fake SaaS server failed to start")
+    return server, line.split()[-1]
+
+
+def _server_stats(url: str) -> Dict[str, Any]:
+    with urllib.request.urlopen(f"{url}/_stats") as response:
+        return dict(json.load(response))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server, url = _start_server(args)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            settings = {"page_size": args.page_size} if args.page_size else {}
+            engine = SSPMEngine(tenant=tenant(url, directory, **settings))
+            runs = []
+            for _ in range(args.runs):
+                before = _server_stats(url)
+                started = time.perf_counter()
+                result = engine.run_scan(args.provider)
+                seconds = time.perf_counter() - started
+                after = _server_stats(url)
+                resources = sum(
+                    s.get("resources", 0)
+                    for s in result.metadata["instrumentation"]["spans"]
+                    if s["name"].startswith("fetch:")
+                )
+                runs.append(
+                    {
+                        "resources": resources,
+                        "findings": len(result.findings),
+                        "seconds": round(seconds, 3),
+                        "throughput": round(resources / seconds, 1),
+                        "requests": after["total"] - before["total"],
+                        "rate_limited": after["rate_limited"] - before["rate_limited"],
+                        "api_calls": result.metadata["instrumentation"]["api_calls"],
+                    }
+                )
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "scale": args.scale,
+        "seed": args.seed,
+        "provider": args.provider,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "rate_limit": args.rate_limit,
+        "page_size": args.page_size,
+        "runs": runs,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--provider", choices=("all",) + PROVIDERS, default="all")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="Share of requests given 429"
+    )
+    parser.add_argument("--retry-after", type=int, default=1, help="Seconds")
+    parser.add_argument("--page-size", type=int, help="Page size integrations ask for")
+    parser.add_argument("--max-page-size", type=int, help="Page size the server caps")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    for n, stats in enumerate(results["runs"], 1):
+        print(
+            f"run {n}: {stats['resources']} resources in {stats['seconds']:.2f}s "
+            f"({stats['throughput']:.1f}/s), {stats['requests']} requests, "
+            f"{stats['rate_limited']} rate limited, {stats['findings']} findings"
+        )
+        for provider, calls in sorted(stats["api_calls"].items()):
+            for call, call_stats in sorted(calls.items()):
+                print(
+                    f"  {provider + ':' + call:32} {call_stats['count']:>7} calls "
+                    f"mean {call_stats['mean_seconds'] * 1000:8.1f} ms "
+                    f"max {call_stats['max_seconds'] * 1000:8.1f} ms"
+                )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Secret scanner throughput on synthetic repository content.
+
+Generates seeded repositories whose descriptions read like README excerpts
+(prose, code, paths, URLs, commit hashes and image digests) with known
+secrets planted in a fraction of them, then times ``SecretScanner.scan`` and
+the entropy stage on its own (candidate extraction and batched scoring).
+Reports MB/s, how many planted secrets were found and how many findings were
+not planted:
+
+    python -m benchmarks.secret_scan
+    python -m benchmarks.secret_scan --repos 50000 --text-bytes 4096
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.run_benchmarks import _peak_rss_mb
+from sspm_engine.scanners import entropy
+from sspm_engine.scanners.secret_scanner import SecretScanner
+
+WORDS = (
+    "the service reads configuration from environment and retries failed "
+    "requests with exponential backoff before reporting errors to the team "
+    "deploy staging production cluster database migration release notes"
+).split()
+
+LINES = (
+    "def handle_request(self, payload: Dict[str, Any]) -> Response:",
+    "    return self.client.post(url, json=payload, timeout=30)",
+    "See https://github.com/company/platform/blob/main/docs/setup.md",
+    "src/main/java/com/company/service/UserServiceImplementation.java",
+    "export DATABASE_URL=postgres://app@db.internal:5432/application",
+    "npm install --save-dev @company/eslint-config-platform",
+    "Build #{build} passed in {seconds}s on runner-{runner}",
+    "Built from commit {commit} (image sha256:{digest})",
+)
+
+_BASE64 = string.ascii_letters + string.digits + "+/"
+
+
+def _secret(rng: random.Random) -> Tuple[str, str]:
+    kind = rng.choice(["base64", "hex", "aws"])
+    if kind == "base64":
+        return kind, "".join(rng.choice(_BASE64) for _ in range(40))
+    if kind == "hex":
+        return kind, "%032x" % rng.getrandbits(128)
+    return kind, "AKIA" + "".join(
+        rng.choice(string.ascii_uppercase + string.digits) for _ in range(16)
+    )
+
+
+def _text(rng: random.Random, size: int) -> str:
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.5:
+            part = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16)))
+        else:
+            part = rng.choice(LINES).format(
+                build=rng.randrange(10000),
+                seconds=rng.randrange(600),
+                runner=rng.randrange(64),
+                commit="%040x" % rng.getrandbits(160),
+                digest="%064x" % rng.getrandbits(256),
+            )
+        parts.append(part)
+        length += len(part) + 1
+    return "\n".join(parts)
+
+
+def generate_repos(
+    count: int, text_bytes: int, secret_share: float, seed: int
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Repositories and the secret planted in each (repo name -> kind)."""
+    rng = random.Random(seed)
+    repos = []
+    planted = {}
+    for i in range(count):
+        description = _text(rng, text_bytes)
+        if rng.random() < secret_share:
+            kind, secret = _secret(rng)
+            cut = rng.randrange(len(description))
+            while cut and not description[cut - 1].isspace():
+                cut -= 1
+            description = f"{description[:cut]}token {secret} {description[cut:]}"
+            planted[f"github_repo:repo-{i}"] = kind
+        repos.append({"name": f"repo-{i}", "description": description})
+    return repos, planted
+
+
+def run(
+    repos: int = 20000,
+    text_bytes: int = 2048,
+    secret_share: float = 0.05,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    data, planted = generate_repos(repos, text_bytes, secret_share, seed)
+    texts = [repo["description"] for repo in data]
+    megabytes = sum(len(text) for text in texts) / 1e6
+    scanner = SecretScanner({})
+
+    started = time.perf_counter()
+    candidates = entropy.extract_candidates(texts)
+    extracted = time.perf_counter() - started
+    started = time.perf_counter()
+    entropy.shannon_entropy([candidate.token for candidate in candidates])
+    scored = time.perf_counter() - started
+
+    started = time.perf_counter()
+    findings = scanner.scan({"github_repos": data})
+    scanned = time.perf_counter() - started
+
+    found = {finding.resource_id for finding in findings}
+    unplanted = sum(1 for finding in findings if finding.resource_id not in planted)
+    return {
+        "repos": repos,
+        "seed": seed,
+        "megabytes": round(megabytes, 1),
+        "numpy": entropy.numpy is not None,
+        "candidates": len(candidates),
+        "extract_seconds": round(extracted, 3),
+        "score_seconds": round(scored, 3),
+        "scan_seconds": round(scanned, 3),
+        "scan_mb_per_second": round(megabytes / scanned, 1),
+        "planted": len(planted),
+        "planted_found": len(found & set(planted)),
+        "unplanted_findings": unplanted,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repos", type=int, default=20000)
+    parser.add_argument(
+        "--text-bytes", type=int, default=2048, help="Description size per repo"
+    )
+    parser.add_argument(
+        "--secret-share",
+        type=float,
+        default=0.05,
+        help="Share of repositories with a planted secret",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.repos, args.text_bytes, args.secret_share, args.seed)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
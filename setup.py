@@ -22,7 +22,7 @@ setup(
         "requests>=2.26.0",
         "pydantic>=1.8.2",
         "slack-sdk>=3.11.0",
-        "PyGithub>=1.55",
+        "PyGithub>=2.1.0",
         "google-api-python-client>=2.0.0",
         "google-auth-httplib2>=0.1.0",
         "google-auth-oauthlib>=0.4.0",
@@ -31,6 +31,9 @@ setup(
         "pandas>=1.3.0",
     ],
     extras_require={
+        "fast": ["orjson>=3.6"],
+        "export": ["pyarrow>=8.0", "zstandard>=0.18"],
+        "distributed": ["redis>=4.2"],
         "dev": [
             "pytest>=6.2",
             "black>=22.0",
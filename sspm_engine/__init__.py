@@ -1,3 +1,22 @@
+import importlib
+from typing import Any
+
 __version__ = "1.0.0"
-from .engine import SSPMEngine
-from .models import Finding, ScanResult, Severity
+
+# Public names are resolved on first access so that importing a submodule
+# (e.g. the CLI) does not pull in the engine and every provider SDK.
+_LAZY_ATTRIBUTES = {
+    "SSPMEngine": ".engine",
+    "Finding": ".models",
+    "ScanResult": ".models",
+    "Severity": ".models",
+}
+
+__all__ = ["SSPMEngine", "Finding", "ScanResult", "Severity"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
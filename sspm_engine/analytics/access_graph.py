@@ -0,0 +1,303 @@
+"""
+Access graph over fetched inventory, for blast-radius queries.
+
+Nodes are principals (Slack users, GitHub users, Google accounts, domains)
+and resources (Slack channels, GitHub repositories, Drive files), numbered
+with dense integer ids. Edges say which principal reaches which node and
+with what access:
+
+* Slack user -> channel, for each channel ``members`` entry
+* GitHub user -> repository, for each ``collaborators`` entry; organization
+  admins -> every repository (through a ``github_org:admins`` group)
+* Google account -> file, for the owner and each user ``permissions`` entry;
+  Google account -> ``google_domain:<domain>`` -> files shared with the domain
+
+Edges are kept as compressed adjacency arrays (CSR), so a query is a
+breadth-first walk over integer arrays and touches only what the principal
+reaches::
+
+    graph = AccessGraph.from_inventory(engine.collect("all"))
+    graph.blast_radius("alice@company.com").counts
+    # {"slack_channel": 3, "github_repo": 0, "google_file": 41}
+
+Keys follow finding ``resource_id`` prefixes (``github_repo:<name>``,
+``slack_user:<id>``); channels and files are keyed like the resident
+``Inventory`` (by id, falling back to the name).
+"""
+
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from ..inventory import resource_key
+
+RESOURCE_KINDS = ("slack_channel", "github_repo", "google_file")
+
+ORG_ADMINS = "github_org:admins"
+ANYONE = "google_anyone:*"
+
+
+class Reach(NamedTuple):
+    """A resource reached by a principal, with the access of the first path."""
+
+    resource: str
+    name: Optional[str]
+    access: str
+    via: str
+
+    def dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class BlastRadius(NamedTuple):
+    principal: str
+    accounts: List[str]
+    counts: Dict[str, int]
+    resources: List[Reach]
+    truncated: bool
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "principal": self.principal,
+            "accounts": self.accounts,
+            "counts": self.counts,
+            "resources": [reach.dict() for reach in self.resources],
+            "truncated": self.truncated,
+        }
+
+
+def _kind(key: str) -> str:
+    return key.partition(":")[0]
+
+
+class AccessGraph:
+    """
+    Who-reaches-what index over one tenant's inventory.
+
+    Add inventory with ``add`` (or build it in one go with
+    ``from_inventory``); the adjacency arrays are built on the first query
+    after a change.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self.names: List[Optional[str]] = []
+        self.kinds: List[str] = []
+        # Lower-cased ids, names and emails -> account nodes they identify.
+        self._aliases: Dict[str, List[int]] = {}
+        self._roles: Dict[str, int] = {}
+        self.role_names: List[str] = []
+        self._sources = array("l")
+        self._targets = array("l")
+        self._edge_roles = array("H")
+        self._lock = threading.Lock()
+        self._offsets: Optional[array] = None
+        self._adjacent = array("l")
+        self._adjacent_roles = array("H")
+
+    @classmethod
+    def from_inventory(cls, data: Mapping[str, Iterable[Any]]) -> "AccessGraph":
+        """Builds the graph of ``collect`` output (``slack_users`` etc.)."""
+        graph = cls()
+        for kind, resources in data.items():
+            graph.add(kind, resources)
+        return graph
+
+    @property
+    def node_count(self) -> int:
+        return len(self.keys)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._sources)
+
+    def _node(self, key: str, name: Optional[str] = None) -> int:
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.names.append(name)
+            self.kinds.append(_kind(key))
+        elif name is not None and self.names[node] is None:
+            self.names[node] = name
+        return node
+
+    def _alias(self, alias: Optional[str], node: int):
+        if not alias:
+            return
+        nodes = self._aliases.setdefault(alias.lower(), [])
+        if node not in nodes:
+            nodes.append(node)
+
+    def _edge(self, source: int, target: int, role: str):
+        code = self._roles.get(role)
+        if code is None:
+            code = self._roles[role] = len(self.role_names)
+            self.role_names.append(role)
+        self._sources.append(source)
+        self._targets.append(target)
+        self._edge_roles.append(code)
+        self._offsets = None
+
+    def _google_account(self, email: str) -> int:
+        key = f"google_user:{email.lower()}"
+        account = self._ids.get(key)
+        if account is not None:
+            return account
+        account = self._node(key, email)
+        self._alias(email, account)
+        domain = email.rpartition("@")[2].lower()
+        if domain:
+            group = self._node(f"google_domain:{domain}", domain)
+            self._edge(account, group, "domain_member")
+        return account
+
+    def add(self, kind: str, resources: Iterable[Any]):
+        """Adds one inventory kind, e.g. ``("github_repos", repos)``."""
+        if kind == "slack_users":
+            for user in resources:
+                node = self._node(
+                    f"slack_user:{resource_key(kind, user)}", user.get("name")
+                )
+                for alias in (user.get("id"), user.get("name"), user.get("email")):
+                    self._alias(alias, node)
+        elif kind == "slack_channels":
+            for channel in resources:
+                target = self._node(
+                    f"slack_channel:{resource_key(kind, channel)}", channel.get("name")
+                )
+                for member in channel.get("members") or ():
+                    self._edge(self._node(f"slack_user:{member}"), target, "member")
+        elif kind == "github_members":
+            admins = None
+            for member in resources:
+                node = self._node(f"github_user:{member['login']}", member["login"])
+                self._alias(member["login"], node)
+                if member.get("role") == "admin":
+                    admins = self._node(ORG_ADMINS) if admins is None else admins
+                    self._edge(node, admins, "org_admin")
+        elif kind == "github_repos":
+            admins = self._node(ORG_ADMINS)
+            for repo in resources:
+                target = self._node(f"github_repo:{repo['name']}", repo["name"])
+                self._edge(admins, target, "admin")
+                for login in repo.get("collaborators") or ():
+                    source = self._node(f"github_user:{login}", login)
+                    self._alias(login, source)
+                    self._edge(source, target, "collaborator")
+        elif kind == "google_users":
+            for user in resources:
+                if user.get("email"):
+                    self._google_account(user["email"])
+        elif kind == "google_files":
+            for drive_file in resources:
+                target = self._node(
+                    f"google_file:{resource_key(kind, drive_file)}",
+                    drive_file.get("name"),
+                )
+                if drive_file.get("owner"):
+                    self._edge(
+                        self._google_account(drive_file["owner"]), target, "owner"
+                    )
+                for permission in drive_file.get("permissions") or ():
+                    self._add_permission(permission, target)
+
+    def _add_permission(self, permission: Any, target: int):
+        grantee = permission.get("type")
+        role = permission.get("role") or "reader"
+        if grantee in ("user", "group") and permission.get("email"):
+            self._edge(self._google_account(permission["email"]), target, role)
+        elif grantee == "domain" and permission.get("domain"):
+            domain = permission["domain"].lower()
+            self._edge(self._node(f"google_domain:{domain}", domain), target, role)
+        elif grantee == "anyone":
+            self._edge(self._node(ANYONE), target, role)
+
+    def _index(self) -> array:
+        # Counting sort of the edge list by source into CSR arrays: the
+        # targets of node n are adjacent[offsets[n]:offsets[n + 1]].
+        with self._lock:
+            if self._offsets is not None:
+                return self._offsets
+            nodes = len(self.keys)
+            offsets = array("l", [0]) * (nodes + 1)
+            for source in self._sources:
+                offsets[source + 1] += 1
+            for node in range(nodes):
+                offsets[node + 1] += offsets[node]
+            position = array("l", offsets)
+            adjacent = array("l", [0]) * len(self._sources)
+            roles = array("H", [0]) * len(self._sources)
+            for source, target, role in zip(
+                self._sources, self._targets, self._edge_roles
+            ):
+                slot = position[source]
+                adjacent[slot] = target
+                roles[slot] = role
+                position[source] = slot + 1
+            self._adjacent = adjacent
+            self._adjacent_roles = roles
+            self._offsets = offsets
+            return offsets
+
+    def accounts(self, principal: str) -> List[str]:
+        """Account nodes matching a Slack id/name/email, GitHub login or email."""
+        return [self.keys[n] for n in self._aliases.get(principal.lower(), [])]
+
+    def blast_radius(
+        self,
+        principal: str,
+        include_public: bool = False,
+        limit: Optional[int] = None,
+    ) -> BlastRadius:
+        """
+        Everything the accounts matching ``principal`` can reach.
+
+        Group grants (GitHub org admin, Google domain sharing) are followed;
+        files shared with anyone who has the link only count when
+        ``include_public`` is set. ``counts`` always covers every reachable
+        resource, ``resources`` at most ``limit`` of them.
+        """
+        offsets = self._index()
+        adjacent, roles, kinds = self._adjacent, self._adjacent_roles, self.kinds
+        starts = list(self._aliases.get(principal.lower(), []))
+        if include_public and ANYONE in self._ids:
+            starts.append(self._ids[ANYONE])
+
+        counts = dict.fromkeys(RESOURCE_KINDS, 0)
+        reached: List[Reach] = []
+        seen = set(starts)
+        frontier = starts
+        while frontier:
+            following = []
+            for node in frontier:
+                end = offsets[node + 1]
+                for slot in range(offsets[node], end):
+                    target = adjacent[slot]
+                    if target in seen:
+                        continue
+                    seen.add(target)
+                    kind = kinds[target]
+                    if kind not in counts:
+                        following.append(target)
+                        continue
+                    counts[kind] += 1
+                    if limit is None or len(reached) < limit:
+                        reached.append(
+                            Reach(
+                                self.keys[target],
+                                self.names[target],
+                                self.role_names[roles[slot]],
+                                self.keys[node],
+                            )
+                        )
+            frontier = following
+
+        return BlastRadius(
+            principal=principal,
+            accounts=[self.keys[n] for n in self._aliases.get(principal.lower(), [])],
+            counts=counts,
+            resources=reached,
+            truncated=limit is not None and sum(counts.values()) > len(reached),
+        )
@@ -0,0 +1,139 @@
+"""
+Scan-to-scan diffing by finding fingerprint.
+
+The baseline is loaded into a hash map keyed by fingerprint and the newer
+scan is streamed against it, so a diff costs one pass over each side. Only
+the fields needed to report a finding are retained for the baseline, which
+keeps two million-finding snapshots well within memory.
+"""
+
+import os
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Set, Tuple, Union
+
+from ..models import Finding, ScanResult, finding_fingerprint
+from ..serialization import loads, open_input
+
+FindingLike = Union[Finding, Dict[str, Any]]
+
+# Compact baseline entry: rule_id, resource_id, resource_type, severity,
+# category, details.
+_Record = Tuple[str, str, str, str, str, str]
+_FIELDS = ("rule_id", "resource_id", "resource_type", "severity", "category", "details")
+
+
+class DiffStatus(str, Enum):
+    NEW = "new"
+    RESOLVED = "resolved"
+    UNCHANGED = "unchanged"
+
+
+class DiffEntry(NamedTuple):
+    status: DiffStatus
+    fingerprint: str
+    finding: Dict[str, Any]
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status.value,
+            "fingerprint": self.fingerprint,
+            **self.finding,
+        }
+
+
+class DiffCounter:
+    """Counts entries per status while passing them through."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {status.value: 0 for status in DiffStatus}
+
+    def __getitem__(self, status: str) -> int:
+        return self.counts[status]
+
+    def track(self, entries: Iterable[DiffEntry]) -> Iterator[DiffEntry]:
+        for entry in entries:
+            self.counts[entry.status.value] += 1
+            yield entry
+
+
+def fingerprint_of(item: FindingLike) -> str:
+    if isinstance(item, Finding):
+        return item.fingerprint
+    return item.get("fingerprint") or finding_fingerprint(
+        item["rule_id"], item["resource_id"], item.get("data")
+    )
+
+
+def _record(item: FindingLike) -> _Record:
+    if isinstance(item, Finding):
+        return (
+            item.rule_id,
+            item.resource_id,
+            item.resource_type.value,
+            item.severity.value,
+            item.category,
+            item.details,
+        )
+    get = item.get
+    return (
+        str(get("rule_id", "")),
+        str(get("resource_id", "")),
+        str(get("resource_type", "")),
+        str(get("severity", "")),
+        str(get("category", "")),
+        str(get("details", "")),
+    )
+
+
+def iter_diff(
+    old: Iterable[FindingLike], new: Iterable[FindingLike]
+) -> Iterator[DiffEntry]:
+    """
+    Compares two scans in linear time.
+
+    Yields ``NEW`` and ``UNCHANGED`` entries while ``new`` is consumed, then
+    every ``RESOLVED`` entry. Findings sharing a fingerprint within one scan
+    count once.
+    """
+    baseline: Dict[str, _Record] = {}
+    for item in old:
+        baseline.setdefault(fingerprint_of(item), _record(item))
+
+    seen: Set[str] = set()
+    for item in new:
+        fingerprint = fingerprint_of(item)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        status = DiffStatus.NEW
+        if baseline.pop(fingerprint, None) is not None:
+            status = DiffStatus.UNCHANGED
+        yield DiffEntry(status, fingerprint, dict(zip(_FIELDS, _record(item))))
+    del seen
+
+    for fingerprint, record in baseline.items():
+        yield DiffEntry(DiffStatus.RESOLVED, fingerprint, dict(zip(_FIELDS, record)))
+
+
+def iter_snapshot(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Reads findings from a saved scan.
+
+    NDJSON exports (``.ndjson``, optionally ``.gz``/``.zst``) are streamed line
+    by line; JSON reports (a serialized ``ScanResult``) are loaded whole.
+    """
+    stem, extension = os.path.splitext(path)
+    if extension in (".gz", ".zst"):
+        stem, extension = os.path.splitext(stem)
+
+    with open_input(path) as f:
+        if extension in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+        else:
+            yield from loads(f.read()).get("findings", [])
+
+
+def diff_results(old: ScanResult, new: ScanResult) -> Iterator[DiffEntry]:
+    return iter_diff(old.findings, new.findings)
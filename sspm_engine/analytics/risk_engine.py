@@ -19,18 +19,17 @@ class RiskEngine:
             print(f"Error loading rules: {e}")
             return {}
 
-    def analyze(self, findings: List[Finding]) -> ScanResult:
-        enriched_findings = []
-
-        for finding in findings:
-            rule = self.rules.get(finding.rule_id)
-            if rule:
-                # Update severity/category from config if it overrides code
-                if "severity" in rule:
-                    finding.severity = Severity(rule.get("severity"))
-                finding.category = rule.get("category", finding.category)
+    def enrich(self, finding: Finding) -> Finding:
+        rule = self.rules.get(finding.rule_id)
+        if rule:
+            # Update severity/category from config if it overrides code
+            if "severity" in rule:
+                finding.severity = Severity(rule.get("severity"))
+            finding.category = rule.get("category", finding.category)
+        return finding
 
-            enriched_findings.append(finding)
+    def analyze(self, findings: List[Finding]) -> ScanResult:
+        enriched_findings = [self.enrich(finding) for finding in findings]
 
         score = self.scorer.calculate_score(enriched_findings)
         counts = self._count_severities(enriched_findings)
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from ..models import ScanResult
+
+
+def _complete(result: ScanResult) -> bool:
+    providers = result.metadata.get("providers") or {}
+    return all(status.get("complete", True) for status in providers.values())
+
+
+class CacheEntry:
+    def __init__(self, result: ScanResult, created_at: float, hit: bool):
+        self.result = result
+        self.created_at = created_at
+        self.hit = hit
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[CacheEntry] = None
+        self.error: Optional[BaseException] = None
+
+
+class ScanCache:
+    """
+    TTL cache of scan results with single-flight coalescing.
+
+    Results are cached per provider for ``ttl_seconds``. When several callers
+    ask for the same provider while no fresh result exists, only the first
+    one runs the scan; the others wait for it and share its result (or its
+    exception). ``refresh=True`` bypasses the cached value but still joins a
+    scan that is already in flight.
+
+    ``invalidate`` bumps a per-provider generation; a scan that was in flight
+    when it ran still answers its waiters but is not cached, since it may
+    predate the change that caused the invalidation. Results with a provider
+    that was not fetched completely (``metadata["providers"]``) are not
+    cached either, so the next request retries the fetch.
+    """
+
+    def __init__(
+        self,
+        scan: Callable[[str], ScanResult],
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.scan = scan
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CacheEntry] = {}
+        self._flights: Dict[str, _Flight] = {}
+        # Bumped by invalidate(); _epoch covers invalidate() of everything.
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, provider: str, refresh: bool = False) -> CacheEntry:
+        with self._lock:
+            entry = self._entries.get(provider)
+            if entry is not None and not refresh and not self._expired(entry):
+                return CacheEntry(entry.result, entry.created_at, hit=True)
+
+            leader = provider not in self._flights
+            if leader:
+                self._flights[provider] = _Flight()
+            flight = self._flights[provider]
+            generation = self._generation(provider)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.entry  # type: ignore[return-value]
+
+        try:
+            result = self.scan(provider)
+            flight.entry = CacheEntry(result, self.clock(), hit=False)
+            with self._lock:
+                if self._generation(provider) == generation and _complete(result):
+                    self._entries[provider] = flight.entry
+            return flight.entry
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[provider]
+            flight.done.set()
+
+    def age(self, entry: CacheEntry) -> float:
+        return max(self.clock() - entry.created_at, 0.0)
+
+    def invalidate(self, provider: Optional[str] = None):
+        with self._lock:
+            if provider is None:
+                self._entries.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(provider, None)
+                self._generations[provider] = self._generations.get(provider, 0) + 1
+
+    def _generation(self, provider: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(provider, 0)
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return self.age(entry) >= self.ttl_seconds
@@ -0,0 +1,124 @@
+import base64
+import threading
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from ..models import Finding, ScanResult
+from ..serialization import dumps, loads
+
+SortKey = Tuple[str, str, int]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class FindingFilter:
+    """Server-side filter; each field matches any of its values."""
+
+    def __init__(
+        self,
+        severity: Optional[Sequence[str]] = None,
+        provider: Optional[Sequence[str]] = None,
+        rule_id: Optional[Sequence[str]] = None,
+        category: Optional[Sequence[str]] = None,
+    ):
+        self.severity = {s.upper() for s in severity} if severity else None
+        self.provider = set(provider) if provider else None
+        self.rule_id = set(rule_id) if rule_id else None
+        self.category = set(category) if category else None
+
+    def matches(self, finding: Finding) -> bool:
+        return (
+            (self.severity is None or finding.severity.value in self.severity)
+            and (self.rule_id is None or finding.rule_id in self.rule_id)
+            and (self.category is None or finding.category in self.category)
+            and (self.provider is None or finding.provider in self.provider)
+        )
+
+
+class FindingIndex:
+    """
+    Findings of one scan result in a stable keyset order.
+
+    Findings are ordered by ``(resource_id, rule_id, n)`` where ``n`` numbers
+    duplicates of the same pair, so a cursor holding the last key returned
+    resumes exactly where the previous page stopped.
+    """
+
+    _lock = threading.Lock()
+    _latest: Optional[Tuple[ScanResult, "FindingIndex"]] = None
+
+    def __init__(self, findings: List[Finding]):
+        ordered = sorted(findings, key=lambda f: (f.resource_id, f.rule_id))
+        self.keys: List[SortKey] = []
+        self.findings: List[Finding] = ordered
+        previous: Optional[Tuple[str, str]] = None
+        n = 0
+        for finding in ordered:
+            pair = (finding.resource_id, finding.rule_id)
+            n = n + 1 if pair == previous else 0
+            previous = pair
+            self.keys.append((finding.resource_id, finding.rule_id, n))
+
+    @classmethod
+    def for_result(cls, result: ScanResult) -> "FindingIndex":
+        """Returns the index for ``result``, reusing it across requests."""
+        with cls._lock:
+            if cls._latest is None or cls._latest[0] is not result:
+                cls._latest = (result, cls(result.findings))
+            return cls._latest[1]
+
+    def iter_from(
+        self, cursor: Optional[str], finding_filter: FindingFilter
+    ) -> Iterator[Tuple[SortKey, Finding]]:
+        start = bisect_right(self.keys, decode_cursor(cursor)) if cursor else 0
+        for position in range(start, len(self.findings)):
+            finding = self.findings[position]
+            if finding_filter.matches(finding):
+                yield self.keys[position], finding
+
+    def page(
+        self, cursor: Optional[str], finding_filter: FindingFilter, limit: int
+    ) -> Tuple[List[Finding], Optional[str]]:
+        page: List[Finding] = []
+        last_key: Optional[SortKey] = None
+        for key, finding in self.iter_from(cursor, finding_filter):
+            if len(page) == limit:
+                return page, encode_cursor(last_key)  # type: ignore[arg-type]
+            page.append(finding)
+            last_key = key
+        return page, None
+
+
+def encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(dumps(list(key))).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    try:
+        resource_id, rule_id, n = loads(base64.urlsafe_b64decode(cursor))
+        return str(resource_id), str(rule_id), int(n)
+    except Exception:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from None
+
+
+def iter_ndjson(
+    findings: Iterator[Tuple[SortKey, Finding]],
+    limit: Optional[int] = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Serializes findings as NDJSON, yielding roughly ``chunk_size`` bytes."""
+    buffer: List[bytes] = []
+    buffered = 0
+    for count, (_, finding) in enumerate(findings):
+        if limit is not None and count >= limit:
+            break
+        line = dumps(finding.dict()) + b"\n"
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= chunk_size:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Callable, List, Optional
+
+from pydantic import BaseModel, Field
+
+from ..engine import SCAN_PHASES
+from ..models import ScanResult
+
+logger = logging.getLogger(__name__)
+
+ScanFunction = Callable[[str, Callable[[str], None]], ScanResult]
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ScanRequest(BaseModel):
+    provider: str = "all"
+
+
+class ScanJob(BaseModel):
+    id: str
+    provider: str
+    status: JobStatus = JobStatus.QUEUED
+    phase: Optional[str] = None
+    progress: float = 0.0
+    submitted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    result: Optional[ScanResult] = None
+    # Set once the result was dropped to bound memory; rescan to get one.
+    result_expired: bool = False
+
+
+class JobManager:
+    """
+    Runs scan jobs on a background worker pool.
+
+    Jobs are kept in memory; once more than ``max_retained`` jobs exist the
+    oldest finished ones are dropped. Scan results are much larger than job
+    status, so only the ``max_results`` most recent ones are kept, each for
+    at most ``result_ttl_seconds``; older jobs report ``result_expired``.
+    ``scan`` is called with the provider and a progress callback, matching
+    ``SSPMEngine.run_scan``.
+    """
+
+    def __init__(
+        self,
+        scan: ScanFunction,
+        max_workers: int = 2,
+        max_retained: int = 1000,
+        max_results: int = 20,
+        result_ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.scan = scan
+        self.max_retained = max_retained
+        self.max_results = max_results
+        self.result_ttl_seconds = result_ttl_seconds
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sspm-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+        # Jobs holding a result -> when it was stored, oldest first.
+        self._results: "OrderedDict[str, float]" = OrderedDict()
+
+    def submit(self, provider: str) -> ScanJob:
+        job = ScanJob(id=uuid.uuid4().hex, provider=provider)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job.id)
+        return job.copy()
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            self._expire_results()
+            job = self._jobs.get(job_id)
+            return job.copy() if job is not None else None
+
+    def list(self) -> List[ScanJob]:
+        with self._lock:
+            return [job.copy(exclude={"result"}) for job in self._jobs.values()]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id: str):
+        with self._lock:
+            provider = self._jobs[job_id].provider
+        self._update(
+            job_id,
+            status=JobStatus.RUNNING,
+            started_at=datetime.now(timezone.utc),
+        )
+        try:
+            result = self.scan(provider, lambda phase: self._set_phase(job_id, phase))
+        except Exception as e:
+            logger.error(f"Scan job {job_id} failed: {e}")
+            self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                error=str(e),
+                finished_at=datetime.now(timezone.utc),
+            )
+            return
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.status = JobStatus.SUCCEEDED
+            job.phase = None
+            job.progress = 1.0
+            job.result = result
+            job.finished_at = datetime.now(timezone.utc)
+            self._results[job_id] = self.clock()
+            self._expire_results()
+
+    def _set_phase(self, job_id: str, phase: str):
+        done = SCAN_PHASES.index(phase) if phase in SCAN_PHASES else 0
+        self._update(job_id, phase=phase, progress=done / len(SCAN_PHASES))
+
+    def _update(self, job_id: str, **changes):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for key, value in changes.items():
+                    setattr(job, key, value)
+
+    def _prune(self):
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+        ]
+        while len(self._jobs) > self.max_retained and finished:
+            job_id = finished.pop(0)
+            del self._jobs[job_id]
+            self._results.pop(job_id, None)
+
+    def _expire_results(self):
+        deadline = self.clock() - self.result_ttl_seconds
+        while self._results:
+            job_id, stored_at = next(iter(self._results.items()))
+            if len(self._results) <= self.max_results and stored_at > deadline:
+                break
+            del self._results[job_id]
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.result = None
+                job.result_expired = True
@@ -1,34 +1,363 @@
-from fastapi import FastAPI, HTTPException
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+from sspm_engine.analytics.access_graph import AccessGraph
+from sspm_engine.api.cache import CacheEntry, ScanCache
+from sspm_engine.api.findings import (
+    FindingFilter,
+    FindingIndex,
+    InvalidCursor,
+    decode_cursor,
+    iter_ndjson,
+)
+from sspm_engine.api.jobs import JobManager, ScanJob, ScanRequest
+from sspm_engine.api.webhooks import (
+    apply_github_event,
+    apply_slack_event,
+    verify_github_signature,
+    verify_slack_signature,
+)
 from sspm_engine.engine import SSPMEngine
+from sspm_engine.instrumentation import REGISTRY, profiled
+from sspm_engine.inventory import Inventory
+from sspm_engine.logging_config import setup_logging
 from sspm_engine.models import ScanResult
+from sspm_engine.serialization import dumps
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="SSPM Engine API",
     version="1.0.0",
     description="API for SaaS Security Posture Management",
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 engine = SSPMEngine()
+cache = ScanCache(
+    engine.run_scan,
+    ttl_seconds=float(engine.config.get("api", {}).get("cache_ttl_seconds", 60)),
+)
+jobs = JobManager(
+    engine.run_scan,
+    max_workers=int(engine.config.get("api", {}).get("job_workers", 2)),
+    max_results=int(engine.config.get("api", {}).get("job_results_retained", 20)),
+    result_ttl_seconds=float(
+        engine.config.get("api", {}).get("job_result_ttl_seconds", 3600)
+    ),
+)
 
+inventory = Inventory(engine)
+_inventory_lock = threading.Lock()
+# Providers not yet loaded into the resident inventory.
+_pending_providers: Set[str] = set()
+# Access graph of the resident inventory and the inventory version it was
+# built from.
+_access_graph: Optional[Tuple[Optional[float], AccessGraph]] = None
+_access_graph_lock = threading.Lock()
 
-@app.get("/", tags=["Health"])
-def health_check():
-    return {"status": "ok", "message": "SSPM Engine is running"}
+CACHE_REQUESTS = REGISTRY.counter(
+    "sspm_scan_cache_requests_total", "Scan result cache lookups.", ("result",)
+)
 
+PROVIDER_CHOICES = ["all", "slack", "github", "google"]
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 5000
 
-@app.get("/scan/{provider}", response_model=ScanResult, tags=["Scan"])
-def scan_provider(provider: str):
-    if provider not in ["all", "slack", "github", "google"]:
+
+def _validate_provider(provider: str):
+    if provider not in PROVIDER_CHOICES:
         raise HTTPException(
             status_code=400,
             detail="Invalid provider. Choose 'all', 'slack', 'github', or 'google'.",
         )
 
-    results = engine.run_scan(provider)
-    return results
+
+def _set_cache_headers(response: Response, entry: CacheEntry):
+    age = cache.age(entry)
+    max_age = max(int(cache.ttl_seconds - age), 0)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    response.headers["Age"] = str(int(age))
+    response.headers["X-Cache"] = "HIT" if entry.hit else "MISS"
+    CACHE_REQUESTS.inc(result="hit" if entry.hit else "miss")
+
+
+def _loaded_inventory() -> Inventory:
+    # The first webhook (or /inventory call) pays for one full collection;
+    # later events only touch the affected resource. A provider whose fetch
+    # is incomplete is not loaded (partial data would look like deletions)
+    # and is fetched again by the next call.
+    with _inventory_lock:
+        if not inventory.loaded:
+            logger.info("Loading resident inventory...")
+            inventory.load({})
+            _pending_providers.update(engine.providers)
+        for name in [p for p in engine.providers if p in _pending_providers]:
+            status: Dict[str, Dict[str, Any]] = {}
+            data = engine.fetch_provider(name, status=status)
+            if not status[name]["complete"]:
+                logger.error(
+                    f"Not loading {name} inventory: fetch incomplete "
+                    f"({status[name].get('error')})"
+                )
+                continue
+            inventory.sync(data)
+            _pending_providers.discard(name)
+    return inventory
+
+
+def _current_access_graph() -> AccessGraph:
+    global _access_graph
+    resident = _loaded_inventory()
+    with _access_graph_lock:
+        if _access_graph is None or _access_graph[0] != resident.updated_at:
+            version = resident.updated_at
+            _access_graph = (version, AccessGraph.from_inventory(resident.snapshot()))
+        return _access_graph[1]
+
+
+@app.on_event("startup")
+def start_logging():
+    # Configured on startup rather than import, so importing the app (e.g.
+    # in tests or under another server's logging setup) changes nothing.
+    setup_logging()
+
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    jobs.shutdown(wait=False)
+
+
+@app.get("/", tags=["Health"])
+async def health_check():
+    return {"status": "ok", "message": "SSPM Engine is running"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Health"])
+def metrics():
+    """Prometheus metrics: scans, phase durations and provider API latency."""
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/scan/{provider}", response_model=ScanResult, tags=["Scan"])
+def scan_provider(
+    provider: str,
+    response: Response,
+    refresh: bool = Query(False, description="Ignore cached results"),
+    profile: Optional[str] = Query(
+        None,
+        regex="^(cprofile|pyinstrument)$",
+        description="Profile a fresh scan and return the profiler report",
+    ),
+):
+    _validate_provider(provider)
+
+    if profile is not None:
+        if not engine.config.get("api", {}).get("profiling", False):
+            raise HTTPException(
+                status_code=403, detail="Profiling is disabled (api.profiling)."
+            )
+        try:
+            with profiled(profile) as report:
+                engine.run_scan(provider)
+        except ImportError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+        return PlainTextResponse(report.report)
+
+    entry = cache.get(provider, refresh=refresh)
+    _set_cache_headers(response, entry)
+    return entry.result
 
 
 @app.get("/risk", tags=["Analytics"])
-def get_risk_score():
-    results = engine.run_scan("all")
-    return {"risk_score": results.score, "counts": results.counts}
+def get_risk_score(
+    response: Response,
+    refresh: bool = Query(False, description="Ignore cached results"),
+):
+    entry = cache.get("all", refresh=refresh)
+    _set_cache_headers(response, entry)
+    return {"risk_score": entry.result.score, "counts": entry.result.counts}
+
+
+@app.get("/findings", tags=["Scan"])
+def list_findings(
+    severity: Optional[List[str]] = Query(None),
+    provider: Optional[List[str]] = Query(None),
+    rule_id: Optional[List[str]] = Query(None),
+    category: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, description="next_cursor of the last page"),
+    format: str = Query("json", regex="^(json|ndjson)$"),
+    refresh: bool = Query(False, description="Ignore cached results"),
+):
+    """
+    Filtered findings from the latest scan of all providers.
+
+    ``json`` returns one page (``limit`` defaults to 100) with a
+    ``next_cursor`` for the following page; ``ndjson`` streams every matching
+    finding after ``cursor``, one JSON document per line.
+    """
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    entry = cache.get("all", refresh=refresh)
+    index = FindingIndex.for_result(entry.result)
+    finding_filter = FindingFilter(severity, provider, rule_id, category)
+
+    if format == "ndjson":
+        stream = StreamingResponse(
+            iter_ndjson(index.iter_from(cursor, finding_filter), limit=limit),
+            media_type="application/x-ndjson",
+        )
+        _set_cache_headers(stream, entry)
+        return stream
+
+    page, next_cursor = index.page(
+        cursor, finding_filter, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    )
+    body = {
+        "findings": [finding.dict() for finding in page],
+        "count": len(page),
+        "next_cursor": next_cursor,
+    }
+    page_response = Response(content=dumps(body), media_type="application/json")
+    _set_cache_headers(page_response, entry)
+    return page_response
+
+
+@app.post("/scans", response_model=ScanJob, status_code=202, tags=["Jobs"])
+def submit_scan(request: ScanRequest):
+    _validate_provider(request.provider)
+    return jobs.submit(request.provider)
+
+
+@app.get("/scans", response_model=List[ScanJob], tags=["Jobs"])
+def list_scans():
+    return jobs.list()
+
+
+@app.get("/scans/{job_id}", response_model=ScanJob, tags=["Jobs"])
+def get_scan(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown scan job '{job_id}'.")
+    return job
+
+
+@app.get("/inventory", response_model=ScanResult, tags=["Webhooks"])
+def get_inventory_findings():
+    """Findings of the resident inventory kept current by webhooks."""
+    return _loaded_inventory().result()
+
+
+@app.get("/blast-radius/{principal}", tags=["Analytics"])
+def get_blast_radius(
+    principal: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_public: bool = Query(
+        False, description="Also count files shared with anyone who has the link"
+    ),
+):
+    """
+    Repositories, channels and files reachable by the accounts matching
+    ``principal`` (a Slack user id/name, GitHub login or email address).
+
+    ``counts`` covers everything reachable; ``resources`` lists at most
+    ``limit`` entries with the access and the account or group granting it.
+    """
+    radius = _current_access_graph().blast_radius(
+        principal, include_public=include_public, limit=limit
+    )
+    if not radius.accounts:
+        raise HTTPException(status_code=404, detail=f"Unknown principal '{principal}'.")
+    return Response(content=dumps(radius.dict()), media_type="application/json")
+
+
+def _json_payload(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload.")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid JSON payload.")
+    return payload
+
+
+def _webhook_secret(variable: str) -> Optional[str]:
+    """
+    The signing secret in ``variable``. Without one, events are refused
+    unless ``api.webhooks.insecure`` opts in to accepting them unsigned.
+    """
+    secret = os.getenv(variable)
+    if secret:
+        return secret
+    webhooks = engine.config.get("api", {}).get("webhooks") or {}
+    if not webhooks.get("insecure", False):
+        raise HTTPException(
+            status_code=503,
+            detail=f"Webhook secret not configured ({variable}).",
+        )
+    return None
+
+
+@app.post("/webhooks/github", tags=["Webhooks"])
+async def github_webhook(request: Request):
+    body = await request.body()
+    secret = _webhook_secret("GITHUB_WEBHOOK_SECRET")
+    if secret and not verify_github_signature(
+        secret, body, request.headers.get("X-Hub-Signature-256")
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature.")
+
+    event = request.headers.get("X-GitHub-Event", "")
+    payload = _json_payload(body)
+    changes = await run_in_threadpool(
+        lambda: apply_github_event(_loaded_inventory(), event, payload)
+    )
+    if changes:
+        cache.invalidate("github")
+        cache.invalidate("all")
+    return {"event": event, "changes": [change.dict() for change in changes]}
+
+
+@app.post("/webhooks/slack", tags=["Webhooks"])
+async def slack_webhook(request: Request):
+    body = await request.body()
+    secret = _webhook_secret("SLACK_SIGNING_SECRET")
+    if secret and not verify_slack_signature(
+        secret,
+        body,
+        request.headers.get("X-Slack-Request-Timestamp"),
+        request.headers.get("X-Slack-Signature"),
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature.")
+
+    payload = _json_payload(body)
+    if payload.get("type") == "url_verification":
+        return {"challenge": payload.get("challenge")}
+
+    event = payload.get("event") or {}
+    if not isinstance(event, dict):
+        raise HTTPException(status_code=400, detail="Invalid event payload.")
+    changes = await run_in_threadpool(
+        lambda: apply_slack_event(_loaded_inventory(), event)
+    )
+    if changes:
+        cache.invalidate("slack")
+        cache.invalidate("all")
+    return {
+        "event": event.get("type"),
+        "changes": [change.dict() for change in changes],
+    }
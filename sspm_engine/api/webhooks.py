@@ -0,0 +1,191 @@
+"""
+Translation of provider webhook events into inventory updates.
+
+Each handler maps one GitHub or Slack Events API payload onto
+``Inventory.upsert``/``remove`` calls, so only the touched resource is
+re-evaluated. Unknown events are accepted and ignored.
+"""
+
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from ..inventory import Inventory
+from ..models import Finding
+
+logger = logging.getLogger(__name__)
+
+SLACK_SIGNATURE_MAX_AGE = 60 * 5
+
+
+class WebhookChange:
+    def __init__(self, kind: str, key: str, findings: Optional[List[Finding]] = None):
+        self.kind = kind
+        self.key = key
+        self.findings = findings or []
+        self.removed = findings is None
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "removed": self.removed,
+            "findings": [f.dict() for f in self.findings],
+        }
+
+
+def verify_github_signature(secret: str, body: bytes, signature: Optional[str]):
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return bool(signature) and hmac.compare_digest(expected, signature or "")
+
+
+def verify_slack_signature(
+    secret: str,
+    body: bytes,
+    timestamp: Optional[str],
+    signature: Optional[str],
+    now: Optional[float] = None,
+) -> bool:
+    if not timestamp or not signature:
+        return False
+    try:
+        age = abs((now or time.time()) - int(timestamp))
+    except ValueError:
+        return False
+    if age > SLACK_SIGNATURE_MAX_AGE:
+        return False
+    base = b"v0:" + timestamp.encode() + b":" + body
+    expected = "v0=" + hmac.new(secret.encode(), base, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def apply_github_event(
+    inventory: Inventory, event: str, payload: Dict[str, Any]
+) -> List[WebhookChange]:
+    action = payload.get("action")
+    repo = payload.get("repository") or {}
+
+    if event == "repository":
+        name = repo.get("name", "")
+        if not name:
+            return []
+        if action == "deleted":
+            inventory.remove("github_repos", name)
+            return [WebhookChange("github_repos", name)]
+        changes: List[WebhookChange] = []
+        previous: Dict[str, Any] = {}
+        if action == "renamed":
+            renamed = payload.get("changes", {}).get("repository", {}).get("name", {})
+            old_name = renamed.get("from")
+            if old_name:
+                previous = inventory.get("github_repos", old_name) or {}
+                inventory.remove("github_repos", old_name)
+                changes.append(WebhookChange("github_repos", old_name))
+        update = {
+            "branch_protection": False,
+            "collaborators": [],
+            **previous,
+            **(inventory.get("github_repos", name) or {}),
+            "name": name,
+            "private": repo.get("private", True),
+            "html_url": repo.get("html_url"),
+        }
+        changes.append(
+            WebhookChange(
+                "github_repos", name, inventory.upsert("github_repos", update)
+            )
+        )
+        return changes
+
+    if event == "member" and action in ("added", "removed"):
+        name = repo.get("name", "")
+        login = (payload.get("member") or {}).get("login")
+        current = inventory.get("github_repos", name)
+        if current is None or not login:
+            return []
+        collaborators = [c for c in current.get("collaborators", []) if c != login]
+        if action == "added":
+            collaborators.append(login)
+        findings = inventory.upsert(
+            "github_repos", {"name": name, "collaborators": collaborators}
+        )
+        return [WebhookChange("github_repos", name, findings)]
+
+    if event == "branch_protection_rule":
+        name = repo.get("name", "")
+        rule = payload.get("rule") or {}
+        if not name or rule.get("name") != repo.get("default_branch"):
+            return []
+        update = {"name": name, "branch_protection": action != "deleted"}
+        if inventory.get("github_repos", name) is None:
+            update["private"] = repo.get("private", True)
+        findings = inventory.upsert("github_repos", update)
+        return [WebhookChange("github_repos", name, findings)]
+
+    if event == "organization":
+        membership = payload.get("membership") or {}
+        login = (membership.get("user") or {}).get("login", "")
+        if not login:
+            return []
+        if action == "member_removed":
+            inventory.remove("github_members", login)
+            return [WebhookChange("github_members", login)]
+        if action == "member_added":
+            current = inventory.get("github_members", login) or {}
+            update = {
+                "login": login,
+                "role": membership.get("role", "member"),
+                "mfa_enabled": current.get("mfa_enabled", False),
+            }
+            findings = inventory.upsert("github_members", update)
+            return [WebhookChange("github_members", login, findings)]
+
+    return []
+
+
+def apply_slack_event(
+    inventory: Inventory, event: Dict[str, Any]
+) -> List[WebhookChange]:
+    event_type = event.get("type", "")
+
+    if event_type in ("user_change", "team_join"):
+        user = event.get("user") or {}
+        key = user.get("id")
+        if not key:
+            return []
+        if user.get("deleted"):
+            inventory.remove("slack_users", key)
+            return [WebhookChange("slack_users", key)]
+        return [
+            WebhookChange("slack_users", key, inventory.upsert("slack_users", user))
+        ]
+
+    if not event_type.startswith(("channel_", "group_")):
+        return []
+
+    channel = event.get("channel")
+    if isinstance(channel, dict):
+        key = channel.get("id")
+        update = dict(channel)
+    else:
+        key = channel
+        update = {"id": channel}
+    if not key:
+        return []
+
+    action = event_type.split("_", 1)[1]
+    if action in ("deleted", "archive"):
+        inventory.remove("slack_channels", key)
+        return [WebhookChange("slack_channels", key)]
+    if action in ("created", "rename", "unarchive"):
+        update.setdefault("is_private", event_type.startswith("group_"))
+    elif action == "shared":
+        update["is_shared"] = True
+    elif action == "unshared":
+        update["is_shared"] = False
+    else:
+        return []
+    findings = inventory.upsert("slack_channels", update)
+    return [WebhookChange("slack_channels", key, findings)]
@@ -0,0 +1,239 @@
+"""
+On-disk checkpoints for resumable scans.
+
+A long crawl (e.g. every repository of a large GitHub organization) saves
+its progress as it goes: integrations append each fetched page of records to
+an NDJSON file per inventory kind and record the cursor needed to fetch the
+next page. State is flushed every ``interval`` seconds and whenever a
+provider finishes or fails, so a scan that crashes or exhausts its rate limit
+resumes from the last flush instead of starting over::
+
+    checkpoint = ScanCheckpoint(".sspm/checkpoints/acme")
+    result = engine.run_scan("all", checkpoint=checkpoint)
+    result.metadata["providers"]  # {"github": {"complete": False, ...}, ...}
+
+Layout: ``<directory>/<provider>/state.json`` holds per-kind cursors and the
+length of each ``<kind>.ndjson`` file at the last flush; bytes written after
+that are discarded on resume. The records are tenant data, so directories are
+created ``0700`` and files ``0600``.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, List, Sequence, Tuple, Type
+
+from .records import Record, as_dict
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+
+def settings_key(settings: Dict[str, Any], salt: bytes) -> str:
+    """
+    Identifies integration settings without storing their secrets.
+
+    The settings include credentials, so the key is an HMAC under the
+    checkpoint's random ``salt`` rather than a plain hash anyone could
+    test a guessed token against.
+    """
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+    return hmac.new(salt, encoded, hashlib.sha256).hexdigest()
+
+
+def _private(path: str, flags: int) -> int:
+    """``open`` opener creating files readable by their owner only."""
+    return os.open(path, flags, 0o600)
+
+
+def _makedirs_private(directory: str):
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.chmod(directory, 0o700)
+
+
+def _write_atomic(path: str, data: bytes):
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb", opener=_private) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+class ProviderCheckpoint:
+    """
+    Fetch progress of one provider.
+
+    Integrations call ``resume`` before listing a kind, ``advance`` after each
+    page and ``finish`` once the listing is exhausted.
+    """
+
+    def __init__(self, directory: str, key: str, interval: float = 30.0):
+        self.directory = directory
+        self.key = key
+        self.interval = interval
+        self.resumed = False
+        self._kinds: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, IO[bytes]] = {}
+        self._flushed = time.monotonic()
+        self._load()
+
+    @property
+    def complete(self) -> bool:
+        return bool(self._kinds) and all(k["complete"] for k in self._kinds.values())
+
+    def _state_path(self) -> str:
+        return os.path.join(self.directory, "state.json")
+
+    def _data_path(self, kind: str) -> str:
+        return os.path.join(self.directory, f"{kind}.ndjson")
+
+    def _load(self):
+        try:
+            with open(self._state_path(), "rb") as f:
+                state = loads(f.read())
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.directory}: {e}")
+            return
+        if state.get("version") != CHECKPOINT_VERSION or state.get("key") != self.key:
+            logger.warning(
+                f"Ignoring checkpoint {self.directory}: written for other settings"
+            )
+            return
+        self._kinds = state["kinds"]
+        self.resumed = bool(self._kinds)
+
+    def resume(
+        self, kind: str, record_type: Type[Record]
+    ) -> Tuple[List[Any], Any, bool]:
+        """
+        Restores a kind's progress.
+
+        Returns:
+            tuple: The records fetched so far, the cursor of the next page
+            (``None`` to start from the beginning) and whether the listing
+            was already complete.
+        """
+        state = self._kinds.get(kind)
+        if state is None:
+            self._kinds[kind] = {
+                "cursor": None,
+                "offset": 0,
+                "count": 0,
+                "complete": False,
+            }
+            return [], None, False
+
+        resources: List[Any] = []
+        path = self._data_path(kind)
+        if not os.path.exists(path):
+            return resources, state["cursor"], state["complete"]
+        with open(path, "r+b") as f:
+            # Drop records appended after the last flush; their cursor was
+            # never recorded, so they will be fetched again.
+            f.truncate(state["offset"])
+            from_raw = record_type.from_raw
+            for line in f:
+                resources.append(from_raw(loads(line)))
+        logger.info(f"Resuming {kind} from checkpoint with {len(resources)} resources")
+        return resources, state["cursor"], state["complete"]
+
+    def advance(self, kind: str, resources: Sequence[Any], cursor: Any = None):
+        """Records a fetched page and the cursor of the next one."""
+        f = self._files.get(kind)
+        if f is None:
+            f = self._files[kind] = open(self._data_path(kind), "ab", opener=_private)
+        for resource in resources:
+            f.write(dumps(as_dict(resource)) + b"\n")
+        state = self._kinds[kind]
+        state["cursor"] = cursor
+        state["count"] += len(resources)
+        if time.monotonic() - self._flushed >= self.interval:
+            self.flush()
+
+    def finish(self, kind: str, resources: Sequence[Any] = ()):
+        """Marks a kind's listing as complete, after a final page if given."""
+        if resources:
+            self.advance(kind, resources)
+        self._kinds[kind]["complete"] = True
+        self._kinds[kind]["cursor"] = None
+        self.flush()
+
+    def flush(self):
+        """Makes the progress recorded so far durable."""
+        for kind, f in self._files.items():
+            f.flush()
+            os.fsync(f.fileno())
+            self._kinds[kind]["offset"] = f.tell()
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "key": self.key,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "complete": self.complete,
+            "kinds": self._kinds,
+        }
+        _write_atomic(self._state_path(), dumps(state))
+        self._flushed = time.monotonic()
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class ScanCheckpoint:
+    """
+    Checkpoint directory of a scan, with one ``ProviderCheckpoint`` each.
+
+    Pass the same directory again to resume an interrupted scan. Once every
+    scanned provider is complete the engine removes the checkpoint, so the
+    next scan starts from scratch.
+    """
+
+    def __init__(self, directory: str, interval: float = 30.0):
+        self.directory = directory
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def _salt(self) -> bytes:
+        # Created with the checkpoint and removed by clear(), so keys from an
+        # earlier checkpoint in the same directory never match.
+        path = os.path.join(self.directory, "salt")
+        with self._lock:
+            _makedirs_private(self.directory)
+            try:
+                with open(path, "rb") as f:
+                    salt = f.read()
+                if salt:
+                    return salt
+            except FileNotFoundError:
+                pass
+            salt = os.urandom(32)
+            _write_atomic(path, salt)
+            return salt
+
+    def provider(self, name: str, settings: Dict[str, Any]) -> ProviderCheckpoint:
+        """Opens a provider's checkpoint, discarding it if ``settings`` changed."""
+        key = settings_key(settings, self._salt())
+        directory = os.path.join(self.directory, name)
+        _makedirs_private(directory)
+        checkpoint = ProviderCheckpoint(directory, key, self.interval)
+        if not checkpoint.resumed:
+            # Start clean: leftover files may belong to other settings.
+            for entry in os.listdir(directory):
+                os.remove(os.path.join(directory, entry))
+        return checkpoint
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
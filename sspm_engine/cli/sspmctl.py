@@ -1,72 +1,613 @@
+import logging
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from sspm_engine.engine import SSPMEngine
-from sspm_engine.models import Severity
+from sspm_engine.logging_config import setup_logging
+
+if TYPE_CHECKING:
+    from sspm_engine.models import ScanResult
+
+# Engine, models and orchestration are imported inside each command so that
+# `sspmctl --help` and single-provider commands start quickly.
 
 app = typer.Typer()
 console = Console()
+logger = logging.getLogger(__name__)
+
+DAEMON_OPTION = typer.Option(
+    True,
+    "--daemon/--no-daemon",
+    help="Use the result of a running `sspmctl watch` when one is available",
+)
+
+
+def _daemon_result() -> Optional["ScanResult"]:
+    """Latest full result from a running watch daemon, if any."""
+    from sspm_engine.daemon import DaemonClient, DaemonUnavailable
+
+    client = DaemonClient()
+    if not client.available():
+        return None
+    try:
+        result = client.result()
+    except (DaemonUnavailable, RuntimeError) as e:
+        logger.warning(f"Ignoring watch daemon: {e}")
+        return None
+    if result.metadata.get("provider") != "all":
+        return None
+    return result
+
+
+@app.callback()
+def main():
+    """
+    SaaS Security Posture Management CLI.
+    """
+    setup_logging(interactive=True)
+
+
+SEVERITY_COLORS = {"CRITICAL": "red", "HIGH": "yellow"}
 
 
 @app.command()
 def scan(
     provider: str = typer.Argument(
         "all", help="Provider to scan: all, slack, github, google"
-    )
+    ),
+    severity: Optional[List[str]] = typer.Option(
+        None, help="Only show findings of this severity; repeatable"
+    ),
+    rule: Optional[List[str]] = typer.Option(
+        None, help="Only show findings of this rule id; repeatable"
+    ),
+    format: str = typer.Option("table", help="Output format: table, summary, ndjson"),
+    top: int = typer.Option(20, help="Findings listed per page of the detail view"),
+    page: int = typer.Option(1, min=1, help="Page of the detail view to show"),
+    profile: Optional[str] = typer.Option(
+        None, help="Profile the scan with cprofile or pyinstrument (report on stderr)"
+    ),
+    checkpoint: Optional[str] = typer.Option(
+        None,
+        help="Save fetch progress to this directory and resume from it if an "
+        "earlier scan was interrupted",
+    ),
 ):
     """
     Scan SaaS providers for security risks.
     """
-    console.print(f"[bold green]Starting scan for {provider}...[/bold green]")
+    from sspm_engine.api.findings import FindingFilter
+    from sspm_engine.checkpoint import ScanCheckpoint
+    from sspm_engine.engine import SSPMEngine
+    from sspm_engine.instrumentation import PROFILERS, profiled
+    from sspm_engine.reporting.summary import ScanSummary
+
+    if format not in ("table", "summary", "ndjson"):
+        raise typer.BadParameter(f"Unknown format: {format}")
+    if profile is not None and profile not in PROFILERS:
+        raise typer.BadParameter(f"Unknown profiler: {profile}")
 
     engine = SSPMEngine()
-    results = engine.run_scan(provider)
+    summary = ScanSummary(
+        FindingFilter(severity=severity, rule_id=rule),
+        limit=top if format == "table" else 0,
+        offset=(page - 1) * top,
+        scorer=engine.risk_engine.scorer,
+    )
+    scan_checkpoint = None
+    if checkpoint is not None:
+        interval = engine.config.get("scanning", {}).get(
+            "checkpoint_interval_seconds", 30
+        )
+        scan_checkpoint = ScanCheckpoint(checkpoint, interval=interval)
+
+    if profile is None:
+        _print_scan(engine, summary, provider, format, page, scan_checkpoint)
+        return
+    with profiled(profile) as report:
+        _print_scan(engine, summary, provider, format, page, scan_checkpoint)
+    Console(stderr=True).print(report.report, markup=False, highlight=False)
+
+
+def _print_scan(
+    engine, summary, provider: str, format: str, page: int, checkpoint=None
+):
+    from rich.markup import escape
+
+    status: Dict[str, Dict[str, Any]] = {}
+    findings = engine.iter_findings(provider, checkpoint, status)
+    if format == "ndjson":
+        from sspm_engine.reporting.exporters import finding_record
+        from sspm_engine.serialization import dumps
+
+        out = sys.stdout.buffer
+        for finding in findings:
+            if summary.add(finding):
+                out.write(dumps(finding_record(finding)) + b"\n")
+        out.flush()
+        return
 
-    table = Table(title="Scan Results")
+    console.print(f"[bold green]Starting scan for {provider}...[/bold green]")
+    for finding in findings:
+        summary.add(finding)
+
+    table = Table(title="Findings by Rule")
     table.add_column("Severity", style="bold")
     table.add_column("Rule", style="cyan")
-    table.add_column("Resource", style="magenta")
-    table.add_column("Details")
-
-    for finding in results.findings:
-        severity_color = (
-            "red"
-            if finding.severity == Severity.CRITICAL
-            else "yellow" if finding.severity == Severity.HIGH else "blue"
-        )
+    table.add_column("Provider", style="magenta")
+    table.add_column("Findings", justify="right")
+    for group in summary.grouped():
+        color = SEVERITY_COLORS.get(group["severity"], "blue")
         table.add_row(
-            f"[{severity_color}]{finding.severity.value}[/{severity_color}]",
-            finding.rule_id,
-            finding.resource_id,
-            finding.details,
+            f"[{color}]{group['severity']}[/{color}]",
+            group["rule_id"],
+            group["provider"],
+            str(group["count"]),
         )
-
     console.print(table)
-    console.print(f"\n[bold]Risk Score:[/bold] {results.score}/100")
-    console.print(f"[bold]Summary:[/bold] {results.counts}")
+
+    detail = summary.detail()
+    if detail:
+        first = summary.offset + 1
+        table = Table(
+            title=f"Findings {first}-{first + len(detail) - 1} of {summary.matched}"
+        )
+        table.add_column("Severity", style="bold")
+        table.add_column("Rule", style="cyan")
+        table.add_column("Resource", style="magenta")
+        table.add_column("Details")
+        for finding in detail:
+            color = SEVERITY_COLORS.get(finding.severity.value, "blue")
+            table.add_row(
+                f"[{color}]{finding.severity.value}[/{color}]",
+                finding.rule_id,
+                escape(finding.resource_id),
+                escape(finding.details),
+            )
+        console.print(table)
+        if summary.offset + len(detail) < summary.matched:
+            console.print(
+                f"Showing page {page}; use --page {page + 1} for more, "
+                "or --format ndjson for every finding."
+            )
+
+    for name, provider_status in status.items():
+        if not provider_status["complete"]:
+            console.print(
+                f"[yellow]Incomplete {name} inventory "
+                f"({provider_status['resources']} resources fetched): "
+                f"{escape(provider_status['error'])}[/yellow]"
+            )
+    if summary.matched != summary.total:
+        console.print(f"[bold]Matching:[/bold] {summary.matched}/{summary.total}")
+    console.print(f"\n[bold]Risk Score:[/bold] {summary.score}/100")
+    console.print(f"[bold]Summary:[/bold] {summary.counts}")
 
 
 @app.command()
-def report(format: str = "markdown", output: str = "report.md"):
+def report(
+    format: str = "markdown",
+    output: str = "report.md",
+    max_findings: Optional[int] = typer.Option(
+        None, help="Limit the detailed findings section of Markdown reports"
+    ),
+    export: Optional[List[str]] = typer.Option(
+        None,
+        help="Also export FORMAT=PATH (ndjson, sarif, parquet); repeatable",
+    ),
+    daemon: bool = DAEMON_OPTION,
+):
     """
     Generate a security report.
     """
+    from sspm_engine.engine import SSPMEngine
+
+    outputs = {}
+    for item in export or []:
+        export_format, sep, path = item.partition("=")
+        if not sep or not path:
+            raise typer.BadParameter(f"Expected FORMAT=PATH, got '{item}'")
+        outputs[export_format] = path
+
     engine = SSPMEngine()
-    results = engine.run_scan("all")
-    engine.generate_report(results, format, output)
+    results = _daemon_result() if daemon else None
+    if results is None:
+        results = engine.run_scan("all")
+    engine.generate_report(results, format, output, max_findings=max_findings)
     console.print(f"[bold green]Report generated at {output}[/bold green]")
+    if outputs:
+        engine.export(results, outputs)
+        for path in outputs.values():
+            console.print(f"[bold green]Exported findings to {path}[/bold green]")
+
+
+@app.command()
+def diff(
+    old: str = typer.Argument(..., help="Baseline scan: JSON report or NDJSON export"),
+    new: Optional[str] = typer.Argument(
+        None, help="Newer scan; a fresh scan of all providers when omitted"
+    ),
+    format: str = typer.Option("text", help="Output format: text, ndjson, markdown"),
+    output: Optional[str] = typer.Option(
+        None, help="Write the diff to a file instead of stdout"
+    ),
+    include_unchanged: bool = typer.Option(
+        False, help="List unchanged findings too (text and ndjson)"
+    ),
+):
+    """
+    Show new, resolved and unchanged findings between two scans.
+    """
+    from rich.markup import escape
+
+    from sspm_engine.analytics.diff import (
+        DiffCounter,
+        DiffStatus,
+        iter_diff,
+        iter_snapshot,
+    )
+    from sspm_engine.engine import SSPMEngine
+    from sspm_engine.serialization import dumps
+
+    if format not in ("text", "ndjson", "markdown"):
+        raise typer.BadParameter(f"Unknown format: {format}")
+
+    engine = SSPMEngine()
+    if new is None:
+        entries = iter_diff(iter_snapshot(old), engine.run_scan("all").findings)
+    else:
+        entries = iter_diff(iter_snapshot(old), iter_snapshot(new))
+
+    if format == "markdown" or (format == "ndjson" and output):
+        path = output or "diff.md"
+        counter = engine.reporter.generate_diff_report(
+            entries, path, format=format, include_unchanged=include_unchanged
+        )
+        console.print(f"[bold green]Diff written to {path}[/bold green]")
+    else:
+        counter = DiffCounter()
+        markers = {
+            DiffStatus.NEW: "[red]+[/red]",
+            DiffStatus.RESOLVED: "[green]-[/green]",
+            DiffStatus.UNCHANGED: " ",
+        }
+        for entry in counter.track(entries):
+            if entry.status == DiffStatus.UNCHANGED and not include_unchanged:
+                continue
+            if format == "ndjson":
+                sys.stdout.buffer.write(dumps(entry.dict()) + b"\n")
+                continue
+            finding = entry.finding
+            console.print(
+                markers[entry.status]
+                + escape(
+                    f" [{finding['severity']}] "
+                    f"{finding['rule_id']} {finding['resource_id']}"
+                ),
+                highlight=False,
+            )
+        sys.stdout.flush()
+
+    if format != "ndjson":
+        console.print(
+            f"[bold]New:[/bold] {counter['new']}  "
+            f"[bold]Resolved:[/bold] {counter['resolved']}  "
+            f"[bold]Unchanged:[/bold] {counter['unchanged']}"
+        )
 
 
 @app.command()
-def risk_score():
+def risk_score(daemon: bool = DAEMON_OPTION):
     """
     Calculate and display the current risk score.
     """
+    if daemon:
+        from sspm_engine.daemon import DaemonClient, DaemonUnavailable
+
+        client = DaemonClient()
+        if client.available():
+            try:
+                risk = client.risk()
+            except (DaemonUnavailable, RuntimeError) as e:
+                logger.warning(f"Ignoring watch daemon: {e}")
+            else:
+                if risk["provider"] == "all":
+                    console.print(f"[bold]Current Risk Score:[/bold] {risk['score']}")
+                    return
+
+    from sspm_engine.engine import SSPMEngine
+
     engine = SSPMEngine()
     results = engine.run_scan("all")
     console.print(f"[bold]Current Risk Score:[/bold] {results.score}")
 
 
+@app.command("blast-radius")
+def blast_radius(
+    principal: str = typer.Argument(
+        ..., help="Slack user id or name, GitHub login or email address"
+    ),
+    top: int = typer.Option(20, help="Reachable resources listed"),
+    include_public: bool = typer.Option(
+        False, help="Also count files shared with anyone who has the link"
+    ),
+    format: str = typer.Option("table", help="Output format: table, json"),
+):
+    """
+    Show the repositories, channels and files a compromised account reaches.
+    """
+    from rich.markup import escape
+
+    from sspm_engine.analytics.access_graph import AccessGraph
+    from sspm_engine.engine import SSPMEngine
+    from sspm_engine.serialization import dumps
+
+    if format not in ("table", "json"):
+        raise typer.BadParameter(f"Unknown format: {format}")
+
+    graph = AccessGraph.from_inventory(SSPMEngine().collect("all"))
+    radius = graph.blast_radius(principal, include_public=include_public, limit=top)
+    if not radius.accounts:
+        console.print(f"[red]No account matches {escape(principal)}[/red]")
+        raise typer.Exit(code=1)
+    if format == "json":
+        sys.stdout.buffer.write(dumps(radius.dict()) + b"\n")
+        sys.stdout.flush()
+        return
+
+    console.print(f"[bold]Accounts:[/bold] {escape(', '.join(radius.accounts))}")
+    table = Table(title=f"Blast Radius of {escape(principal)}")
+    table.add_column("Resource", style="magenta")
+    table.add_column("Name")
+    table.add_column("Access", style="cyan")
+    table.add_column("Via")
+    for reach in radius.resources:
+        table.add_row(
+            escape(reach.resource),
+            escape(reach.name or ""),
+            reach.access,
+            escape(reach.via),
+        )
+    console.print(table)
+    if radius.truncated:
+        console.print(f"Showing {len(radius.resources)}; use --top for more.")
+    counts = ", ".join(f"{kind}: {count}" for kind, count in radius.counts.items())
+    console.print(f"[bold]Reachable:[/bold] {counts}")
+
+
+@app.command()
+def watch(
+    provider: str = typer.Argument(
+        "all", help="Provider to watch: all, slack, github, google"
+    ),
+    interval: float = typer.Option(300.0, help="Seconds between rescans"),
+    socket_path: Optional[str] = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket to serve results on [default: $SSPM_DAEMON_SOCKET "
+        "or ~/.sspm/sspmd.sock]",
+    ),
+):
+    """
+    Keep scanning in the background and serve results to other commands.
+
+    Mock data is only refetched when its files change. Live providers have no
+    cheap change marker, so each interval refetches them in full and only
+    the re-evaluation is incremental; for event-driven updates run the API
+    server with provider webhooks instead.
+    """
+    import signal
+    import threading
+
+    from rich.live import Live
+
+    from sspm_engine.daemon import ScanDaemon
+    from sspm_engine.engine import SSPMEngine
+
+    daemon = ScanDaemon(SSPMEngine(), provider=provider, socket_path=socket_path)
+    with console.status(f"[bold green]Initial scan of {provider}...[/bold green]"):
+        daemon.refresh()
+    try:
+        daemon.serve()
+    except RuntimeError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        raise typer.Exit(1)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        with Live(_watch_view(daemon), console=console, auto_refresh=False) as live:
+            daemon.run(
+                interval,
+                stop,
+                on_refresh=lambda changes: live.update(
+                    _watch_view(daemon), refresh=True
+                ),
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        daemon.close()
+
+
+def _watch_view(daemon) -> Table:
+    """Risk summary and most frequent rules for the live watch display."""
+    import time
+    from collections import Counter
+
+    result = daemon.result()
+    refreshed = time.strftime("%H:%M:%S", time.localtime(daemon.last_refresh))
+    changes = ", ".join(f"{k}: {v}" for k, v in daemon.last_changes.items())
+
+    table = Table(
+        title=f"Risk Score {result.score}/100",
+        caption=(
+            f"Refreshed {refreshed} (#{daemon.refreshes}); "
+            f"changed: {changes or 'nothing refetched'}; "
+            f"serving {daemon.socket_path}"
+        ),
+    )
+    table.add_column("Rule", style="cyan")
+    table.add_column("Severity", style="bold")
+    table.add_column("Findings", justify="right")
+
+    by_rule: Counter = Counter()
+    severities = {}
+    for finding in result.findings:
+        by_rule[finding.rule_id] += 1
+        severities[finding.rule_id] = finding.severity.value
+    for rule_id, count in by_rule.most_common(15):
+        table.add_row(rule_id, severities[rule_id], str(count))
+    return table
+
+
+@app.command()
+def tenants(
+    registry: str = typer.Option(..., help="Path to the tenant registry YAML file"),
+    provider: str = typer.Option("all", help="Provider to scan for every tenant"),
+    workers: int = typer.Option(8, help="Maximum number of concurrent scans"),
+):
+    """
+    Scan every tenant in a registry on a bounded worker pool.
+    """
+    from sspm_engine.orchestration.registry import TenantRegistry
+    from sspm_engine.orchestration.scheduler import TenantScheduler
+
+    scheduler = TenantScheduler(TenantRegistry.from_file(registry), max_workers=workers)
+    console.print(_tenant_table(scheduler.run(provider=provider)))
+
+
+QUEUE_OPTION = typer.Option(
+    ".sspm/queue.db",
+    "--queue",
+    help="Work queue: a SQLite file (sqlite:///path or a path) or a redis:// URL",
+)
+
+# Seconds between checks that `coordinator --local-workers` processes are alive.
+LOCAL_WORKER_CHECK_SECONDS = 5.0
+
+
+@app.command()
+def coordinator(
+    registry: str = typer.Option(..., help="Path to the tenant registry YAML file"),
+    queue: str = QUEUE_OPTION,
+    provider: str = typer.Option("all", help="Provider to scan for every tenant"),
+    shards: int = typer.Option(
+        1, min=1, help="Units each shardable provider (GitHub) is split into"
+    ),
+    local_workers: int = typer.Option(
+        0, min=0, help="Worker processes to start on this node for the scan"
+    ),
+    timeout: Optional[float] = typer.Option(
+        None, help="Give up after this many seconds [default: wait forever]"
+    ),
+):
+    """
+    Publish a scan of every tenant in a registry to a work queue and
+    aggregate the results reported by `sspmctl worker` processes.
+    """
+    import multiprocessing
+    import time
+
+    from sspm_engine.orchestration.coordinator import Coordinator
+    from sspm_engine.orchestration.queue import open_queue
+    from sspm_engine.orchestration.registry import TenantRegistry
+    from sspm_engine.orchestration.worker import serve
+
+    work_queue = open_queue(queue)
+    scan = Coordinator(TenantRegistry.from_file(registry), work_queue, shards=shards)
+    job_id = scan.submit(provider=provider)
+    console.print(f"Published job {job_id} to {queue}")
+
+    # Local workers poll until the job is done rather than exiting when idle,
+    # so a unit whose worker crashed is retried once its lease expires; a
+    # worker that exits early is replaced.
+    context = multiprocessing.get_context("spawn")
+
+    def start_worker():
+        process = context.Process(target=serve, args=(registry, queue))
+        process.start()
+        return process
+
+    processes = [start_worker() for _ in range(local_workers)]
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            wait: Optional[float] = LOCAL_WORKER_CHECK_SECONDS if processes else None
+            if deadline is not None:
+                left = max(0.0, deadline - time.monotonic())
+                wait = left if wait is None else min(wait, left)
+            try:
+                results = scan.wait(job_id, wait)
+                break
+            except TimeoutError as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    console.print(f"[red]{e}[/red]")
+                    raise typer.Exit(code=1)
+            for index, process in enumerate(processes):
+                if process.exitcode is not None:
+                    console.print(
+                        f"[yellow]Local worker exited with code {process.exitcode}; "
+                        "starting another[/yellow]"
+                    )
+                    processes[index] = start_worker()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        work_queue.close()
+    console.print(_tenant_table(results))
+
+
+@app.command()
+def worker(
+    registry: str = typer.Option(..., help="Path to the tenant registry YAML file"),
+    queue: str = QUEUE_OPTION,
+    lease: float = typer.Option(
+        900.0, help="Seconds a unit may run before another worker retries it"
+    ),
+    idle_timeout: Optional[float] = typer.Option(
+        None, help="Exit after the queue stayed empty this many seconds"
+    ),
+    max_units: Optional[int] = typer.Option(None, help="Exit after this many units"),
+):
+    """
+    Fetch and scan work units published by `sspmctl coordinator`.
+    """
+    from sspm_engine.orchestration.worker import serve
+
+    processed = serve(
+        registry,
+        queue,
+        idle_timeout=idle_timeout,
+        lease_seconds=lease,
+        max_units=max_units,
+    )
+    console.print(f"Processed {processed} units")
+
+
+def _tenant_table(results: Dict[str, "ScanResult"]) -> Table:
+    table = Table(title="Tenant Scan Results")
+    table.add_column("Tenant", style="cyan")
+    table.add_column("Risk Score", style="bold")
+    table.add_column("Findings")
+    table.add_column("Errors", style="red")
+
+    for tenant_id, result in sorted(results.items()):
+        errors = result.metadata.get("errors", {})
+        table.add_row(
+            tenant_id,
+            f"{result.score}",
+            str(len(result.findings)),
+            ", ".join(errors) if errors else "",
+        )
+    return table
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,244 @@
+"""
+Resident scan daemon behind ``sspmctl watch``.
+
+The daemon keeps one engine (and therefore its provider clients) and an
+``Inventory`` alive between scans. Each refresh refetches only providers whose
+data may have changed and re-evaluates only the resources that differ, and
+the latest result is served over a local Unix socket so that ``sspmctl
+report`` and ``sspmctl risk-score`` can answer without scanning.
+
+The protocol is one JSON request line (``{"command": "result"}``) answered by
+one JSON line; errors are returned as ``{"error": "..."}``.
+"""
+
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from .inventory import Inventory
+from .models import ScanResult
+from .serialization import dumps, loads
+
+if TYPE_CHECKING:
+    from .engine import SSPMEngine
+
+logger = logging.getLogger(__name__)
+
+
+def default_socket_path() -> str:
+    """``$SSPM_DAEMON_SOCKET``, or ``~/.sspm/sspmd.sock``."""
+    return os.getenv("SSPM_DAEMON_SOCKET") or os.path.join(
+        os.path.expanduser("~"), ".sspm", "sspmd.sock"
+    )
+
+
+class DaemonUnavailable(ConnectionError):
+    """Raised when no daemon answers on the socket."""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_DaemonServer"
+
+    def handle(self):
+        try:
+            request = loads(self.rfile.readline())
+            payload = self.server.daemon.handle(request.get("command", ""))
+        except Exception as e:
+            logger.error(f"Daemon request failed: {e}")
+            payload = dumps({"error": str(e)})
+        self.wfile.write(payload + b"\n")
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, daemon: "ScanDaemon"):
+        self.daemon = daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class ScanDaemon:
+    """
+    Keeps scan state resident and rescans incrementally.
+
+    Args:
+        engine: Engine whose integrations and scanners are reused.
+        provider: Provider to watch (``all``, ``slack``, ``github``, ``google``).
+        socket_path: Unix socket served by ``serve``; defaults to
+            ``default_socket_path()``.
+    """
+
+    def __init__(
+        self,
+        engine: "SSPMEngine",
+        provider: str = "all",
+        socket_path: Optional[str] = None,
+    ):
+        self.engine = engine
+        self.provider = provider
+        self.socket_path = socket_path or default_socket_path()
+        self.inventory = Inventory(engine)
+        self.refreshes = 0
+        self.last_refresh: Optional[float] = None
+        self.last_changes: Dict[str, int] = {}
+        self._versions: Dict[str, Optional[int]] = {}
+        self._result: Optional[ScanResult] = None
+        self._lock = threading.Lock()
+        self._server: Optional[_DaemonServer] = None
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Refetches providers whose data may have changed.
+
+        Returns:
+            Dict[str, int]: Changed resources per refetched provider; skipped
+            providers are omitted.
+        """
+        changes: Dict[str, int] = {}
+        for name in self.engine.providers:
+            if self.provider not in ("all", name):
+                continue
+            version = self.engine.integration(name).data_version()
+            if version is not None and self._versions.get(name) == version:
+                continue
+            try:
+                status: Dict[str, Dict[str, Any]] = {}
+                data = self.engine.fetch_provider(name, status=status)
+                if not status[name]["complete"]:
+                    # Syncing would drop every resource that was not fetched;
+                    # keep the previous inventory and retry next time.
+                    logger.error(
+                        f"Not refreshing {name}: fetch incomplete "
+                        f"({status[name].get('error')})"
+                    )
+                    continue
+                changes[name] = self.inventory.sync(data)
+                self._versions[name] = version
+            except Exception as e:
+                logger.error(f"Error refreshing {name}: {e}")
+
+        with self._lock:
+            if any(changes.values()):
+                self._result = None
+            self.refreshes += 1
+            self.last_refresh = time.time()
+            self.last_changes = changes
+        return changes
+
+    def result(self) -> ScanResult:
+        """Latest scored result, recomputed only after inventory changes."""
+        with self._lock:
+            if self._result is None:
+                self._result = self.inventory.result()
+                self._result.metadata["provider"] = self.provider
+            return self._result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "provider": self.provider,
+            "refreshes": self.refreshes,
+            "last_refresh": self.last_refresh,
+            "last_changes": self.last_changes,
+        }
+
+    def handle(self, command: str) -> bytes:
+        """Answers a single socket command with a JSON document."""
+        if command == "result":
+            return dumps(self.result().dict())
+        if command == "risk":
+            result = self.result()
+            return dumps(
+                {"score": result.score, "counts": result.counts, **self.status()}
+            )
+        if command == "status":
+            return dumps(self.status())
+        return dumps({"error": f"Unknown command: {command}"})
+
+    def serve(self):
+        """Starts answering socket requests on a background thread."""
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path).alive():
+                raise RuntimeError(f"A daemon is already serving {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        self._server = _DaemonServer(self.socket_path, self)
+        os.chmod(self.socket_path, 0o600)
+        threading.Thread(
+            target=self._server.serve_forever, name="sspm-daemon", daemon=True
+        ).start()
+        logger.info(f"Daemon listening on {self.socket_path}")
+
+    def run(
+        self,
+        interval: float,
+        stop: threading.Event,
+        on_refresh: Optional[Callable[[Dict[str, int]], None]] = None,
+    ):
+        """Refreshes every ``interval`` seconds until ``stop`` is set."""
+        while not stop.wait(interval):
+            changes = self.refresh()
+            if on_refresh is not None:
+                on_refresh(changes)
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+class DaemonClient:
+    """Talks to a running ``ScanDaemon`` over its Unix socket."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 10.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        """Cheap check that a daemon socket exists; it may still be stale."""
+        return hasattr(socket, "AF_UNIX") and os.path.exists(self.socket_path)
+
+    def alive(self) -> bool:
+        try:
+            self.request("status")
+            return True
+        except DaemonUnavailable:
+            return False
+
+    def request(self, command: str) -> Any:
+        if not self.available():
+            raise DaemonUnavailable(f"No daemon socket at {self.socket_path}")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(dumps({"command": command}) + b"\n")
+                with sock.makefile("rb") as reader:
+                    response = reader.readline()
+        except OSError as e:
+            raise DaemonUnavailable(f"Daemon at {self.socket_path}: {e}") from e
+
+        if not response:
+            raise DaemonUnavailable(
+                f"Daemon at {self.socket_path} closed the connection"
+            )
+        payload = loads(response)
+        if isinstance(payload, dict) and "error" in payload:
+            raise RuntimeError(payload["error"])
+        return payload
+
+    def result(self) -> ScanResult:
+        return ScanResult.parse_obj(self.request("result"))
+
+    def risk(self) -> Dict[str, Any]:
+        return dict(self.request("risk"))
@@ -1,21 +1,54 @@
+import importlib
+import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import yaml
 
 from .analytics.risk_engine import RiskEngine
-from .integrations.github import GitHubIntegration
-from .integrations.google_workspace import GoogleWorkspaceIntegration
-from .integrations.slack import SlackIntegration
-from .logging_config import setup_logging
-from .models import ScanResult
-from .reporting.reporter import Reporter
-from .scanners.external_access import ExternalAccessScanner
-from .scanners.misconfig import MisconfigurationScanner
-from .scanners.permissions import PermissionsScanner
-from .scanners.secret_scanner import SecretScanner
+from .instrumentation import FINDINGS, SCANS, current_trace, span, trace
+from .integrations.base import BaseIntegration
+from .models import PROVIDERS, Finding, ScanResult, Tenant
+from .scanners.base import BaseScanner
 
-logger = setup_logging()
+if TYPE_CHECKING:
+    from .checkpoint import ScanCheckpoint
+    from .reporting.reporter import Reporter
+
+logger = logging.getLogger(__name__)
+
+# Phases reported to run_scan progress callbacks, in order.
+SCAN_PHASES = ("fetching", "scanning", "analyzing")
+
+# Integrations and scanners are imported on first use so that commands which
+# touch a single provider do not pay for every SDK at startup.
+INTEGRATION_CLASSES = {
+    "slack": "sspm_engine.integrations.slack:SlackIntegration",
+    "github": "sspm_engine.integrations.github:GitHubIntegration",
+    "google": "sspm_engine.integrations.google_workspace:GoogleWorkspaceIntegration",
+}
+
+SCANNER_CLASSES = [
+    "sspm_engine.scanners.permissions:PermissionsScanner",
+    "sspm_engine.scanners.external_access:ExternalAccessScanner",
+    "sspm_engine.scanners.misconfig:MisconfigurationScanner",
+    "sspm_engine.scanners.secret_scanner:SecretScanner",
+]
+
+
+def _load_class(path: str) -> Any:
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
 
 
 class SSPMEngine:
@@ -25,7 +58,10 @@ class SSPMEngine:
     """
 
     def __init__(
-        self, config_path: Optional[str] = None, risk_rules_path: Optional[str] = None
+        self,
+        config_path: Optional[str] = None,
+        risk_rules_path: Optional[str] = None,
+        tenant: Optional[Tenant] = None,
     ):
         base_path = os.path.dirname(os.path.abspath(__file__))
         # Check if running from installed package or source
@@ -50,48 +86,102 @@ class SSPMEngine:
         self.config = self._load_config(config_path)
         self.risk_engine = RiskEngine(risk_rules_path)
 
-        template_dir = os.path.join(base_path, "reporting", "templates")
-        self.reporter = Reporter(template_dir)
+        self.template_dir = os.path.join(base_path, "reporting", "templates")
+        self._reporter: Optional["Reporter"] = None
 
-        # Initialize Integrations
         # Check for examples in package directory first, then project root
         mock_dir = os.path.join(base_path, "examples")
         if not os.path.exists(mock_dir):
             mock_dir = os.path.join(project_root, "examples")
+        self.mock_dir = mock_dir
 
-        self.slack = SlackIntegration(
-            token=os.getenv("SLACK_BOT_TOKEN"),
-            mock_file=(
-                os.path.join(mock_dir, "mock_slack.json")
-                if not os.getenv("SLACK_BOT_TOKEN")
-                else None
-            ),
-        )
-        self.github = GitHubIntegration(
-            token=os.getenv("GITHUB_TOKEN"),
-            org_name=os.getenv("GITHUB_ORG"),
-            mock_file=(
-                os.path.join(mock_dir, "mock_github.json")
-                if not os.getenv("GITHUB_TOKEN")
-                else None
-            ),
-        )
-        self.google = GoogleWorkspaceIntegration(
-            credentials_file=os.getenv("GOOGLE_SA_KEY_PATH"),
-            mock_file=(
-                os.path.join(mock_dir, "mock_gw.json")
-                if not os.getenv("GOOGLE_SA_KEY_PATH")
+        self.tenant = tenant
+        self.providers = tenant.providers if tenant is not None else list(PROVIDERS)
+        self._integrations: Dict[str, BaseIntegration] = {}
+        self._init_lock = threading.Lock()
+        self._scanners: Optional[List[BaseScanner]] = None
+
+    @property
+    def reporter(self) -> "Reporter":
+        if self._reporter is None:
+            from .reporting.reporter import Reporter
+
+            self._reporter = Reporter(self.template_dir)
+        return self._reporter
+
+    @property
+    def scanners(self) -> List[BaseScanner]:
+        with self._init_lock:
+            if self._scanners is None:
+                self._scanners = [
+                    _load_class(path)(self.config) for path in SCANNER_CLASSES
+                ]
+        return self._scanners
+
+    @scanners.setter
+    def scanners(self, scanners: List[BaseScanner]):
+        self._scanners = scanners
+
+    @property
+    def slack(self) -> BaseIntegration:
+        return self.integration("slack")
+
+    @property
+    def github(self) -> BaseIntegration:
+        return self.integration("github")
+
+    @property
+    def google(self) -> BaseIntegration:
+        return self.integration("google")
+
+    def integration(self, name: str) -> BaseIntegration:
+        """Returns the integration for a provider, creating it on first use."""
+        with self._init_lock:
+            if name not in self._integrations:
+                integration_class = _load_class(INTEGRATION_CLASSES[name])
+                self._integrations[name] = integration_class(
+                    **self._integration_settings(name)
+                )
+            return self._integrations[name]
+
+    def _integration_settings(self, name: str) -> Dict[str, Any]:
+        if self.tenant is not None:
+            return dict(getattr(self.tenant, name) or {})
+
+        if name == "slack":
+            token = os.getenv("SLACK_BOT_TOKEN")
+            return {
+                "token": token,
+                "base_url": os.getenv("SLACK_API_URL"),
+                "mock_file": (
+                    os.path.join(self.mock_dir, "mock_slack.json")
+                    if not token
+                    else None
+                ),
+            }
+        if name == "github":
+            token = os.getenv("GITHUB_TOKEN")
+            return {
+                "token": token,
+                "org_name": os.getenv("GITHUB_ORG"),
+                "base_url": os.getenv("GITHUB_API_URL"),
+                "mock_file": (
+                    os.path.join(self.mock_dir, "mock_github.json")
+                    if not token
+                    else None
+                ),
+            }
+        credentials_file = os.getenv("GOOGLE_SA_KEY_PATH")
+        return {
+            "credentials_file": credentials_file,
+            "subject_email": os.getenv("GOOGLE_ADMIN_EMAIL"),
+            "base_url": os.getenv("GOOGLE_API_URL"),
+            "mock_file": (
+                os.path.join(self.mock_dir, "mock_gw.json")
+                if not credentials_file
                 else None
             ),
-        )
-
-        # Initialize Scanners
-        self.scanners = [
-            PermissionsScanner(self.config),
-            ExternalAccessScanner(self.config),
-            MisconfigurationScanner(self.config),
-            SecretScanner(self.config),
-        ]
+        }
 
     def _load_config(self, path: str) -> Dict[str, Any]:
         if os.path.exists(path):
@@ -100,62 +190,232 @@ class SSPMEngine:
                 return result if isinstance(result, dict) else {}
         return {}
 
-    def run_scan(self, provider: str = "all") -> ScanResult:
+    def run_scan(
+        self,
+        provider: str = "all",
+        progress: Optional[Callable[[str], None]] = None,
+        checkpoint: Optional["ScanCheckpoint"] = None,
+    ) -> ScanResult:
         """
         Runs a security scan across specified providers.
 
         Args:
             provider (str): The provider to scan ('all', 'slack', 'github', 'google').
+            progress (callable, optional): Called with each phase name from
+                ``SCAN_PHASES`` as the scan reaches it.
+            checkpoint (ScanCheckpoint, optional): Saves fetch progress to
+                disk and resumes from it; see ``sspm_engine.checkpoint``.
 
         Returns:
-            ScanResult: Object containing score, findings, and stats.
+            ScanResult: Object containing score, findings, and stats. Timing
+            spans and provider API call statistics are recorded in
+            ``metadata["instrumentation"]``, and whether each provider was
+            fetched completely in ``metadata["providers"]``.
         """
-        data = {}
-
-        # Gather Data
-        if provider in ["all", "slack"]:
-            logger.info("Fetching Slack data...")
-            self.slack.connect()
-            slack_data = self.slack.fetch_data()
-            data["slack_users"] = slack_data.get("users", [])
-            data["slack_channels"] = slack_data.get("channels", [])
-
-        if provider in ["all", "github"]:
-            logger.info("Fetching GitHub data...")
-            self.github.connect()
-            gh_data = self.github.fetch_data()
-            data["github_repos"] = gh_data.get("repos", [])
-            data["github_members"] = gh_data.get("members", [])
-
-        if provider in ["all", "google"]:
-            logger.info("Fetching Google Workspace data...")
-            self.google.connect()
-            gw_data = self.google.fetch_data()
-            data["google_users"] = gw_data.get("users", [])
-            data["google_files"] = gw_data.get("files", [])
-
-        # Run Scanners
-        logger.info("Running scanners...")
-        all_findings = []
-        for scanner in self.scanners:
-            all_findings.extend(scanner.scan(data))
+        report = progress or (lambda phase: None)
+
+        with trace() as scan_trace:
+            try:
+                with span("scan") as scan_span:
+                    scan_span["provider"] = provider
+                    report("fetching")
+                    status: Dict[str, Dict[str, Any]] = {}
+                    data = self.collect(provider, checkpoint, status)
 
-        # Analyze Risks
-        logger.info("Analyzing risks...")
-        analysis = self.risk_engine.analyze(all_findings)
+                    # Run Scanners
+                    logger.info("Running scanners...")
+                    report("scanning")
+                    all_findings = self.scan_data(data)
 
+                    # Analyze Risks
+                    logger.info("Analyzing risks...")
+                    report("analyzing")
+                    with span("analyze") as attributes:
+                        analysis = self.risk_engine.analyze(all_findings)
+                        attributes["findings"] = len(analysis.findings)
+            except Exception:
+                SCANS.inc(provider=provider, status="error")
+                raise
+
+        SCANS.inc(provider=provider, status="ok")
+        for severity, count in analysis.counts.items():
+            FINDINGS.inc(count, severity=severity)
+        analysis.metadata["providers"] = status
+        scan_trace.merge_into(analysis.metadata)
         return analysis
 
+    def collect(
+        self,
+        provider: str = "all",
+        checkpoint: Optional["ScanCheckpoint"] = None,
+        status: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        Fetches inventory from the selected providers.
+
+        Keys are prefixed with the provider name, e.g. ``slack_users`` or
+        ``github_repos``, which is the layout the scanners expect. Once every
+        provider was fetched completely the ``checkpoint`` is removed;
+        otherwise it is kept so the next scan resumes from it.
+        """
+        status = {} if status is None else status
+        data: Dict[str, List[Any]] = {}
+        for name in self.providers:
+            if provider in ["all", name]:
+                data.update(self.fetch_provider(name, checkpoint, status))
+
+        incomplete = [name for name, s in status.items() if not s["complete"]]
+        if incomplete:
+            logger.warning(
+                f"Incomplete inventory for {', '.join(incomplete)}"
+                + ("; rerun to resume from the checkpoint" if checkpoint else "")
+            )
+        elif checkpoint is not None:
+            checkpoint.clear()
+        return data
+
+    def fetch_provider(
+        self,
+        name: str,
+        checkpoint: Optional["ScanCheckpoint"] = None,
+        status: Optional[Dict[str, Dict[str, Any]]] = None,
+        shard: Tuple[int, int] = (0, 1),
+    ) -> Dict[str, List[Any]]:
+        """
+        Fetches a single provider's inventory.
+
+        ``status[name]`` is set to whether the fetch completed, how many
+        resources it returned and whether it resumed from ``checkpoint``.
+        ``shard`` (index, count) restricts the fetch to one slice of the
+        inventory, as planned by ``work_units``.
+        """
+        integration = self.integration(name)
+        provider_checkpoint = None
+        if checkpoint is not None:
+            provider_checkpoint = checkpoint.provider(
+                name, self._integration_settings(name)
+            )
+        # Concurrent scans of this engine (API cache, jobs, webhooks) share the
+        # integration, whose per-fetch state must not be reset mid-fetch.
+        with integration.fetch_lock:
+            logger.info(f"Fetching {name} data...")
+            with span(f"fetch:{name}") as attributes:
+                integration.error = None
+                integration.shard = shard
+                integration.checkpoint = provider_checkpoint
+                try:
+                    integration.connect()
+                    raw = integration.fetch_data()
+                finally:
+                    error = integration.error
+                    integration.checkpoint = None
+                    integration.shard = (0, 1)
+                    if provider_checkpoint is not None:
+                        provider_checkpoint.close()
+                resources = sum(len(value) for value in raw.values())
+                attributes["resources"] = resources
+
+        if status is not None:
+            status[name] = {
+                "complete": error is None,
+                "resources": resources,
+                "resumed": bool(provider_checkpoint and provider_checkpoint.resumed),
+            }
+            if error is not None:
+                status[name]["error"] = error
+        return {f"{name}_{key}": value for key, value in raw.items()}
+
+    def work_units(
+        self, provider: str = "all", shards: int = 1
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Splits a scan into independently fetchable units.
+
+        Returns:
+            List[Tuple[str, int, int]]: ``(provider, shard, shard_count)`` for
+            every selected provider. Providers whose integration supports
+            sharding are split into ``shards`` units, the others into one.
+        """
+        units: List[Tuple[str, int, int]] = []
+        for name in self.providers:
+            if provider not in ["all", name]:
+                continue
+            integration_class = _load_class(INTEGRATION_CLASSES[name])
+            count = shards if integration_class.supports_sharding else 1
+            units.extend((name, index, count) for index in range(count))
+        return units
+
+    def scan_data(self, data: Dict[str, Any]) -> List[Finding]:
+        """Runs every scanner over previously collected inventory."""
+        all_findings: List[Finding] = []
+        # Scanner spans are only taken inside a scan trace, which keeps
+        # per-resource re-evaluation by the Inventory cheap.
+        traced = current_trace() is not None
+        for scanner in self.scanners:
+            if not traced:
+                all_findings.extend(scanner.scan(data))
+                continue
+            with span(f"scan:{type(scanner).__name__}") as attributes:
+                findings = scanner.scan(data)
+                attributes["findings"] = len(findings)
+            all_findings.extend(findings)
+        return all_findings
+
+    def iter_findings(
+        self,
+        provider: str = "all",
+        checkpoint: Optional["ScanCheckpoint"] = None,
+        status: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Iterator[Finding]:
+        """
+        Yields enriched findings as each scanner produces them.
+
+        Unlike ``run_scan`` nothing is scored or retained, so callers can
+        stream or aggregate arbitrarily large scans. ``checkpoint`` and
+        ``status`` are passed to ``collect``.
+        """
+        data = self.collect(provider, checkpoint, status)
+        for scanner in self.scanners:
+            for finding in scanner.scan(data):
+                yield self.risk_engine.enrich(finding)
+
     def generate_report(
         self,
         analysis: ScanResult,
         format: str = "markdown",
         output_path: str = "report.md",
+        max_findings: Optional[int] = None,
     ):
         """
         Generates a report from scan results.
+
+        ``max_findings`` limits the detailed findings section of Markdown
+        reports; summary and remediation sections still cover every finding.
+        """
+        with trace() as report_trace, span(f"report:{format}"):
+            if format == "markdown":
+                self.reporter.generate_markdown_report(
+                    analysis,
+                    output_path,
+                    rules=self.risk_engine.rules,
+                    max_findings=max_findings,
+                )
+            elif format == "json":
+                self.reporter.generate_json_report(analysis, output_path)
+            elif format == "summary":
+                self.reporter.generate_summary_report(analysis, output_path)
+            else:
+                self.reporter.export(
+                    analysis, {format: output_path}, rules=self.risk_engine.rules
+                )
+        report_trace.merge_into(analysis.metadata)
+
+    def export(self, analysis: ScanResult, outputs: Dict[str, str]):
+        """
+        Exports findings to several formats (``ndjson``, ``sarif``,
+        ``parquet``) in a single pass, e.g. ``{"sarif": "scan.sarif"}``.
         """
-        if format == "markdown":
-            self.reporter.generate_markdown_report(analysis, output_path)
-        elif format == "json":
-            self.reporter.generate_json_report(analysis, output_path)
+        with trace() as export_trace, span("export") as attributes:
+            attributes["formats"] = sorted(outputs)
+            self.reporter.export(analysis, outputs, rules=self.risk_engine.rules)
+        export_trace.merge_into(analysis.metadata)
@@ -0,0 +1,335 @@
+"""
+Timing spans, API call statistics and Prometheus metrics.
+
+``run_scan`` opens a ``ScanTrace``; the engine wraps every provider fetch,
+scanner, the risk analysis and report generation in a ``span`` and the
+integrations wrap each provider request in ``api_call``. The trace ends up
+in ``ScanResult.metadata["instrumentation"]``, while every span and call is
+also aggregated into the process-wide ``REGISTRY`` served at ``/metrics``.
+
+Spans and calls outside a trace (e.g. webhook re-evaluations) only update the
+metrics. The trace lives in a context variable, so it is not visible from
+threads started during the scan.
+"""
+
+import io
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+LabelValues = Tuple[str, ...]
+MetricT = TypeVar("MetricT", "Counter", "Histogram")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[n]) for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.label_names), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[n]) for n in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._values.get(tuple(str(labels[n]) for n in self.label_names))
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets + (float("inf"),), series):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _labels(self.label_names, key, f'le="{le}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _labels(self.label_names, key)
+                lines.append(f"{self.name}_sum{labels} {series[-1]}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def counter(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels))
+
+    def _register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+SCANS = REGISTRY.counter(
+    "sspm_scans_total", "Scans run by the engine.", ("provider", "status")
+)
+FINDINGS = REGISTRY.counter(
+    "sspm_findings_total", "Findings produced by scans.", ("severity",)
+)
+SPAN_SECONDS = REGISTRY.histogram(
+    "sspm_span_duration_seconds",
+    "Duration of scan phases: fetch, scanners, analysis and reporting.",
+    ("span",),
+)
+API_CALL_SECONDS = REGISTRY.histogram(
+    "sspm_api_call_duration_seconds",
+    "Latency of provider API calls.",
+    ("provider", "call"),
+)
+API_ERRORS = REGISTRY.counter(
+    "sspm_api_call_errors_total",
+    "Provider API calls that raised.",
+    ("provider", "call"),
+)
+
+
+class ScanTrace:
+    """Spans and API call statistics collected during one scan."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        # (provider, call) -> [count, errors, total seconds, max seconds]
+        self.calls: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, started: float, seconds: float, **attributes):
+        with self._lock:
+            self.spans.append(
+                {
+                    "name": name,
+                    "start": round(started - self.started, 6),
+                    "seconds": round(seconds, 6),
+                    **attributes,
+                }
+            )
+
+    def add_call(self, provider: str, call: str, seconds: float, error: bool):
+        with self._lock:
+            stats = self.calls.setdefault((provider, call), [0, 0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += error
+            stats[2] += seconds
+            stats[3] = max(stats[3], seconds)
+
+    def merge_into(self, metadata: Dict[str, Any]):
+        """Adds this trace to ``metadata["instrumentation"]``."""
+        section = metadata.setdefault("instrumentation", {"spans": [], "api_calls": {}})
+        section["spans"].extend(self.spans)
+        for (provider, call), (count, errors, total, slowest) in self.calls.items():
+            section["api_calls"].setdefault(provider, {})[call] = {
+                "count": int(count),
+                "errors": int(errors),
+                "total_seconds": round(total, 6),
+                "mean_seconds": round(total / count, 6),
+                "max_seconds": round(slowest, 6),
+            }
+
+
+_current_trace: ContextVar[Optional[ScanTrace]] = ContextVar(
+    "sspm_scan_trace", default=None
+)
+
+
+def current_trace() -> Optional[ScanTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace() -> Iterator[ScanTrace]:
+    """Collects spans and API calls made in this context."""
+    scan_trace = ScanTrace()
+    token = _current_trace.set(scan_trace)
+    try:
+        yield scan_trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[Dict[str, Any]]:
+    """
+    Times a block as a named span.
+
+    Yields a dict for attributes (e.g. resource or finding counts) recorded
+    with the span.
+    """
+    attributes: Dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        seconds = time.perf_counter() - started
+        SPAN_SECONDS.observe(seconds, span=name)
+        scan_trace = _current_trace.get()
+        if scan_trace is not None:
+            scan_trace.add_span(name, started, seconds, **attributes)
+
+
+@contextmanager
+def api_call(provider: str, call: str) -> Iterator[None]:
+    """Times one provider API request, e.g. ``api_call("slack", "users.list")``."""
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        seconds = time.perf_counter() - started
+        API_CALL_SECONDS.observe(seconds, provider=provider, call=call)
+        if error:
+            API_ERRORS.inc(provider=provider, call=call)
+        scan_trace = _current_trace.get()
+        if scan_trace is not None:
+            scan_trace.add_call(provider, call, seconds, error)
+
+
+class Profile:
+    """Report of a ``profiled`` block, available once the block exits."""
+
+    def __init__(self, profiler: str):
+        self.profiler = profiler
+        self.report = ""
+
+
+@contextmanager
+def profiled(profiler: str = "cprofile", limit: int = 40) -> Iterator[Profile]:
+    """
+    Profiles a block with cProfile or pyinstrument.
+
+    pyinstrument is optional: ``pip install pyinstrument``. The text report
+    (the ``limit`` most expensive functions by cumulative time for cProfile,
+    a call tree for pyinstrument) is stored on the yielded ``Profile``.
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profiler}'; choose from {PROFILERS}")
+
+    profile = Profile(profiler)
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError as e:
+            raise ImportError(
+                "The pyinstrument profiler requires pyinstrument: "
+                "pip install pyinstrument"
+            ) from e
+        sampler = Profiler()
+        sampler.start()
+        try:
+            yield profile
+        finally:
+            sampler.stop()
+            profile.report = sampler.output_text()
+        return
+
+    import cProfile
+    import pstats
+
+    tracer = cProfile.Profile()
+    tracer.enable()
+    try:
+        yield profile
+    finally:
+        tracer.disable()
+        out = io.StringIO()
+        pstats.Stats(tracer, stream=out).sort_stats("cumulative").print_stats(limit)
+        profile.report = out.getvalue()
@@ -1,13 +1,33 @@
 import logging
+import os
+import threading
+import zlib
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Type
+
+if TYPE_CHECKING:
+    from ..checkpoint import ProviderCheckpoint
+    from ..records import Record
 
 logger = logging.getLogger(__name__)
 
 
 class BaseIntegration(ABC):
+    # Whether fetch_data honours ``shard``, i.e. a distributed scan may split
+    # this provider's inventory across several workers.
+    supports_sharding = False
+
     def __init__(self, mock_file: Optional[str] = None):
         self.mock_file = mock_file
+        # The state below belongs to one fetch at a time; the engine holds
+        # this lock from setting it up until it has read ``error``.
+        self.fetch_lock = threading.Lock()
+        # Set by the engine while a checkpointed scan fetches this provider.
+        self.checkpoint: Optional["ProviderCheckpoint"] = None
+        # Why the last fetch_data returned partial data, if it did.
+        self.error: Optional[str] = None
+        # (index, count): fetch only the resources hashed to shard ``index``.
+        self.shard: Tuple[int, int] = (0, 1)
 
     @abstractmethod
     def connect(self) -> bool:
@@ -18,3 +38,35 @@ class BaseIntegration(ABC):
     def fetch_data(self) -> Dict[str, List[Any]]:
         """Fetch all relevant data for scanning."""
         pass
+
+    def data_version(self) -> Optional[int]:
+        """
+        Version token of the data ``fetch_data`` would return.
+
+        Mock files report their modification time so unchanged files need not
+        be refetched; live providers return ``None`` and are always fetched.
+        """
+        if self.mock_file and os.path.exists(self.mock_file):
+            return os.stat(self.mock_file).st_mtime_ns
+        return None
+
+    def _in_shard(self, key: str) -> bool:
+        """Whether the resource named ``key`` belongs to the current shard."""
+        index, count = self.shard
+        return count == 1 or zlib.crc32(key.encode("utf-8")) % count == index
+
+    def _resume(
+        self, kind: str, record_type: Type["Record"]
+    ) -> Tuple[List[Any], Any, bool]:
+        """Records fetched so far, next cursor and completeness of a kind."""
+        if self.checkpoint is None:
+            return [], None, False
+        return self.checkpoint.resume(kind, record_type)
+
+    def _advance(self, kind: str, resources: Sequence[Any], cursor: Any = None):
+        if self.checkpoint is not None:
+            self.checkpoint.advance(kind, resources, cursor)
+
+    def _finish(self, kind: str, resources: Sequence[Any] = ()):
+        if self.checkpoint is not None:
+            self.checkpoint.finish(kind, resources)
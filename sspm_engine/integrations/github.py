@@ -2,28 +2,65 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
-from github import Github, GithubException
+from github import (
+    Auth,
+    Github,
+    GithubException,
+    GithubRetry,
+    RateLimitExceededException,
+)
 
+from ..instrumentation import api_call
+from ..records import GitHubMember, GitHubRepo, normalize
 from .base import BaseIntegration
 
 logger = logging.getLogger(__name__)
 
 
 class GitHubIntegration(BaseIntegration):
+    # Repositories are split across shards by name; members, listed in one
+    # call, all go to shard 0.
+    supports_sharding = True
+
     def __init__(
         self,
         token: Optional[str] = None,
         org_name: Optional[str] = None,
         mock_file: Optional[str] = None,
+        base_url: Optional[str] = None,
+        page_size: int = 100,
+        max_retries: int = 10,
+        request_interval: Optional[float] = 0.25,
     ):
         super().__init__(mock_file)
         self.token = token
         self.org_name = org_name
+        # GitHub Enterprise Server (https://HOST/api/v3) or a local fake server.
+        self.base_url = base_url or "https://api.github.com"
+        self.page_size = page_size
+        self.max_retries = max_retries
+        # Minimum seconds between requests, which GitHub recommends to stay
+        # clear of secondary rate limits.
+        self.request_interval = request_interval
         self.client: Optional[Github] = None
 
     def connect(self) -> bool:
         if self.token:
-            self.client = Github(self.token)
+            # Reuse the client (and its HTTP connections) across scans.
+            if self.client is None:
+                # Besides 5xx and rate-limited 403s, retry 429s after
+                # Retry-After.
+                retry = GithubRetry(
+                    total=self.max_retries,
+                    status_forcelist=[429] + list(range(500, 600)),
+                )
+                self.client = Github(
+                    auth=Auth.Token(self.token),
+                    base_url=self.base_url,
+                    per_page=self.page_size,
+                    retry=retry,
+                    seconds_between_requests=self.request_interval,
+                )
             return True
         if self.mock_file:
             return True
@@ -34,56 +71,93 @@ class GitHubIntegration(BaseIntegration):
 
         if self.mock_file:
             mock_data = self._load_mock_data()
-            data["repos"] = mock_data.get("repos", [])
-            data["members"] = mock_data.get("members", [])
+            repos = mock_data.get("repos", [])
+            if self.shard[1] > 1:
+                repos = [r for r in repos if self._in_shard(r.get("name", ""))]
+            data["repos"] = normalize(GitHubRepo, repos)
+            if self.shard[0] == 0:
+                data["members"] = normalize(GitHubMember, mock_data.get("members", []))
             return data
 
         if not self.client or not self.org_name:
             logger.warning("GitHub client not initialized or Org not set.")
             return data
 
+        # Resources are collected in place so that an error part way through
+        # (e.g. exhausted rate limits) still returns what was fetched.
         try:
-            org = self.client.get_organization(self.org_name)
-            data["repos"] = self._get_repos(org)
-            data["members"] = self._get_members(org)
-        except GithubException as e:
+            with api_call("github", "orgs.get"):
+                org = self.client.get_organization(self.org_name)
+            self._get_repos(org, data["repos"])
+            if self.shard[0] == 0:
+                self._get_members(org, data["members"])
+        except Exception as e:
+            self.error = str(e)
             logger.error(f"GitHub API Error: {e}")
 
         return data
 
-    def _get_repos(self, org) -> List[Dict]:
-        repos = []
-        for repo in org.get_repos():
-            repos.append(
-                {
-                    "name": repo.name,
-                    "private": repo.private,
-                    "branch_protection": self._check_branch_protection(repo),
-                    "collaborators": [c.login for c in repo.get_collaborators()],
-                    "html_url": repo.html_url,
-                }
+    def _get_repos(self, org, repos: List[Any]):
+        restored, _, complete = self._resume("repos", GitHubRepo)
+        repos.extend(restored)
+        if complete:
+            return
+        # Listing order is not guaranteed to be stable across runs, so a
+        # resumed crawl skips repositories by name rather than by position.
+        done = {repo["name"] for repo in restored}
+        # PyGithub fetches pages lazily, so each listing is timed as a whole.
+        with api_call("github", "orgs.repos"):
+            org_repos = list(org.get_repos())
+        for repo in org_repos:
+            if repo.name in done or not self._in_shard(repo.name):
+                continue
+            with api_call("github", "repos.collaborators"):
+                collaborators = [c.login for c in repo.get_collaborators()]
+            record = GitHubRepo(
+                name=repo.name,
+                private=repo.private,
+                branch_protection=self._check_branch_protection(repo),
+                default_branch=repo.default_branch,
+                collaborators=collaborators,
+                html_url=repo.html_url,
+                description=repo.description,
             )
-        return repos
+            repos.append(record)
+            self._advance("repos", [record])
+        self._finish("repos")
 
-    def _get_members(self, org) -> List[Dict]:
-        members = []
-        for member in org.get_members():
-            members.append(
-                {"login": member.login, "role": "member", "mfa_enabled": False}
-            )
-        return members
+    def _get_members(self, org, members: List[Any]):
+        # Members are listed in one go, so they are only checkpointed whole.
+        restored, _, complete = self._resume("members", GitHubMember)
+        if complete:
+            members.extend(restored)
+            return
+        with api_call("github", "orgs.members"):
+            org_members = list(org.get_members())
+        page = [
+            GitHubMember(login=member.login, role="member", mfa_enabled=False)
+            for member in org_members
+        ]
+        members.extend(page)
+        self._finish("members", page)
 
     def _check_branch_protection(self, repo):
         try:
-            branch = repo.get_branch(repo.default_branch)
+            with api_call("github", "repos.branch"):
+                branch = repo.get_branch(repo.default_branch)
             return branch.protected
-        except Exception:
+        except RateLimitExceededException:
+            # Not evidence of a missing protection; let the crawl stop.
+            raise
+        except GithubException:
+            # e.g. an empty repository without its default branch
             return False
 
     def _load_mock_data(self):
         try:
-            with open(self.mock_file, "r") as f:
+            with api_call("github", "mock_file"), open(self.mock_file, "r") as f:
                 return json.load(f)
         except Exception as e:
+            self.error = f"mock_file: {e}"
             logger.error(f"Failed to load mock data from {self.mock_file}: {e}")
             return {}
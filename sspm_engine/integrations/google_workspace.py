@@ -2,10 +2,23 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from ..instrumentation import api_call
+from ..records import DriveFile, GoogleUser, normalize
 from .base import BaseIntegration
 
 logger = logging.getLogger(__name__)
 
+SCOPES = [
+    "https://www.googleapis.com/auth/admin.directory.user.readonly",
+    "https://www.googleapis.com/auth/drive.metadata.readonly",
+]
+
+USER_FIELDS = "nextPageToken,users(id,primaryEmail,isAdmin,isEnrolledIn2Sv,suspended)"
+FILE_FIELDS = (
+    "nextPageToken,files(id,name,owners(emailAddress),sharedWithMe,"
+    "permissions(type,role,emailAddress,domain))"
+)
+
 
 class GoogleWorkspaceIntegration(BaseIntegration):
     def __init__(
@@ -13,34 +26,122 @@ class GoogleWorkspaceIntegration(BaseIntegration):
         credentials_file: Optional[str] = None,
         subject_email: Optional[str] = None,
         mock_file: Optional[str] = None,
+        base_url: Optional[str] = None,
+        page_size: int = 500,
+        max_retries: int = 5,
     ):
         super().__init__(mock_file)
         self.credentials_file = credentials_file
         self.subject_email = subject_email
-        self.service: Optional[Any] = None
+        # Root serving both APIs (as https://www.googleapis.com/ does), e.g. a
+        # local fake server for load tests.
+        self.base_url = base_url
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.directory: Optional[Any] = None
+        self.drive: Optional[Any] = None
 
     def connect(self) -> bool:
-        # Placeholder for real auth
-        if self.credentials_file or self.mock_file:
+        if self.credentials_file:
+            # Reuse the services (and their HTTP connections) across scans.
+            if self.directory is None:
+                self._build_services()
+            return True
+        if self.mock_file:
             return True
         return False
 
+    def _build_services(self):
+        # Imported here so mock scans do not load the Google client libraries.
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
+        credentials = service_account.Credentials.from_service_account_file(
+            self.credentials_file, scopes=SCOPES, subject=self.subject_email
+        )
+
+        def service(name: str, version: str, path: str = "") -> Any:
+            options = {"api_endpoint": self.base_url + path} if self.base_url else None
+            return build(
+                name,
+                version,
+                credentials=credentials,
+                client_options=options,
+                cache_discovery=False,
+            )
+
+        self.directory = service("admin", "directory_v1")
+        self.drive = service("drive", "v3", "drive/v3/")
+
     def fetch_data(self) -> Dict[str, List[Any]]:
         data: Dict[str, List[Any]] = {"users": [], "files": []}
 
         if self.mock_file:
             mock_data = self._load_mock_data()
-            data["users"] = mock_data.get("users", [])
-            data["files"] = mock_data.get("files", [])
+            data["users"] = normalize(GoogleUser, mock_data.get("users", []))
+            data["files"] = normalize(DriveFile, mock_data.get("files", []))
             return data
 
-        # Real implementation stubs would go here
+        if self.directory is None or self.drive is None:
+            logger.warning("Google Workspace services not initialized.")
+            return data
+
+        data["users"] = self._paginate(
+            "users",
+            GoogleUser,
+            self.directory.users(),
+            "directory.users.list",
+            "users",
+            customer="my_customer",
+            maxResults=self.page_size,
+            fields=USER_FIELDS,
+        )
+        data["files"] = self._paginate(
+            "files",
+            DriveFile,
+            self.drive.files(),
+            "drive.files.list",
+            "files",
+            pageSize=self.page_size,
+            fields=FILE_FIELDS,
+        )
+
         return data
 
+    def _paginate(
+        self, kind: str, record_type, collection, call: str, key: str, **params
+    ) -> List[Any]:
+        """
+        Follows ``nextPageToken`` through every page of a list method.
+
+        Resumes from the checkpoint, if any. On an API error the resources
+        fetched so far are returned and ``error`` is set.
+        """
+        resources, page_token, complete = self._resume(kind, record_type)
+        try:
+            while not complete:
+                request = collection.list(pageToken=page_token, **params)
+                # Rate-limited (429) and 5xx responses are retried with backoff.
+                with api_call("google", call):
+                    response = request.execute(num_retries=self.max_retries)
+                page = normalize(record_type, response.get(key) or [])
+                resources.extend(page)
+                page_token = response.get("nextPageToken")
+                self._advance(kind, page, page_token)
+                complete = page_token is None
+        except Exception as e:
+            # API errors, exhausted retries and network failures alike.
+            self.error = f"{call}: {e}"
+            logger.error(f"Google Workspace API Error ({call}): {e}")
+            return resources
+        self._finish(kind)
+        return resources
+
     def _load_mock_data(self):
         try:
-            with open(self.mock_file, "r") as f:
+            with api_call("google", "mock_file"), open(self.mock_file, "r") as f:
                 return json.load(f)
         except Exception as e:
+            self.error = f"mock_file: {e}"
             logger.error(f"Failed to load mock data from {self.mock_file}: {e}")
             return {}
@@ -3,22 +3,45 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry import RateLimitErrorRetryHandler, default_retry_handlers
 
+from ..instrumentation import api_call
+from ..records import SlackChannel, SlackUser, normalize
 from .base import BaseIntegration
 
 logger = logging.getLogger(__name__)
 
 
 class SlackIntegration(BaseIntegration):
-    def __init__(self, token: Optional[str] = None, mock_file: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        mock_file: Optional[str] = None,
+        base_url: Optional[str] = None,
+        page_size: int = 200,
+        max_retries: int = 5,
+    ):
         super().__init__(mock_file)
         self.token = token
+        # Alternative Web API root, e.g. a local fake server for load tests.
+        self.base_url = base_url or WebClient.BASE_URL
+        self.page_size = page_size
+        self.max_retries = max_retries
         self.client: Optional[WebClient] = None
 
     def connect(self) -> bool:
         if self.token:
-            self.client = WebClient(token=self.token)
+            # Reuse the client (and its HTTP connections) across scans.
+            if self.client is None:
+                # Rate-limited (429) calls are retried after Retry-After.
+                retry_handlers = default_retry_handlers() + [
+                    RateLimitErrorRetryHandler(max_retry_count=self.max_retries)
+                ]
+                self.client = WebClient(
+                    token=self.token,
+                    base_url=self.base_url,
+                    retry_handlers=retry_handlers,
+                )
             return True
         if self.mock_file:
             return True
@@ -29,8 +52,8 @@ class SlackIntegration(BaseIntegration):
 
         if self.mock_file:
             mock_data = self._load_mock_data()
-            data["users"] = mock_data.get("users", [])
-            data["channels"] = mock_data.get("channels", [])
+            data["users"] = normalize(SlackUser, mock_data.get("users", []))
+            data["channels"] = normalize(SlackChannel, mock_data.get("channels", []))
             return data
 
         if not self.client:
@@ -41,38 +64,63 @@ class SlackIntegration(BaseIntegration):
             data["users"] = self._get_users()
             data["channels"] = self._get_channels()
         except Exception as e:
+            self.error = str(e)
             logger.error(f"Error fetching Slack data: {e}")
 
         return data
 
     def _get_users(self) -> List[Dict[Any, Any]]:
-        try:
-            if self.client is None:
-                return []
-            response = self.client.users_list()
-            members: List[Any] = response.get("members", [])
-            return list(members) if members else []
-        except SlackApiError as e:
-            logger.error(f"Slack API User Error: {e}")
+        if self.client is None:
             return []
+        return self._paginate(
+            "users", SlackUser, self.client.users_list, "users.list", "members"
+        )
 
     def _get_channels(self) -> List[Dict[Any, Any]]:
-        try:
-            if self.client is None:
-                return []
-            response = self.client.conversations_list(
-                types="public_channel,private_channel"
-            )
-            channels: List[Any] = response.get("channels", [])
-            return list(channels) if channels else []
-        except SlackApiError as e:
-            logger.error(f"Slack API Channel Error: {e}")
+        if self.client is None:
             return []
+        return self._paginate(
+            "channels",
+            SlackChannel,
+            self.client.conversations_list,
+            "conversations.list",
+            "channels",
+            types="public_channel,private_channel",
+        )
+
+    def _paginate(
+        self, kind: str, record_type, method, call: str, key: str, **params
+    ) -> List[Any]:
+        """
+        Follows ``next_cursor`` through every page of a list method.
+
+        Resumes from the checkpoint, if any. On an API error the resources
+        fetched so far are returned and ``error`` is set.
+        """
+        resources, cursor, complete = self._resume(kind, record_type)
+        try:
+            while not complete:
+                with api_call("slack", call):
+                    response = method(limit=self.page_size, cursor=cursor, **params)
+                page = normalize(record_type, response.get(key) or [])
+                resources.extend(page)
+                metadata = response.get("response_metadata") or {}
+                cursor = metadata.get("next_cursor") or None
+                self._advance(kind, page, cursor)
+                complete = cursor is None
+        except Exception as e:
+            # API errors, exhausted retries and network failures alike.
+            self.error = f"{call}: {e}"
+            logger.error(f"Slack API Error ({call}): {e}")
+            return resources
+        self._finish(kind)
+        return resources
 
     def _load_mock_data(self):
         try:
-            with open(self.mock_file, "r") as f:
+            with api_call("slack", "mock_file"), open(self.mock_file, "r") as f:
                 return json.load(f)
         except Exception as e:
+            self.error = f"mock_file: {e}"
             logger.error(f"Failed to load mock data from {self.mock_file}: {e}")
             return {}
@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .models import Finding, ScanResult
+
+if TYPE_CHECKING:
+    from .engine import SSPMEngine
+
+logger = logging.getLogger(__name__)
+
+# Field identifying a resource of each inventory kind, with fallbacks for
+# mock data that lacks provider ids.
+RESOURCE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "slack_users": ("id", "name"),
+    "slack_channels": ("id", "name"),
+    "github_repos": ("name",),
+    "github_members": ("login",),
+    "google_users": ("email", "id"),
+    "google_files": ("id", "name"),
+}
+
+
+def resource_key(kind: str, resource: Dict[str, Any]) -> str:
+    for field in RESOURCE_KEYS.get(kind, ("id",)):
+        value = resource.get(field)
+        if value:
+            return str(value)
+    raise ValueError(f"{kind} resource has no identifying field: {resource}")
+
+
+class Inventory:
+    """
+    Resident copy of provider inventory with findings indexed by resource.
+
+    After an initial ``load`` of a full collection, individual resources can
+    be inserted, changed or removed; only that resource is re-evaluated, by
+    running the scanners over a one-resource slice of the inventory.
+    """
+
+    def __init__(self, engine: "SSPMEngine"):
+        self.engine = engine
+        self._lock = threading.RLock()
+        self._resources: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._findings: Dict[Tuple[str, str], List[Finding]] = {}
+        self.loaded = False
+        self.updated_at: Optional[float] = None
+
+    def load(self, data: Dict[str, List[Any]]):
+        """Replaces the inventory with a full collection from ``collect``."""
+        with self._lock:
+            self._resources = {}
+            self._findings = {}
+            for kind, resources in data.items():
+                bucket = self._resources.setdefault(kind, {})
+                for resource in resources:
+                    key = resource_key(kind, resource)
+                    bucket[key] = resource
+                    self._evaluate(kind, key, resource)
+            self.loaded = True
+            self.updated_at = time.time()
+
+    def sync(self, data: Dict[str, List[Any]]) -> int:
+        """
+        Replaces the given inventory kinds with a fresh collection.
+
+        Only resources that were added, changed or removed are re-evaluated;
+        kinds absent from ``data`` are left untouched.
+
+        Returns:
+            int: Number of resources that changed.
+        """
+        changed = 0
+        with self._lock:
+            for kind, resources in data.items():
+                previous = self._resources.get(kind, {})
+                bucket: Dict[str, Dict[str, Any]] = {}
+                for resource in resources:
+                    key = resource_key(kind, resource)
+                    bucket[key] = resource
+                    if previous.get(key) != resource:
+                        self._evaluate(kind, key, resource)
+                        changed += 1
+                for key in previous.keys() - bucket.keys():
+                    self._findings.pop((kind, key), None)
+                    changed += 1
+                self._resources[kind] = bucket
+            self.loaded = True
+            if changed or self.updated_at is None:
+                self.updated_at = time.time()
+        return changed
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._resources.get(kind, {}).get(key)
+
+    def upsert(self, kind: str, resource: Dict[str, Any]) -> List[Finding]:
+        """
+        Inserts or updates a resource, merging with the stored copy.
+
+        Returns:
+            List[Finding]: The resource's findings after re-evaluation.
+        """
+        key = resource_key(kind, resource)
+        with self._lock:
+            bucket = self._resources.setdefault(kind, {})
+            merged = {**bucket.get(key, {}), **resource}
+            bucket[key] = merged
+            self.updated_at = time.time()
+            return self._evaluate(kind, key, merged)
+
+    def remove(self, kind: str, key: str):
+        with self._lock:
+            self._resources.get(kind, {}).pop(key, None)
+            self._findings.pop((kind, key), None)
+            self.updated_at = time.time()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Current resources of every kind, in the layout ``collect`` returns."""
+        with self._lock:
+            return {
+                kind: list(bucket.values()) for kind, bucket in self._resources.items()
+            }
+
+    def findings(self) -> List[Finding]:
+        with self._lock:
+            return [f for group in self._findings.values() for f in group]
+
+    def result(self) -> ScanResult:
+        """Scores the current findings without fetching anything."""
+        result = self.engine.risk_engine.analyze(self.findings())
+        with self._lock:
+            result.metadata["resources"] = {
+                kind: len(bucket) for kind, bucket in self._resources.items()
+            }
+            result.metadata["updated_at"] = self.updated_at
+        return result
+
+    def _evaluate(self, kind: str, key: str, resource: Dict[str, Any]) -> List[Finding]:
+        findings = [
+            self.engine.risk_engine.enrich(finding)
+            for finding in self.engine.scan_data({kind: [resource]})
+        ]
+        if findings:
+            self._findings[(kind, key)] = findings
+        else:
+            self._findings.pop((kind, key), None)
+        return findings
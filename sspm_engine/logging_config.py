@@ -1,18 +1,253 @@
+"""
+Logging pipeline for the CLI, API server and workers.
+
+Log calls only put a record on an in-memory queue (``QueueHandler``); a
+``QueueListener`` thread formats and writes them to stderr, so rendering
+never runs on the scanning or request-handling thread. Output is one of:
+
+* ``rich``: colored, human-readable lines, for interactive CLI sessions
+* ``json``: one JSON object per line, for production and log collectors
+* ``text``: plain ``time level logger: message`` lines
+
+``SSPM_LOG_FORMAT`` picks the format explicitly; otherwise the CLI uses
+``rich`` when stderr is a terminal and everything else uses ``json``.
+
+Repetitive messages, such as a warning logged for every resource in a loop,
+are rate limited per call site: after ``burst`` records within ``window``
+seconds the rest are dropped, and the next record let through states how
+many were suppressed.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOG_FORMATS = ("rich", "json", "text")
+FORMAT_ENV = "SSPM_LOG_FORMAT"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRIBUTES = frozenset(
+    list(vars(logging.LogRecord("", 0, "", 0, "", (), None)))
+    + ["message", "asctime", "suppressed"]
+)
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def __init__(self):
+        super().__init__()
+        # Imported here so that merely importing the package stays cheap.
+        from .serialization import dumps
+
+        self._dumps: Callable[..., bytes] = dumps
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            document["suppressed"] = suppressed
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in document:
+                document[key] = value
+        # Extras can be anything; a record must never be lost because one of
+        # them has no JSON form, so those are written as their str().
+        try:
+            return self._dumps(document, default=str).decode("utf-8")
+        except (TypeError, ValueError):
+            # e.g. non-string dict keys, which orjson rejects
+            return json.dumps(document, default=str, skipkeys=True)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most ``burst`` records per call site through every ``window``
+    seconds. Records at ``exempt_level`` or above are never dropped.
+    """
+
+    def __init__(
+        self,
+        burst: int = 20,
+        window: float = 60.0,
+        exempt_level: int = logging.ERROR,
+    ):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.exempt_level = exempt_level
+        self._lock = threading.Lock()
+        # (pathname, lineno) -> [window start, records seen, suppressed]
+        self._sites: Dict[Tuple[str, int], List[Any]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                suppressed = site[2] if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            site[1] += 1
+            if site[1] <= self.burst:
+                return True
+            site[2] += 1
+            return False
+
+
+class _SuppressedNote(logging.Filter):
+    # Human-readable formats mention suppressed records in the message.
+    def filter(self, record: logging.LogRecord) -> bool:
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar suppressed)"
+            record.args = None
+            record.suppressed = 0
+        return True
+
 
-from rich.logging import RichHandler
+class _StderrHandler(logging.StreamHandler):
+    # Resolves sys.stderr on every write, so redirections made after setup
+    # (e.g. by test runners) are honoured.
+    def __init__(self):
+        super().__init__(sys.stderr)
 
+    @property  # type: ignore[override]
+    def stream(self):
+        return sys.stderr
 
-def setup_logging(level="INFO"):
-    logging.basicConfig(
-        level=level,
-        format="%(message)s",
-        datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True)],
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, while they still hold the values of the
+        # call, but leave formatting and exc_info to the listener so that
+        # rich tracebacks keep working.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _output_handler(fmt: str) -> logging.Handler:
+    handler: logging.Handler
+    if fmt == "rich":
+        from rich.console import Console
+        from rich.logging import RichHandler
+
+        handler = RichHandler(console=Console(stderr=True), rich_tracebacks=True)
+        handler.setFormatter(logging.Formatter("%(message)s", datefmt="[%X]"))
+        handler.addFilter(_SuppressedNote())
+    elif fmt == "json":
+        handler = _StderrHandler()
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler = _StderrHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+        handler.addFilter(_SuppressedNote())
+    return handler
+
+
+def log_format(interactive: bool = False) -> str:
+    """The output format ``setup_logging`` will use."""
+    fmt = os.getenv(FORMAT_ENV, "").strip().lower()
+    if fmt:
+        if fmt not in LOG_FORMATS:
+            raise ValueError(
+                f"{FORMAT_ENV} must be one of {', '.join(LOG_FORMATS)}, not {fmt!r}"
+            )
+        return fmt
+    return "rich" if interactive and sys.stderr.isatty() else "json"
+
+
+def setup_logging(
+    level="INFO",
+    interactive: bool = False,
+    fmt: Optional[str] = None,
+    burst: int = 20,
+    window: float = 60.0,
+):
+    """
+    Routes the root logger through a queue to a background writer.
+
+    Args:
+        level: Root log level.
+        interactive: Whether this is a CLI session, which gets ``rich``
+            output when stderr is a terminal.
+        fmt: ``rich``, ``json`` or ``text``; overrides ``SSPM_LOG_FORMAT``.
+        burst: Records per call site let through per ``window`` seconds
+            (``0`` disables rate limiting).
+
+    Calling it again replaces the previous configuration.
+    """
+    global _listener, _handler
+
+    fmt = fmt or log_format(interactive)
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {fmt}")
+
+    root = logging.getLogger()
+    shutdown_logging()
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    if burst:
+        handler.addFilter(RateLimitFilter(burst=burst, window=window))
+    _listener = QueueListener(
+        records,
+        _output_handler(fmt),
+        respect_handler_level=True,
     )
+    _listener.start()
+    _handler = handler
+    root.addHandler(handler)
+    root.setLevel(level)
 
     # Quiet down third-party libs
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("googleapiclient").setLevel(logging.WARNING)
 
     return logging.getLogger("sspm_engine")
+
+
+def shutdown_logging():
+    """Writes out queued records and removes the handler ``setup_logging`` added."""
+    global _listener, _handler
+
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
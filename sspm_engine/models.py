@@ -1,3 +1,4 @@
+import hashlib
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
@@ -20,6 +21,28 @@ class ResourceType(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Finding ``data`` keys that tell apart several findings of one rule on the
+# same resource (e.g. which secret pattern matched, or the hash of a
+# high-entropy token). Everything else in ``data`` is provider noise that
+# must not change a finding's identity.
+FINGERPRINT_ATTRIBUTES = ("pattern", "sha256")
+
+
+def finding_fingerprint(
+    rule_id: str, resource_id: str, data: Optional[Dict[str, Any]] = None
+) -> str:
+    """Stable identity of a finding across scans, as 32 hex characters."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(rule_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(resource_id.encode("utf-8"))
+    if data:
+        for attribute in FINGERPRINT_ATTRIBUTES:
+            if attribute in data:
+                digest.update(f"\0{attribute}={data[attribute]}".encode("utf-8"))
+    return digest.hexdigest()
+
+
 class Finding(BaseModel):
     rule_id: str
     resource_id: str
@@ -30,6 +53,15 @@ class Finding(BaseModel):
     data: Optional[Dict[str, Any]] = None
     remediation: Optional[str] = None
 
+    @property
+    def provider(self) -> str:
+        """Provider prefix of ``resource_id``, e.g. ``github`` for ``github_repo:x``."""
+        return self.resource_id.split(":", 1)[0].split("_", 1)[0]
+
+    @property
+    def fingerprint(self) -> str:
+        return finding_fingerprint(self.rule_id, self.resource_id, self.data)
+
 
 class ScanResult(BaseModel):
     score: float
@@ -62,3 +94,29 @@ class FileObject(BaseModel):
     permissions: List[Dict[str, Any]] = []
     publicly_accessible: bool = False
     source: str = "google"
+
+
+# Supported providers in scan order; each has a ``Tenant`` section and an
+# integration in ``engine.INTEGRATION_CLASSES``.
+PROVIDERS = ("slack", "github", "google")
+
+
+class Tenant(BaseModel):
+    """
+    A customer tenant scanned by the engine.
+
+    Each provider section holds the keyword arguments passed to the matching
+    integration (e.g. ``token``/``org_name``/``mock_file`` for GitHub). A
+    provider without a section is not scanned for this tenant.
+    """
+
+    id: str
+    name: Optional[str] = None
+    slack: Optional[Dict[str, Any]] = None
+    github: Optional[Dict[str, Any]] = None
+    google: Optional[Dict[str, Any]] = None
+    weight: float = 1.0
+
+    @property
+    def providers(self) -> List[str]:
+        return [p for p in PROVIDERS if getattr(self, p)]
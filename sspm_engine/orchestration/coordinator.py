@@ -0,0 +1,161 @@
+import logging
+import time
+import uuid
+from collections import defaultdict
+from itertools import zip_longest
+from typing import Callable, Dict, List, Optional
+
+from ..engine import SSPMEngine
+from ..models import Finding, ScanResult, Tenant
+from .queue import UnitResult, WorkQueue, WorkUnit
+from .registry import TenantRegistry
+
+logger = logging.getLogger(__name__)
+
+EngineFactory = Callable[[Tenant], SSPMEngine]
+
+
+class Coordinator:
+    """
+    Distributes tenant scans over a work queue and aggregates the results.
+
+    Each tenant's scan is split by ``SSPMEngine.work_units`` into one unit per
+    provider, and providers that support it into ``shards`` units each (GitHub
+    repositories are sharded by name). Units are published round-robin
+    across tenants, cheapest first by weight, so workers interleave tenants
+    rather than draining the largest one. Any number of ``Worker`` processes,
+    on this node or others, pull units from the same queue; once every unit of
+    a job has a result the coordinator scores each tenant's findings with the
+    ``RiskEngine``.
+    """
+
+    def __init__(
+        self,
+        registry: TenantRegistry,
+        queue: WorkQueue,
+        shards: int = 1,
+        engine_factory: Optional[EngineFactory] = None,
+        poll_interval: float = 0.5,
+    ):
+        if shards < 1:
+            raise ValueError("Shard count must be at least 1.")
+        self.registry = registry
+        self.queue = queue
+        self.shards = shards
+        self.engine_factory = engine_factory or (lambda t: SSPMEngine(tenant=t))
+        self.poll_interval = poll_interval
+        self._jobs: Dict[str, Dict[str, List[str]]] = {}
+        self._started: Dict[str, float] = {}
+
+    def submit(
+        self, tenant_ids: Optional[List[str]] = None, provider: str = "all"
+    ) -> str:
+        """Publishes the units of a scan of the selected tenants; returns its id."""
+        job_id = uuid.uuid4().hex[:12]
+        tenants = [self.registry.get(t) for t in (tenant_ids or self.registry.ids())]
+        tenants.sort(key=lambda t: t.weight)
+
+        plans: List[List[WorkUnit]] = []
+        providers: Dict[str, List[str]] = {}
+        for tenant in tenants:
+            engine = self.engine_factory(tenant)
+            units = [
+                WorkUnit(
+                    id=f"{job_id}/{tenant.id}/{name}/{shard}",
+                    job_id=job_id,
+                    tenant_id=tenant.id,
+                    provider=name,
+                    shard=shard,
+                    shards=shards,
+                )
+                for name, shard, shards in engine.work_units(provider, self.shards)
+            ]
+            providers[tenant.id] = list(dict.fromkeys(unit.provider for unit in units))
+            plans.append(units)
+
+        ordered = [u for row in zip_longest(*plans) for u in row if u is not None]
+        self.queue.publish(ordered)
+        self._jobs[job_id] = providers
+        self._started[job_id] = time.monotonic()
+        logger.info(f"Published {len(ordered)} units of job {job_id}")
+        return job_id
+
+    def wait(
+        self, job_id: str, timeout: Optional[float] = None
+    ) -> Dict[str, ScanResult]:
+        """
+        Blocks until every unit of the job has a result, then aggregates them.
+
+        Returns:
+            Dict[str, ScanResult]: One result per tenant id. Unit failures are
+            reported in ``metadata["errors"]`` keyed by unit label (e.g.
+            ``github:1/4``) rather than raised.
+
+        Raises:
+            TimeoutError: If units are still outstanding after ``timeout``
+                seconds; the job stays queued and can be waited for again.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = self.queue.remaining(job_id)
+            if remaining == 0:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} has {remaining} unfinished units")
+            time.sleep(self.poll_interval)
+
+        results = self._aggregate(job_id, self.queue.results(job_id))
+        self.queue.purge(job_id)
+        self._jobs.pop(job_id, None)
+        self._started.pop(job_id, None)
+        return results
+
+    def run(
+        self,
+        tenant_ids: Optional[List[str]] = None,
+        provider: str = "all",
+        timeout: Optional[float] = None,
+    ) -> Dict[str, ScanResult]:
+        """Submits a scan and waits for its results."""
+        return self.wait(self.submit(tenant_ids, provider), timeout)
+
+    def _aggregate(
+        self, job_id: str, unit_results: List[UnitResult]
+    ) -> Dict[str, ScanResult]:
+        findings: Dict[str, List[Finding]] = defaultdict(list)
+        errors: Dict[str, Dict[str, str]] = defaultdict(dict)
+        workers: Dict[str, set] = defaultdict(set)
+        for unit_result in unit_results:
+            findings[unit_result.tenant_id].extend(unit_result.findings)
+            if unit_result.error is not None:
+                errors[unit_result.tenant_id][unit_result.label] = unit_result.error
+            if unit_result.worker is not None:
+                workers[unit_result.tenant_id].add(unit_result.worker)
+
+        providers_by_tenant = self._jobs.get(job_id)
+        if providers_by_tenant is None:
+            # Waiting on a job submitted by another coordinator process.
+            providers_by_tenant = defaultdict(list)
+            for unit_result in unit_results:
+                provider = unit_result.label.partition(":")[0]
+                if provider not in providers_by_tenant[unit_result.tenant_id]:
+                    providers_by_tenant[unit_result.tenant_id].append(provider)
+
+        started = self._started.get(job_id)
+        duration = None if started is None else round(time.monotonic() - started, 3)
+        results = {}
+        for tenant_id, providers in providers_by_tenant.items():
+            engine = self.engine_factory(self.registry.get(tenant_id))
+            result = engine.risk_engine.analyze(findings[tenant_id])
+            result.metadata.update(
+                {
+                    "tenant_id": tenant_id,
+                    "providers": providers,
+                    "errors": errors[tenant_id],
+                    "duration_seconds": duration,
+                    "job_id": job_id,
+                    "workers": sorted(workers[tenant_id]),
+                }
+            )
+            results[tenant_id] = result
+        return results
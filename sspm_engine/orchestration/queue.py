@@ -0,0 +1,362 @@
+"""
+Work queues shared by a distributed scan's coordinator and workers.
+
+A coordinator publishes one ``WorkUnit`` per tenant, provider and shard;
+workers claim units under a lease, fetch and scan them, and push a
+``UnitResult`` back. A unit whose worker dies is handed out again once its
+lease expires, up to ``max_attempts`` times.
+
+Two backends are available through ``open_queue``:
+
+* ``sqlite:///path/to/queue.db`` (or a plain path), the default. Every
+  process using the same file shares the queue, which covers several worker
+  processes on one node or nodes sharing a filesystem with working locks.
+* ``redis://host:6379/0`` for workers spread over several nodes, against
+  Redis or a compatible server (``pip install sspm-engine[distributed]``).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from ..models import Finding
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Requeues expired leases, then pops the next unit that still exists and
+# leases it, in one step: a worker dying between the pop and the lease
+# would otherwise lose the unit. KEYS: pending, units, leases; ARGV: now,
+# lease deadline.
+_REDIS_CLAIM = """
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[1])) do
+    redis.call('ZREM', KEYS[3], id)
+    redis.call('RPUSH', KEYS[1], id)
+end
+while true do
+    local id = redis.call('LPOP', KEYS[1])
+    if not id then
+        return false
+    end
+    local payload = redis.call('HGET', KEYS[2], id)
+    if payload then
+        redis.call('ZADD', KEYS[3], ARGV[2], id)
+        return payload
+    end
+end
+"""
+
+
+class WorkUnit(BaseModel):
+    """One provider (or one shard of it) of one tenant's scan."""
+
+    id: str
+    job_id: str
+    tenant_id: str
+    provider: str
+    shard: int = 0
+    shards: int = 1
+    attempts: int = 0
+
+    @property
+    def label(self) -> str:
+        """``github``, or ``github:2/4`` for the third of four shards."""
+        if self.shards == 1:
+            return self.provider
+        return f"{self.provider}:{self.shard}/{self.shards}"
+
+
+class UnitResult(BaseModel):
+    """What a worker reports back for a unit."""
+
+    unit_id: str
+    job_id: str
+    tenant_id: str
+    label: str
+    findings: List[Finding] = Field(default_factory=list)
+    resources: int = 0
+    error: Optional[str] = None
+    worker: Optional[str] = None
+    seconds: float = 0.0
+
+    @classmethod
+    def failed(cls, unit: WorkUnit, error: str, **fields) -> "UnitResult":
+        return cls(
+            unit_id=unit.id,
+            job_id=unit.job_id,
+            tenant_id=unit.tenant_id,
+            label=unit.label,
+            error=error,
+            **fields,
+        )
+
+
+class WorkQueue(ABC):
+    """Durable queue of work units and their results."""
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def publish(self, units: Sequence[WorkUnit]):
+        """Adds units; workers claim them in publication order."""
+
+    @abstractmethod
+    def claim(self, worker: str, lease_seconds: float) -> Optional[WorkUnit]:
+        """
+        Leases the next unit to ``worker``, or returns ``None`` if none is ready.
+
+        A unit whose lease expired is claimed again. Once it has been claimed
+        ``max_attempts`` times it is completed with an error instead.
+        """
+
+    @abstractmethod
+    def complete(self, result: UnitResult):
+        """Stores a unit's result and removes the unit from the queue."""
+
+    @abstractmethod
+    def remaining(self, job_id: str) -> int:
+        """Number of the job's units without a result yet."""
+
+    @abstractmethod
+    def results(self, job_id: str) -> List[UnitResult]:
+        """Results stored for the job so far."""
+
+    @abstractmethod
+    def purge(self, job_id: str):
+        """Forgets a job's units and results."""
+
+    def close(self):
+        pass
+
+    def _exhausted(self, unit: WorkUnit) -> UnitResult:
+        logger.error(f"Giving up on {unit.id} after {unit.attempts} attempts")
+        return UnitResult.failed(
+            unit, f"lease expired {unit.attempts} times; workers keep failing"
+        )
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Queue stored in a SQLite database file.
+
+    Claims run in ``BEGIN IMMEDIATE`` transactions, so concurrent workers
+    never lease the same unit; WAL mode keeps readers from blocking them.
+    """
+
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        super().__init__(max_attempts)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS units (
+                id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_until REAL
+            );
+            CREATE INDEX IF NOT EXISTS units_state ON units (state, lease_until);
+            CREATE INDEX IF NOT EXISTS units_job ON units (job_id, state);
+            CREATE TABLE IF NOT EXISTS results (
+                unit_id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_job ON results (job_id);
+            """)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def publish(self, units: Sequence[WorkUnit]):
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO units (id, job_id, payload) VALUES (?, ?, ?)",
+                [(unit.id, unit.job_id, unit.json()) for unit in units],
+            )
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[WorkUnit]:
+        with self._transaction() as db:
+            while True:
+                now = time.time()
+                row = db.execute(
+                    "SELECT payload FROM units WHERE state = 'pending' "
+                    "OR (state = 'leased' AND lease_until < ?) "
+                    "ORDER BY rowid LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                unit = WorkUnit.parse_raw(row[0])
+                if unit.attempts >= self.max_attempts:
+                    self._store(db, self._exhausted(unit))
+                    continue
+                unit.attempts += 1
+                db.execute(
+                    "UPDATE units SET state = 'leased', worker = ?, lease_until = ?, "
+                    "payload = ? WHERE id = ?",
+                    (worker, now + lease_seconds, unit.json(), unit.id),
+                )
+                return unit
+
+    def complete(self, result: UnitResult):
+        with self._transaction() as db:
+            self._store(db, result)
+
+    def _store(self, db: sqlite3.Connection, result: UnitResult):
+        # A unit re-run after its lease expired simply replaces the result.
+        db.execute(
+            "INSERT OR REPLACE INTO results (unit_id, job_id, payload) "
+            "VALUES (?, ?, ?)",
+            (result.unit_id, result.job_id, result.json()),
+        )
+        db.execute("DELETE FROM units WHERE id = ?", (result.unit_id,))
+
+    def remaining(self, job_id: str) -> int:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM units WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return int(row[0])
+
+    def results(self, job_id: str) -> List[UnitResult]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT payload FROM results WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return [UnitResult.parse_raw(row[0]) for row in rows]
+
+    def purge(self, job_id: str):
+        with self._transaction() as db:
+            db.execute("DELETE FROM units WHERE job_id = ?", (job_id,))
+            db.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Queue stored in Redis or a protocol-compatible server.
+
+    Keys live under ``prefix``: a ``pending`` list of unit ids, a ``units``
+    hash of their payloads, a ``leases`` sorted set of lease deadlines and,
+    per job, a set of unfinished unit ids and a hash of results. Claims run
+    as a Lua script, so popping a unit and leasing it is atomic.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "sspm:queue",
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ):
+        super().__init__(max_attempts)
+        try:
+            import redis
+        except ImportError:
+            raise ImportError(
+                "The Redis work queue requires the 'redis' package "
+                "(pip install sspm-engine[distributed])."
+            ) from None
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._claim = self._redis.register_script(_REDIS_CLAIM)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    def publish(self, units: Sequence[WorkUnit]):
+        pipe = self._redis.pipeline()
+        for unit in units:
+            pipe.hset(self._key("units"), unit.id, unit.json())
+            pipe.sadd(self._key("job", unit.job_id, "units"), unit.id)
+            pipe.rpush(self._key("pending"), unit.id)
+        pipe.execute()
+
+    def claim(self, worker: str, lease_seconds: float) -> Optional[WorkUnit]:
+        keys = [self._key("pending"), self._key("units"), self._key("leases")]
+        while True:
+            now = time.time()
+            payload: Any = self._claim(keys=keys, args=[now, now + lease_seconds])
+            if payload is None:
+                return None
+            unit = WorkUnit.parse_raw(payload)
+            if unit.attempts >= self.max_attempts:
+                self.complete(self._exhausted(unit))
+                continue
+            unit.attempts += 1
+            self._redis.hset(self._key("units"), unit.id, unit.json())
+            return unit
+
+    def complete(self, result: UnitResult):
+        pipe = self._redis.pipeline()
+        pipe.hset(
+            self._key("job", result.job_id, "results"), result.unit_id, result.json()
+        )
+        pipe.srem(self._key("job", result.job_id, "units"), result.unit_id)
+        pipe.zrem(self._key("leases"), result.unit_id)
+        pipe.hdel(self._key("units"), result.unit_id)
+        pipe.execute()
+
+    def remaining(self, job_id: str) -> int:
+        return int(self._redis.scard(self._key("job", job_id, "units")))
+
+    def results(self, job_id: str) -> List[UnitResult]:
+        payloads = self._redis.hvals(self._key("job", job_id, "results"))
+        return [UnitResult.parse_raw(payload) for payload in payloads]
+
+    def purge(self, job_id: str):
+        unit_ids = self._redis.smembers(self._key("job", job_id, "units"))
+        pipe = self._redis.pipeline()
+        for unit_id in unit_ids:
+            pipe.hdel(self._key("units"), unit_id)
+            pipe.zrem(self._key("leases"), unit_id)
+            pipe.lrem(self._key("pending"), 0, unit_id)
+        pipe.delete(
+            self._key("job", job_id, "units"), self._key("job", job_id, "results")
+        )
+        pipe.execute()
+
+    def close(self):
+        self._redis.close()
+
+
+def open_queue(url: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> WorkQueue:
+    """
+    Opens the queue at ``url``.
+
+    ``redis://``, ``rediss://`` and ``unix://`` URLs use Redis; anything else
+    is a SQLite file, given as a path or as ``sqlite:///relative/path`` /
+    ``sqlite:////absolute/path``.
+    """
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisWorkQueue(url, max_attempts=max_attempts)
+    if url.startswith("sqlite:///"):
+        url = url.replace("sqlite:///", "", 1)
+    return SQLiteWorkQueue(url, max_attempts=max_attempts)
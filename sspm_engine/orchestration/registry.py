@@ -0,0 +1,78 @@
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+from ..models import Tenant
+
+logger = logging.getLogger(__name__)
+
+
+class TenantRegistry:
+    """
+    In-memory registry of the tenants the orchestrator can scan.
+
+    Registries are usually loaded from a YAML file with a top-level
+    ``tenants`` list; ``${VAR}`` references are expanded from the environment
+    and relative ``mock_file`` paths are resolved against the file location.
+    """
+
+    def __init__(self, tenants: Optional[List[Tenant]] = None):
+        self._tenants: Dict[str, Tenant] = {}
+        for tenant in tenants or []:
+            self.register(tenant)
+
+    @classmethod
+    def from_file(cls, path: str) -> "TenantRegistry":
+        with open(path, "r") as f:
+            raw = yaml.safe_load(f) or {}
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        tenants = []
+        for entry in raw.get("tenants", []):
+            entry = _expand_env(entry)
+            for provider in ("slack", "github", "google"):
+                settings = entry.get(provider)
+                if settings and settings.get("mock_file"):
+                    settings["mock_file"] = os.path.join(
+                        base_dir, settings["mock_file"]
+                    )
+            tenants.append(Tenant(**entry))
+        return cls(tenants)
+
+    def register(self, tenant: Tenant):
+        if tenant.id in self._tenants:
+            raise ValueError(f"Tenant '{tenant.id}' is already registered.")
+        self._tenants[tenant.id] = tenant
+
+    def unregister(self, tenant_id: str):
+        self._tenants.pop(tenant_id, None)
+
+    def get(self, tenant_id: str) -> Tenant:
+        try:
+            return self._tenants[tenant_id]
+        except KeyError:
+            raise KeyError(f"Unknown tenant '{tenant_id}'.") from None
+
+    def ids(self) -> List[str]:
+        return list(self._tenants)
+
+    def __iter__(self) -> Iterator[Tenant]:
+        return iter(list(self._tenants.values()))
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        return tenant_id in self._tenants
+
+
+def _expand_env(value: Any) -> Any:
+    if isinstance(value, str):
+        return os.path.expandvars(value)
+    if isinstance(value, dict):
+        return {k: _expand_env(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_expand_env(v) for v in value]
+    return value
@@ -0,0 +1,174 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from ..engine import SSPMEngine
+from ..models import Finding, ScanResult, Tenant
+from .registry import TenantRegistry
+
+logger = logging.getLogger(__name__)
+
+EngineFactory = Callable[[Tenant], SSPMEngine]
+
+
+class _TenantRun:
+    def __init__(self, tenant: Tenant, engine: SSPMEngine, providers: List[str]):
+        self.tenant = tenant
+        self.engine = engine
+        self.pending: Deque[str] = deque(providers)
+        self.providers = list(providers)
+        self.inflight = 0
+        self.findings: List[Finding] = []
+        self.errors: Dict[str, str] = {}
+        self.busy_seconds = 0.0
+        self.started = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        return not self.pending and self.inflight == 0
+
+
+class TenantScheduler:
+    """
+    Scans many tenants concurrently on a bounded worker pool.
+
+    Every tenant scan is split into one work unit per provider. Units are
+    dispatched round-robin across tenants, cheapest tenant first (based on the
+    durations observed in earlier runs), and no tenant may hold more than
+    ``max_inflight_per_tenant`` workers at once. A handful of very large
+    tenants therefore cannot starve the small ones. Each tenant gets its own
+    engine and integrations, so results never mix between tenants.
+    """
+
+    def __init__(
+        self,
+        registry: TenantRegistry,
+        max_workers: int = 8,
+        max_inflight_per_tenant: int = 1,
+        engine_factory: Optional[EngineFactory] = None,
+    ):
+        if max_workers < 1 or max_inflight_per_tenant < 1:
+            raise ValueError("Worker limits must be at least 1.")
+        self.registry = registry
+        self.max_workers = max_workers
+        self.max_inflight_per_tenant = max_inflight_per_tenant
+        self.engine_factory = engine_factory or (lambda t: SSPMEngine(tenant=t))
+        # Smoothed busy time per tenant, used to order the next run.
+        self.cost_estimates: Dict[str, float] = {}
+
+    def run(
+        self, tenant_ids: Optional[List[str]] = None, provider: str = "all"
+    ) -> Dict[str, ScanResult]:
+        """
+        Scans the selected tenants (all registered tenants by default).
+
+        Returns:
+            Dict[str, ScanResult]: One result per tenant id. Provider failures
+            are reported in ``metadata["errors"]`` rather than raised.
+        """
+        tenants = [self.registry.get(t) for t in (tenant_ids or self.registry.ids())]
+        tenants.sort(key=self._estimated_cost)
+
+        results: Dict[str, ScanResult] = {}
+        runs: Dict[str, _TenantRun] = {}
+        for tenant in tenants:
+            providers = [p for p in tenant.providers if provider in ["all", p]]
+            try:
+                engine = self.engine_factory(tenant)
+            except Exception as e:
+                logger.error(f"Failed to initialise tenant {tenant.id}: {e}")
+                results[tenant.id] = self._failed_result(tenant, providers, str(e))
+                continue
+            runs[tenant.id] = _TenantRun(tenant, engine, providers)
+
+        order = list(runs)
+        cursor = 0
+        inflight: Dict[Future, Tuple[str, str]] = {}
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sspm-tenant"
+        ) as pool:
+            while True:
+                # Fill free workers, one unit per tenant per round.
+                idle_rounds = 0
+                while len(inflight) < self.max_workers and idle_rounds < len(order):
+                    tenant_id = order[cursor % len(order)]
+                    cursor += 1
+                    run = runs[tenant_id]
+                    if not run.pending or run.inflight >= self.max_inflight_per_tenant:
+                        idle_rounds += 1
+                        continue
+                    idle_rounds = 0
+                    name = run.pending.popleft()
+                    run.inflight += 1
+                    future = pool.submit(self._scan_unit, run.engine, name)
+                    inflight[future] = (tenant_id, name)
+
+                for tenant_id in [t for t, r in runs.items() if r.done]:
+                    results[tenant_id] = self._finish(runs.pop(tenant_id))
+                    order.remove(tenant_id)
+
+                if not inflight:
+                    break
+
+                finished, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    tenant_id, name = inflight.pop(future)
+                    run = runs[tenant_id]
+                    run.inflight -= 1
+                    try:
+                        findings, elapsed = future.result()
+                        run.findings.extend(findings)
+                        run.busy_seconds += elapsed
+                    except Exception as e:
+                        logger.error(f"Tenant {tenant_id} {name} scan failed: {e}")
+                        run.errors[name] = str(e)
+
+        return results
+
+    def _scan_unit(self, engine: SSPMEngine, provider: str):
+        started = time.monotonic()
+        data = engine.fetch_provider(provider)
+        findings = engine.scan_data(data)
+        return findings, time.monotonic() - started
+
+    def _finish(self, run: _TenantRun) -> ScanResult:
+        result = run.engine.risk_engine.analyze(run.findings)
+        result.metadata.update(
+            {
+                "tenant_id": run.tenant.id,
+                "providers": run.providers,
+                "errors": run.errors,
+                "duration_seconds": round(time.monotonic() - run.started, 3),
+            }
+        )
+        previous = self.cost_estimates.get(run.tenant.id)
+        self.cost_estimates[run.tenant.id] = (
+            run.busy_seconds
+            if previous is None
+            else 0.5 * previous + 0.5 * run.busy_seconds
+        )
+        return result
+
+    def _estimated_cost(self, tenant: Tenant) -> Tuple[bool, float]:
+        # Tenants without history are ordered by their configured weight and
+        # go first; the rest by their observed busy time.
+        if tenant.id in self.cost_estimates:
+            return True, self.cost_estimates[tenant.id]
+        return False, tenant.weight
+
+    def _failed_result(
+        self, tenant: Tenant, providers: List[str], error: str
+    ) -> ScanResult:
+        return ScanResult(
+            score=0.0,
+            findings=[],
+            counts={},
+            metadata={
+                "tenant_id": tenant.id,
+                "providers": providers,
+                "errors": {"engine": error},
+            },
+        )
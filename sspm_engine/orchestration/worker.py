@@ -0,0 +1,158 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from ..engine import SSPMEngine
+from ..logging_config import setup_logging
+from ..models import Tenant
+from .queue import UnitResult, WorkQueue, WorkUnit, open_queue
+from .registry import TenantRegistry
+
+logger = logging.getLogger(__name__)
+
+EngineFactory = Callable[[Tenant], SSPMEngine]
+
+
+class Worker:
+    """
+    Pulls work units from a queue, fetches and scans them, and reports back.
+
+    Workers resolve tenants by id in their own ``registry`` (usually loaded
+    from the same file as the coordinator's), so credentials never travel
+    through the queue. Engines are kept per tenant, which lets later units
+    reuse the integrations' HTTP connections.
+
+    ``lease_seconds`` must exceed the longest unit: a unit still running when
+    its lease expires is handed to another worker as well.
+    """
+
+    def __init__(
+        self,
+        registry: TenantRegistry,
+        queue: WorkQueue,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 900.0,
+        poll_interval: float = 1.0,
+        engine_factory: Optional[EngineFactory] = None,
+    ):
+        self.registry = registry
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.engine_factory = engine_factory or (lambda t: SSPMEngine(tenant=t))
+        self._engines: Dict[str, SSPMEngine] = {}
+
+    def run_once(self) -> bool:
+        """Processes one unit; returns ``False`` if the queue had none."""
+        unit = self.queue.claim(self.worker_id, self.lease_seconds)
+        if unit is None:
+            return False
+        self.queue.complete(self.process(unit))
+        return True
+
+    def run(
+        self,
+        max_units: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Processes units until ``stop`` is set, ``max_units`` were processed or
+        the queue stayed empty for ``idle_timeout`` seconds.
+
+        Returns:
+            int: The number of units processed by this call.
+        """
+        stop = stop or threading.Event()
+        processed = 0
+        idle_since = time.monotonic()
+        while not stop.is_set() and (max_units is None or processed < max_units):
+            if self.run_once():
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+            if (
+                idle_timeout is not None
+                and time.monotonic() - idle_since >= idle_timeout
+            ):
+                break
+            stop.wait(self.poll_interval)
+        return processed
+
+    def process(self, unit: WorkUnit) -> UnitResult:
+        """Fetches and scans one unit; failures become the result's ``error``."""
+        started = time.monotonic()
+        logger.info(f"Worker {self.worker_id} processing {unit.id}")
+        try:
+            engine = self._engine(unit.tenant_id)
+            status: Dict[str, Dict] = {}
+            data = engine.fetch_provider(
+                unit.provider, status=status, shard=(unit.shard, unit.shards)
+            )
+            findings = engine.scan_data(data)
+        except Exception as e:
+            logger.error(f"Unit {unit.id} failed: {e}")
+            return UnitResult.failed(
+                unit,
+                str(e),
+                worker=self.worker_id,
+                seconds=round(time.monotonic() - started, 3),
+            )
+        return UnitResult(
+            unit_id=unit.id,
+            job_id=unit.job_id,
+            tenant_id=unit.tenant_id,
+            label=unit.label,
+            findings=findings,
+            resources=status[unit.provider]["resources"],
+            # Partial inventory is still scanned, but reported as an error.
+            error=status[unit.provider].get("error"),
+            worker=self.worker_id,
+            seconds=round(time.monotonic() - started, 3),
+        )
+
+    def _engine(self, tenant_id: str) -> SSPMEngine:
+        if tenant_id not in self._engines:
+            self._engines[tenant_id] = self.engine_factory(self.registry.get(tenant_id))
+        return self._engines[tenant_id]
+
+
+def serve(
+    registry_path: str,
+    queue_url: str,
+    idle_timeout: Optional[float] = None,
+    lease_seconds: float = 900.0,
+    max_units: Optional[int] = None,
+) -> int:
+    """
+    Runs a worker on the registry file and queue URL given.
+
+    This is the entry point of ``sspmctl worker`` and of the local worker
+    processes started by ``sspmctl coordinator --local-workers``.
+
+    Returns:
+        int: The number of units processed.
+    """
+    if not logging.getLogger().handlers:
+        # Worker processes spawned by the coordinator start unconfigured.
+        setup_logging()
+    stop = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        # Finish the unit in progress on SIGTERM (the coordinator stopping its
+        # local workers, or an orchestrator scaling down) before exiting.
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    queue = open_queue(queue_url)
+    try:
+        worker = Worker(
+            TenantRegistry.from_file(registry_path),
+            queue,
+            lease_seconds=lease_seconds,
+        )
+        return worker.run(max_units=max_units, idle_timeout=idle_timeout, stop=stop)
+    finally:
+        queue.close()
@@ -0,0 +1,231 @@
+"""
+Compact, normalized inventory records.
+
+Provider APIs return dicts carrying every field they know about, and values
+such as roles, domains, permission types and logins repeat across millions of
+resources. Integrations normalize each resource into a slotted record holding
+only the fields the scanners, the inventory and the webhooks use, with string
+values interned so every repeat shares one object.
+
+Records are read-only ``Mapping`` objects, so scanners and the inventory
+treat them exactly like the provider dicts they replace (``record.get(...)``,
+``{**record}``). Use ``as_dict`` wherever a resource leaves the process, e.g.
+as ``Finding.data``.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Tuple, Type
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+# Marks fields holding sequences of strings in Record._PLAN.
+_SEQUENCE = object()
+
+
+class Record(Mapping):
+    """
+    Base class for normalized resources.
+
+    Subclasses list their fields in ``__slots__``. ``ALIASES`` names the raw
+    provider keys read for a field (first present wins, defaulting to the
+    field name); ``SEQUENCES`` are fields holding lists of strings and
+    ``NESTED`` maps fields holding lists of sub-records to their record type.
+    Missing fields are ``None``, as ``dict.get`` would return.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    ALIASES: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+    SEQUENCES: ClassVar[Tuple[str, ...]] = ()
+    NESTED: ClassVar[Dict[str, Type["Record"]]] = {}
+    # (field, slot setter, raw keys, nested record type or _SEQUENCE) per
+    # field, precomputed because normalization runs once per resource.
+    _PLAN: ClassVar[Tuple[Tuple[str, Any, Tuple[str, ...], Any], ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._PLAN = tuple(
+            (
+                field,
+                getattr(cls, field).__set__,
+                cls.ALIASES.get(field, (field,)),
+                cls.NESTED.get(field, _SEQUENCE if field in cls.SEQUENCES else None),
+            )
+            for field in cls.__slots__
+        )
+
+    def __init__(self, **values: Any):
+        self._fill(values, aliases=False)
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> "Record":
+        """Normalizes a provider dict, keeping only known fields."""
+        # Exact type check: isinstance against an ABC is comparatively slow.
+        if raw.__class__ is cls:
+            return raw  # type: ignore[return-value]
+        record = cls.__new__(cls)
+        record._fill(raw, aliases=True)
+        return record
+
+    def _fill(self, source: Mapping, aliases: bool):
+        intern = sys.intern
+        get = source.get
+        for field, setter, keys, nested in self._PLAN:
+            if not aliases:
+                value = get(field)
+            elif len(keys) == 1:
+                value = get(keys[0])
+            else:
+                value = next((source[k] for k in keys if k in source), None)
+            if value is not None:
+                if nested is None:
+                    if value.__class__ is str:
+                        value = intern(value)
+                elif nested is _SEQUENCE:
+                    value = tuple(_intern(v) for v in value)
+                else:
+                    value = tuple(nested.from_raw(v) for v in value)
+            setter(self, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return (_restore, (type(self), self.to_dict()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The fields that are set, as plain data. Fields the provider did not
+        return are left out rather than written as ``null``.
+        """
+        values = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if value is not None:
+                values[field] = as_dict(value)
+        return values
+
+
+def _restore(cls: Type[Record], values: Dict[str, Any]) -> Record:
+    return cls(**values)
+
+
+def as_dict(value: Any) -> Any:
+    """Converts records (also nested in dicts and sequences) to plain data."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {k: as_dict(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [as_dict(v) for v in value]
+    return value
+
+
+class SlackUser(Record):
+    __slots__ = (
+        "id",
+        "name",
+        "email",
+        "team_id",
+        "is_admin",
+        "is_owner",
+        "has_2fa",
+        "is_restricted",
+        "is_ultra_restricted",
+        "is_stranger",
+        "is_bot",
+        "deleted",
+    )
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> Record:
+        record = super().from_raw(raw)
+        if record.get("email") is None and raw.get("profile"):
+            # users.list nests the address in the profile.
+            object.__setattr__(record, "email", _intern(raw["profile"].get("email")))
+        return record
+
+
+class SlackChannel(Record):
+    __slots__ = (
+        "id",
+        "name",
+        "is_private",
+        "is_shared",
+        "is_ext_shared",
+        "is_archived",
+        "members",
+    )
+    SEQUENCES = ("members",)
+
+
+class GitHubRepo(Record):
+    __slots__ = (
+        "name",
+        "private",
+        "branch_protection",
+        "default_branch",
+        "collaborators",
+        "html_url",
+        "description",
+    )
+    SEQUENCES = ("collaborators",)
+
+
+class GitHubMember(Record):
+    __slots__ = ("login", "role", "mfa_enabled")
+
+
+class GoogleUser(Record):
+    __slots__ = ("id", "email", "is_super_admin", "is_enrolled_in_2sv", "suspended")
+    ALIASES = {
+        "email": ("email", "primaryEmail"),
+        "is_super_admin": ("is_super_admin", "isAdmin"),
+        "is_enrolled_in_2sv": ("is_enrolled_in_2sv", "isEnrolledIn2Sv"),
+    }
+
+
+class DrivePermission(Record):
+    __slots__ = ("type", "role", "email", "domain")
+    ALIASES = {"email": ("email", "emailAddress")}
+
+
+class DriveFile(Record):
+    __slots__ = ("id", "name", "owner", "shared_with_me", "permissions")
+    ALIASES = {"shared_with_me": ("shared_with_me", "sharedWithMe")}
+    NESTED = {"permissions": DrivePermission}
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> Record:
+        record = super().from_raw(raw)
+        if record.get("owner") is None and raw.get("owners"):
+            # The Drive API lists owners; files in shared drives have none.
+            owner = raw["owners"][0].get("emailAddress")
+            object.__setattr__(record, "owner", _intern(owner))
+        return record
+
+
+def normalize(record_type: Type[Record], resources: Iterable[Mapping]) -> List[Any]:
+    """Normalizes provider dicts as they are read, e.g. page by page."""
+    from_raw = record_type.from_raw
+    return [from_raw(resource) for resource in resources]
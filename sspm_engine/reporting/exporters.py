@@ -0,0 +1,259 @@
+"""
+Streaming, machine-readable exporters for scan findings.
+
+Exporters receive findings one at a time and write them straight to disk, so
+the serialized output is never held in memory. ``export`` feeds several
+exporters from a single pass over the findings.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+
+from ..models import Finding, ScanResult, Severity
+from ..serialization import dumps, open_output
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {
+    Severity.CRITICAL: "error",
+    Severity.HIGH: "error",
+    Severity.MEDIUM: "warning",
+    Severity.LOW: "note",
+    Severity.UNKNOWN: "none",
+}
+
+
+def finding_record(finding: Finding) -> Dict[str, Any]:
+    record = finding.dict()
+    record["fingerprint"] = finding.fingerprint
+    return record
+
+
+class BaseExporter(ABC):
+    def __init__(self, output_path: str, compression: Optional[str] = None):
+        self.output_path = output_path
+        self.compression = compression
+
+    def open(self, result: ScanResult):
+        """Called once before the first finding."""
+
+    @abstractmethod
+    def write(self, finding: Finding):
+        pass
+
+    def close(self, result: ScanResult):
+        """Called once after the last finding."""
+
+
+class NDJSONExporter(BaseExporter):
+    """One JSON document per finding per line."""
+
+    def open(self, result: ScanResult):
+        self._file = open_output(self.output_path, self.compression)
+
+    def write(self, finding: Finding):
+        self._file.write(dumps(finding_record(finding)) + b"\n")
+
+    def close(self, result: ScanResult):
+        self._file.close()
+
+
+class SARIFExporter(BaseExporter):
+    """
+    SARIF 2.1.0 log with one run.
+
+    Results are streamed as they arrive; the tool section, including the
+    rules referenced by the results, is written after them.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        compression: Optional[str] = None,
+        rules: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        super().__init__(output_path, compression)
+        self.rules = rules or {}
+
+    def open(self, result: ScanResult):
+        self._file = open_output(self.output_path, self.compression)
+        self._file.write(
+            b'{"version":"2.1.0","$schema":' + dumps(SARIF_SCHEMA) + b',"runs":[{'
+            b'"results":['
+        )
+        self._first = True
+        self._rule_ids: Dict[str, None] = {}
+
+    def write(self, finding: Finding):
+        self._rule_ids.setdefault(finding.rule_id, None)
+        record = {
+            "ruleId": finding.rule_id,
+            "level": SARIF_LEVELS.get(finding.severity, "none"),
+            "message": {"text": finding.details},
+            "locations": [
+                {
+                    "logicalLocations": [
+                        {
+                            "fullyQualifiedName": finding.resource_id,
+                            "kind": finding.resource_type.value,
+                        }
+                    ]
+                }
+            ],
+            "partialFingerprints": {"sspm/v1": finding.fingerprint},
+            "properties": {
+                "severity": finding.severity.value,
+                "category": finding.category,
+            },
+        }
+        self._file.write((b"\n" if self._first else b",\n") + dumps(record))
+        self._first = False
+
+    def close(self, result: ScanResult):
+        from .. import __version__
+
+        rules = []
+        for rule_id in self._rule_ids:
+            rule = self.rules.get(rule_id, {})
+            descriptor: Dict[str, Any] = {"id": rule_id}
+            if rule.get("name"):
+                descriptor["name"] = rule["name"]
+                descriptor["shortDescription"] = {"text": rule["name"]}
+            if rule.get("description"):
+                descriptor["fullDescription"] = {"text": rule["description"]}
+            rules.append(descriptor)
+
+        tool = {
+            "driver": {
+                "name": "SSPM Engine",
+                "version": __version__,
+                "informationUri": "https://github.com/Raoof128/SSPME",
+                "rules": rules,
+            }
+        }
+        properties = {"riskScore": result.score, "counts": result.counts}
+        self._file.write(
+            b"\n],"
+            + b'"tool":'
+            + dumps(tool)
+            + b',"properties":'
+            + dumps(properties)
+            + b"}]}\n"
+        )
+        self._file.close()
+
+
+class ParquetExporter(BaseExporter):
+    """
+    Parquet file written in row groups of ``batch_size`` findings.
+
+    Requires pyarrow. ``compression`` is the Parquet codec (``zstd`` by
+    default, or ``gzip``, ``snappy``, ``none``).
+    """
+
+    COLUMNS = [
+        "fingerprint",
+        "rule_id",
+        "resource_id",
+        "resource_type",
+        "severity",
+        "category",
+        "details",
+        "remediation",
+        "data",
+    ]
+
+    def __init__(
+        self,
+        output_path: str,
+        compression: Optional[str] = "zstd",
+        batch_size: int = 50_000,
+    ):
+        super().__init__(output_path, compression)
+        self.batch_size = batch_size
+
+    def open(self, result: ScanResult):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Parquet export requires the 'pyarrow' package "
+                "(pip install sspm-engine[export])."
+            ) from None
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, pa.string()) for name in self.COLUMNS],
+            metadata={"risk_score": str(result.score)},
+        )
+        self._writer = pq.ParquetWriter(
+            self.output_path, self._schema, compression=self.compression or "none"
+        )
+        self._batch: Dict[str, List[Optional[str]]] = {c: [] for c in self.COLUMNS}
+        self._rows = 0
+
+    def write(self, finding: Finding):
+        batch = self._batch
+        batch["fingerprint"].append(finding.fingerprint)
+        batch["rule_id"].append(finding.rule_id)
+        batch["resource_id"].append(finding.resource_id)
+        batch["resource_type"].append(finding.resource_type.value)
+        batch["severity"].append(finding.severity.value)
+        batch["category"].append(finding.category)
+        batch["details"].append(finding.details)
+        batch["remediation"].append(finding.remediation)
+        batch["data"].append(
+            json.dumps(finding.data, default=str) if finding.data is not None else None
+        )
+        self._rows += 1
+        if self._rows >= self.batch_size:
+            self._flush()
+
+    def close(self, result: ScanResult):
+        self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        table = self._pa.Table.from_pydict(self._batch, schema=self._schema)
+        self._writer.write_table(table)
+        self._batch = {c: [] for c in self.COLUMNS}
+        self._rows = 0
+
+
+EXPORTERS: Dict[str, Type[BaseExporter]] = {
+    "ndjson": NDJSONExporter,
+    "sarif": SARIFExporter,
+    "parquet": ParquetExporter,
+}
+
+
+def create_exporter(
+    format: str, output_path: str, compression: Optional[str] = None, **options
+) -> BaseExporter:
+    try:
+        exporter_class = EXPORTERS[format]
+    except KeyError:
+        raise ValueError(
+            f"Unknown export format '{format}'. Choose from {', '.join(EXPORTERS)}."
+        ) from None
+    if compression is not None:
+        options["compression"] = compression
+    return exporter_class(output_path, **options)
+
+
+def export(result: ScanResult, exporters: List[BaseExporter]):
+    """Writes every exporter from a single pass over ``result.findings``."""
+    opened: List[BaseExporter] = []
+    try:
+        for exporter in exporters:
+            exporter.open(result)
+            opened.append(exporter)
+        for finding in result.findings:
+            for exporter in exporters:
+                exporter.write(finding)
+    finally:
+        for exporter in opened:
+            exporter.close(result)
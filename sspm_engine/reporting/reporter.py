@@ -1,8 +1,57 @@
-from datetime import datetime
+import json
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
 
 from jinja2 import Environment, FileSystemLoader
 
-from ..models import ScanResult
+from ..analytics.diff import DiffCounter, DiffEntry, DiffStatus
+from ..models import Finding, ScanResult, Severity
+from ..serialization import dumps, open_output
+from .exporters import create_exporter, export
+
+SEVERITY_ORDER = [s.value for s in Severity]
+
+# Characters buffered by Jinja before each write when streaming a report.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def summarize_by_rule(
+    findings: Iterable[Finding],
+    rules: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_resources: Optional[int] = 20,
+) -> List[Dict[str, Any]]:
+    """
+    Groups findings by rule in a single pass.
+
+    Each group holds the rule's name, severity, category, number of findings
+    and up to ``max_resources`` affected resource ids. Groups are ordered by
+    severity, then by descending count.
+    """
+    rules = rules or {}
+    groups: Dict[str, Dict[str, Any]] = {}
+    for finding in findings:
+        group = groups.get(finding.rule_id)
+        if group is None:
+            rule = rules.get(finding.rule_id, {})
+            group = groups[finding.rule_id] = {
+                "rule_id": finding.rule_id,
+                "rule_name": rule.get("name", finding.rule_id),
+                "severity": finding.severity.value,
+                "category": finding.category,
+                "remediation": finding.remediation,
+                "count": 0,
+                "resources": [],
+            }
+        group["count"] += 1
+        if max_resources is None or len(group["resources"]) < max_resources:
+            group["resources"].append(finding.resource_id)
+
+    return sorted(
+        groups.values(),
+        key=lambda g: (SEVERITY_ORDER.index(g["severity"]), -g["count"]),
+    )
 
 
 class Reporter:
@@ -10,18 +59,127 @@ class Reporter:
         self.env = Environment(loader=FileSystemLoader(template_dir))
         self.env.globals["now"] = lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    def generate_markdown_report(self, result: ScanResult, output_path: str):
+    def generate_markdown_report(
+        self,
+        result: ScanResult,
+        output_path: str,
+        rules: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_findings: Optional[int] = None,
+        max_resources_per_rule: Optional[int] = 20,
+    ):
+        """
+        Streams the Markdown report to ``output_path``.
+
+        The template is rendered incrementally with buffered writes, so the
+        full document is never held in memory. ``max_findings`` truncates the
+        detailed findings section; the summary and remediation sections always
+        cover every finding.
+        """
+        rules = rules or {}
+        total = len(result.findings)
+        shown = total if max_findings is None else min(max_findings, total)
+
         template = self.env.get_template("report.md.j2")
+        stream = template.stream(
+            score=result.score,
+            counts=result.counts,
+            total=total,
+            findings=islice(result.findings, shown),
+            omitted=total - shown,
+            rule_names={rule_id: rule.get("name") for rule_id, rule in rules.items()},
+            groups=summarize_by_rule(result.findings, rules, max_resources_per_rule),
+        )
+        stream.enable_buffering(STREAM_BUFFER_SIZE)
+        with open(output_path, "w", buffering=STREAM_BUFFER_SIZE) as f:
+            f.writelines(stream)
+
+    def generate_json_report(self, result: ScanResult, output_path: str):
+        """
+        Writes the full ``ScanResult`` as JSON, one finding at a time.
+
+        The document has the same shape as ``result.json()`` but findings are
+        serialized individually, so the complete string is never built.
+        """
+        with open(output_path, "w", buffering=STREAM_BUFFER_SIZE) as f:
+            f.write('{\n  "score": ' + json.dumps(result.score) + ',\n  "findings": [')
+            for i, finding in enumerate(result.findings):
+                f.write(("\n    " if i == 0 else ",\n    ") + finding.json())
+            f.write(
+                "\n  ],\n"
+                + '  "counts": '
+                + json.dumps(result.counts)
+                + ',\n  "metadata": '
+                + json.dumps(result.metadata, default=str)
+                + "\n}\n"
+            )
+
+    def generate_summary_report(
+        self, result: ScanResult, output_path: str, scan_id: Optional[str] = None
+    ):
+        """Renders ``summary.json.j2``: score and severity counts only."""
+        template = self.env.get_template("summary.json.j2")
         content = template.render(
-            score=result.score, findings=result.findings, counts=result.counts
+            scan_id=scan_id or result.metadata.get("scan_id") or uuid.uuid4().hex,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            score=result.score,
+            findings=result.findings,
+            counts=result.counts,
         )
         with open(output_path, "w") as f:
             f.write(content)
 
-    def generate_json_report(self, result: ScanResult, output_path: str):
-        # Pydantic models have a .dict() method (v1) or .model_dump() (v2)
-        # Assuming Pydantic v1 compatibility based on requirements
-        # often defaulting to older strictness. Best to use json()
+    def export(
+        self,
+        result: ScanResult,
+        outputs: Dict[str, str],
+        rules: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        Writes several machine-readable formats in one pass over the findings.
 
-        with open(output_path, "w") as f:
-            f.write(result.json(indent=2))
+        Args:
+            outputs: Maps an export format (``ndjson``, ``sarif``, ``parquet``)
+                to its output path. ``.gz``/``.zst`` suffixes select gzip/zstd
+                compression for the text formats.
+        """
+        exporters = [
+            (
+                create_exporter(format, path, rules=rules)
+                if format == "sarif"
+                else create_exporter(format, path)
+            )
+            for format, path in outputs.items()
+        ]
+        export(result, exporters)
+
+    def generate_diff_report(
+        self,
+        entries: Iterable[DiffEntry],
+        output_path: str,
+        format: str = "markdown",
+        include_unchanged: bool = False,
+    ) -> DiffCounter:
+        """
+        Streams a scan diff to ``output_path`` as Markdown or NDJSON.
+
+        Markdown lists new and resolved findings; unchanged ones are only
+        counted. NDJSON also lists unchanged findings when
+        ``include_unchanged`` is set. Returns the per-status counts.
+        """
+        counter = DiffCounter()
+        tracked = counter.track(entries)
+        if not (include_unchanged and format == "ndjson"):
+            tracked = (e for e in tracked if e.status != DiffStatus.UNCHANGED)
+
+        if format == "ndjson":
+            with open_output(output_path) as out:
+                for entry in tracked:
+                    out.write(dumps(entry.dict()) + b"\n")
+            return counter
+
+        template = self.env.get_template("diff.md.j2")
+        stream = template.stream(entries=tracked, counter=counter)
+        stream.enable_buffering(STREAM_BUFFER_SIZE)
+        with open(output_path, "w", buffering=STREAM_BUFFER_SIZE) as f:
+            f.writelines(stream)
+        return counter
@@ -0,0 +1,103 @@
+"""
+One-pass aggregation of a stream of findings for terminal output.
+
+Findings are counted, scored and grouped as they arrive and only a bounded
+window of the most severe ones is retained, so summarizing a scan costs
+memory proportional to the number of rules and the requested page, not
+the number of findings.
+"""
+
+import heapq
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from ..analytics.scoring import ScoringEngine
+from ..models import Finding, Severity
+
+if TYPE_CHECKING:
+    from ..api.findings import FindingFilter
+
+SEVERITY_RANK = {severity.value: rank for rank, severity in enumerate(Severity)}
+
+_DetailKey = Tuple[int, str, str, int]
+
+
+class ScanSummary:
+    """
+    Aggregates findings by rule and provider in a single pass.
+
+    Every finding counts towards ``score`` and ``counts``; only findings
+    matching ``finding_filter`` are grouped and considered for the detail
+    window, which holds the findings ranked ``offset`` to ``offset + limit``
+    by severity, rule and resource.
+    """
+
+    def __init__(
+        self,
+        finding_filter: Optional["FindingFilter"] = None,
+        limit: int = 20,
+        offset: int = 0,
+        scorer: Optional[ScoringEngine] = None,
+    ):
+        self.finding_filter = finding_filter
+        self.limit = limit
+        self.offset = offset
+        self.weights = (scorer or ScoringEngine()).severity_weights
+        self.total = 0
+        self.matched = 0
+        self.counts = {severity.value: 0 for severity in Severity}
+        self.groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._weight = 0.0
+        self._window: List[Tuple[_DetailKey, Finding]] = []
+
+    @property
+    def score(self) -> float:
+        return min(self._weight, 100.0)
+
+    def add(self, finding: Finding) -> bool:
+        """Records a finding; returns whether it matches the filter."""
+        self.total += 1
+        self.counts[finding.severity.value] += 1
+        self._weight += self.weights.get(finding.severity, 1.0)
+        if self.finding_filter is not None and not self.finding_filter.matches(finding):
+            return False
+
+        self.matched += 1
+        key = (finding.rule_id, finding.provider)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = {
+                "rule_id": finding.rule_id,
+                "provider": finding.provider,
+                "severity": finding.severity.value,
+                "count": 0,
+            }
+        group["count"] += 1
+
+        if self.limit > 0:
+            rank = (
+                SEVERITY_RANK[finding.severity.value],
+                finding.rule_id,
+                finding.resource_id,
+                self.matched,
+            )
+            self._window.append((rank, finding))
+            # Prune lazily so that retaining the window stays O(n log k).
+            if len(self._window) >= 2 * self._window_size():
+                self._window = heapq.nsmallest(self._window_size(), self._window)
+        return True
+
+    def grouped(self) -> List[Dict[str, Any]]:
+        """Groups ordered by severity, then by descending count."""
+        return sorted(
+            self.groups.values(),
+            key=lambda g: (SEVERITY_RANK[g["severity"]], -g["count"], g["rule_id"]),
+        )
+
+    def detail(self) -> List[Finding]:
+        """The requested window of matching findings, most severe first."""
+        window = heapq.nsmallest(self._window_size(), self._window)
+        return [finding for _, finding in islice(window, self.offset, None)]
+
+    def _window_size(self) -> int:
+        return max(self.offset + self.limit, 1)
@@ -0,0 +1,217 @@
+"""
+High-entropy token detection for the secret scanner.
+
+Regexes only find secrets in formats someone wrote a pattern for, and each
+extra pattern is one more pass over every text. Generated credentials of any
+format share one property instead: they are long runs of base64 or hex
+characters with close to uniform character frequencies. Detection runs in
+three stages over a whole batch of texts at once:
+
+1. one regex pass extracts candidate tokens (runs of at least 20 base64 or
+   hex characters) and classifies each by charset, leaving out hex the text
+   labels as a digest (``sha256:<hex>``, ``commit <hex>``), which is as
+   random as a key but not a secret,
+2. the Shannon entropy of every candidate is computed from its byte
+   histogram, vectorized over batches of tokens when numpy is installed,
+3. tokens above their charset's threshold are reported unless the sha256 of
+   the token is in the allowlist.
+
+Thresholds are bits per character. Random hex tops out at 4 and random
+base64 at 6, but a 20 character token cannot exceed ``log2(20) = 4.3``, so
+short base64 tokens only pass when nearly every character differs::
+
+    detector = EntropyDetector()
+    [hit.entropy for hit in detector.detect(["key: 9fK2mQx7Lp0sVt4RbN8cZw1yHe5"])]
+    # [4.755]
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None  # type: ignore[assignment]
+
+MIN_LENGTH = 20
+
+# Runs of standard or URL-safe base64 characters, with optional padding.
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9+/_\-]{%d,}={0,2}" % MIN_LENGTH)
+
+# Bits per character a token of each charset must exceed.
+DEFAULT_THRESHOLDS: Dict[str, float] = {"hex": 3.0, "base64": 4.5}
+
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+# Prefixes naming a digest (``sha256:<hex>`` image digests, ``md5:``
+# checksums), and keys or words labelling the hex after them as one
+# (``commit 3f2a...``, ``"sha": "3f2a..."``). Length alone does not tell a
+# commit hash from a 160-bit key, so unlabelled hex is always scored.
+DIGEST_PREFIXES = ("md5:", "sha1:", "sha256:", "sha384:", "sha512:")
+DIGEST_LABEL = re.compile(r"\b(?:commit|sha)[\s\"':=#@]{1,4}$", re.IGNORECASE)
+_LABEL_WINDOW = 12
+
+# Tokens per histogram matrix: 4096 x 256 counts is a few megabytes.
+BATCH_SIZE = 4096
+
+
+class Candidate(NamedTuple):
+    """A token extracted from ``texts[source]`` at ``start:end``."""
+
+    source: int
+    start: int
+    end: int
+    token: str
+    charset: str
+
+
+class Hit(NamedTuple):
+    """A candidate above its threshold. The token itself is not kept."""
+
+    source: int
+    start: int
+    end: int
+    charset: str
+    entropy: float
+    sha256: str
+
+
+def charset(token: str) -> Optional[str]:
+    """``hex`` or ``base64``; ``None`` for tokens that are never secrets."""
+    if token.isdigit():
+        # Numbers (ids, timestamps, phone numbers) are hex-looking but
+        # never credentials.
+        return None
+    if _HEX.issuperset(token):
+        return "hex"
+    return "base64"
+
+
+def token_hash(token: str) -> str:
+    """The sha256 hex digest allowlists identify a token by."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _is_digest(text: str, start: int) -> bool:
+    """Whether the hex token at ``text[start:]`` is labelled as a digest."""
+    if text.endswith(DIGEST_PREFIXES, 0, start):
+        return True
+    window = max(0, start - _LABEL_WINDOW)
+    return DIGEST_LABEL.search(text, window, start) is not None
+
+
+def _entropy(token: str) -> float:
+    length = len(token)
+    weighted = sum(c * math.log2(c) for c in Counter(token).values())
+    return math.log2(length) - weighted / length
+
+
+def _entropy_batch(tokens: Sequence[str]) -> List[float]:
+    # Cell (i << 8) | b of the histogram counts byte b in tokens[i]; with
+    # counts c and length n, entropy is log2(n) - sum(c * log2(c)) / n. Only
+    # the few non-empty cells of each row are reduced.
+    count = len(tokens)
+    lengths = numpy.fromiter(map(len, tokens), dtype=numpy.int64, count=count)
+    data = numpy.frombuffer("".join(tokens).encode("ascii"), dtype=numpy.uint8)
+    owners = numpy.repeat(numpy.arange(count, dtype=numpy.int64), lengths)
+    histogram = numpy.bincount((owners << 8) | data, minlength=count << 8)
+    cells = histogram.nonzero()[0]
+    counts = histogram[cells].astype(numpy.float64)
+    weighted = numpy.bincount(
+        cells >> 8, weights=counts * numpy.log2(counts), minlength=count
+    )
+    scores: List[float] = (numpy.log2(lengths) - weighted / lengths).tolist()
+    return scores
+
+
+def shannon_entropy(tokens: Sequence[str], batch_size: int = BATCH_SIZE) -> List[float]:
+    """
+    Shannon entropy in bits per character of each ASCII token.
+
+    With numpy the byte histograms of ``batch_size`` tokens are built and
+    reduced as one matrix; without it each token is counted in Python.
+    """
+    if numpy is None:
+        return [_entropy(token) for token in tokens]
+    scores: List[float] = []
+    for start in range(0, len(tokens), batch_size):
+        end = start + batch_size
+        scores.extend(_entropy_batch(tokens[start:end]))
+    return scores
+
+
+def extract_candidates(texts: Iterable[Optional[str]]) -> List[Candidate]:
+    """Candidate tokens of every text, tagged with the text's position."""
+    candidates = []
+    finditer = TOKEN_PATTERN.finditer
+    for source, text in enumerate(texts):
+        if not text:
+            continue
+        for match in finditer(text):
+            token = match.group()
+            kind = charset(token)
+            if kind is None:
+                continue
+            start = match.start()
+            if kind == "hex" and _is_digest(text, start):
+                continue
+            candidates.append(Candidate(source, start, match.end(), token, kind))
+    return candidates
+
+
+class EntropyDetector:
+    """
+    Finds high-entropy tokens in batches of text.
+
+    Args:
+        thresholds: Bits per character per charset (``hex``, ``base64``);
+            charsets left out keep their default.
+        allowlist: sha256 hex digests (see ``token_hash``) of tokens that
+            are known false positives, e.g. a published test fixture key.
+        batch_size: Tokens scored per histogram matrix.
+    """
+
+    def __init__(
+        self,
+        thresholds: Optional[Dict[str, float]] = None,
+        allowlist: Iterable[str] = (),
+        batch_size: int = BATCH_SIZE,
+    ):
+        unknown = set(thresholds or {}) - set(DEFAULT_THRESHOLDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown entropy charsets: {', '.join(sorted(unknown))} "
+                f"(expected {', '.join(DEFAULT_THRESHOLDS)})"
+            )
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.allowlist = frozenset(digest.lower() for digest in allowlist)
+        self.batch_size = batch_size
+
+    def detect(self, texts: Sequence[Optional[str]]) -> List[Hit]:
+        """High-entropy tokens of all ``texts``, ordered by text and position."""
+        candidates = extract_candidates(texts)
+        scores = shannon_entropy(
+            [candidate.token for candidate in candidates], self.batch_size
+        )
+        hits = []
+        thresholds = self.thresholds
+        for candidate, score in zip(candidates, scores):
+            if score <= thresholds[candidate.charset]:
+                continue
+            digest = token_hash(candidate.token)
+            if digest in self.allowlist:
+                continue
+            hits.append(
+                Hit(
+                    candidate.source,
+                    candidate.start,
+                    candidate.end,
+                    candidate.charset,
+                    round(score, 3),
+                    digest,
+                )
+            )
+        return hits
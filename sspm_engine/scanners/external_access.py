@@ -1,6 +1,7 @@
 from typing import Any, Dict, List
 
 from ..models import Finding, ResourceType, Severity
+from ..records import as_dict
 from .base import BaseScanner
 
 
@@ -24,7 +25,7 @@ class ExternalAccessScanner(BaseScanner):
                         details=f"External guest {user.get('name')} found in Slack.",
                         severity=Severity.MEDIUM,
                         category="external_access",
-                        data=user,
+                        data=as_dict(user),
                     )
                 )
 
@@ -40,7 +41,7 @@ class ExternalAccessScanner(BaseScanner):
                         details=f"Public repository found: {repo.get('name')}",
                         severity=Severity.HIGH,
                         category="external_access",
-                        data=repo,
+                        data=as_dict(repo),
                     )
                 )
 
@@ -57,7 +58,7 @@ class ExternalAccessScanner(BaseScanner):
                             details=f"File '{file.get('name')}' is publicly shared.",
                             severity=Severity.HIGH,
                             category="misconfig",
-                            data=file,
+                            data=as_dict(file),
                         )
                     )
 
@@ -1,6 +1,7 @@
 from typing import Any, Dict, List
 
 from ..models import Finding, ResourceType, Severity
+from ..records import as_dict
 from .base import BaseScanner
 
 
@@ -24,7 +25,7 @@ class MisconfigurationScanner(BaseScanner):
                         ),
                         severity=Severity.MEDIUM,
                         category="misconfig",
-                        data=repo,
+                        data=as_dict(repo),
                     )
                 )
 
@@ -41,7 +42,7 @@ class MisconfigurationScanner(BaseScanner):
                         details=(f"Super Admin {user_email} is not enrolled in 2SV."),
                         severity=Severity.HIGH,
                         category="misconfig",
-                        data=user,
+                        data=as_dict(user),
                     )
                 )
 
@@ -1,6 +1,7 @@
 from typing import Any, Dict, List
 
 from ..models import Finding, ResourceType, Severity
+from ..records import as_dict
 from .base import BaseScanner
 
 
@@ -23,7 +24,7 @@ class PermissionsScanner(BaseScanner):
                         ),
                         severity=Severity.HIGH,
                         category="misconfig",
-                        data=user,
+                        data=as_dict(user),
                     )
                 )
 
@@ -42,7 +43,7 @@ class PermissionsScanner(BaseScanner):
                         ),
                         severity=Severity.HIGH,
                         category="misconfig",
-                        data=member,
+                        data=as_dict(member),
                     )
                 )
 
@@ -0,0 +1,86 @@
+"""
+Serialization helpers shared by the API, exporters and snapshot readers.
+
+orjson is used when it is installed (``pip install sspm-engine[fast]``) and
+the standard library is used otherwise; both produce compact UTF-8 bytes.
+Files ending in ``.gz`` or ``.zst`` are transparently (de)compressed.
+"""
+
+import gzip
+import io
+import json
+from typing import IO, Any, Callable, Optional
+
+BUFFER_SIZE = 1024 * 1024
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "dict"):
+        return value.dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any, default: Callable[[Any], Any] = _default) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=default)
+    return json.dumps(value, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compression_for(path: str) -> Optional[str]:
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package "
+            "(pip install sspm-engine[export])."
+        ) from None
+    return zstandard
+
+
+def open_output(path: str, compression: Optional[str] = None) -> IO[bytes]:
+    """Opens ``path`` for binary writing, compressed with gzip or zstd."""
+    if compression is None:
+        compression = compression_for(path)
+
+    if compression is None:
+        return open(path, "wb", buffering=BUFFER_SIZE)
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)  # type: ignore[return-value]
+    if compression == "zstd":
+        raw = open(path, "wb")
+        compressor = _zstandard().ZstdCompressor()
+        return compressor.stream_writer(raw, closefd=True)  # type: ignore
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def open_input(path: str) -> IO[bytes]:
+    """Opens ``path`` for binary reading, decompressing by file suffix."""
+    compression = compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if compression == "zstd":
+        raw = open(path, "rb")
+        reader = _zstandard().ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.BufferedReader(reader, buffer_size=BUFFER_SIZE)  # type: ignore
+    return open(path, "rb", buffering=BUFFER_SIZE)
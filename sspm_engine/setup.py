@@ -15,7 +15,7 @@ setup(
         "requests>=2.26.0",
         "pydantic>=1.8.2",
         "slack-sdk>=3.11.0",
-        "PyGithub>=1.55",
+        "PyGithub>=2.1.0",
         "google-api-python-client>=2.0.0",
         "google-auth-httplib2>=0.1.0",
         "google-auth-oauthlib>=0.4.0",
@@ -0,0 +1,274 @@
+"""
+Seeded synthetic tenants for benchmarks and load tests.
+
+Resources are shaped like the provider API responses the integrations read
+(Slack ``users.list`` members with profiles, channels with their members,
+GitHub repositories with collaborators, Directory users, Drive files with
+permission fan-out), with a small share of misconfigured resources so every
+scanner has work to do. The same seed and size always produce the same
+tenant.
+
+``write_tenant`` stores a tenant as mock files that ``SSPMEngine`` (or a
+``TenantRegistry`` entry) can scan directly.
+"""
+
+import json
+import os
+import random
+from typing import Any, Dict, Iterator, Tuple
+
+from .models import Tenant
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Share of a tenant's resources per inventory kind.
+MIX = {
+    "slack_users": 0.25,
+    "slack_channels": 0.05,
+    "github_repos": 0.08,
+    "github_members": 0.02,
+    "google_users": 0.2,
+    "google_files": 0.4,
+}
+
+MOCK_FILES = {
+    "slack": "mock_slack.json",
+    "github": "mock_github.json",
+    "google": "mock_gw.json",
+}
+
+DOMAINS = ["company.com", "corp.company.com", "partner.io", "vendor.net"]
+INTERNAL_DOMAIN = "company.com"
+
+
+def kind_counts(resources: int) -> Dict[str, int]:
+    return {kind: max(1, int(resources * share)) for kind, share in MIX.items()}
+
+
+def _email(rng: random.Random, people: int) -> str:
+    return f"user{rng.randrange(people)}@{rng.choice(DOMAINS)}"
+
+
+def _slack_users(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {
+            "id": f"U{i:08d}",
+            "team_id": "T0001",
+            "name": f"user{i}",
+            "deleted": False,
+            "real_name": f"User {i}",
+            "tz": "America/Los_Angeles",
+            "tz_label": "Pacific Daylight Time",
+            "tz_offset": -25200,
+            "profile": {
+                "title": rng.choice(["Engineer", "Manager", "Analyst", ""]),
+                "real_name": f"User {i}",
+                "display_name": f"user{i}",
+                "email": f"user{i}@{rng.choice(DOMAINS)}",
+                "image_72": f"https://avatars.slack-edge.com/{i}_72.png",
+                "status_text": "",
+                "status_emoji": "",
+                "team": "T0001",
+            },
+            "is_admin": rng.random() < 0.02,
+            "is_owner": False,
+            "is_primary_owner": False,
+            "is_restricted": rng.random() < 0.05,
+            "is_ultra_restricted": False,
+            "is_bot": False,
+            "is_app_user": False,
+            "has_2fa": rng.random() < 0.8,
+            "updated": 1700000000 + i,
+        }
+
+
+def _slack_channels(
+    rng: random.Random, count: int, people: int
+) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        members = sorted(
+            {f"U{rng.randrange(people):08d}" for _ in range(rng.randint(2, 24))}
+        )
+        yield {
+            "id": f"C{i:08d}",
+            "name": f"channel-{i}",
+            "is_channel": True,
+            "is_private": rng.random() < 0.3,
+            "is_archived": False,
+            "is_shared": rng.random() < 0.05,
+            "is_ext_shared": False,
+            "created": 1600000000 + i,
+            "creator": f"U{rng.randrange(people):08d}",
+            "topic": {"value": "", "creator": "", "last_set": 0},
+            "purpose": {"value": f"Channel {i}", "creator": "", "last_set": 0},
+            "num_members": len(members),
+            "members": members,
+        }
+
+
+def _github_repos(
+    rng: random.Random, count: int, people: int
+) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        private = rng.random() < 0.9
+        yield {
+            "id": 100000 + i,
+            "name": f"repo-{i}",
+            "full_name": f"company/repo-{i}",
+            "private": private,
+            "html_url": f"https://github.com/company/repo-{i}",
+            "description": f"Repository {i}",
+            "fork": False,
+            "default_branch": "main",
+            "visibility": "private" if private else "public",
+            "language": rng.choice(["Python", "Go", "TypeScript", "Java"]),
+            "branch_protection": rng.random() < 0.6,
+            "collaborators": [
+                f"user{rng.randrange(people)}" for _ in range(rng.randint(1, 8))
+            ],
+        }
+
+
+def _github_members(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {
+            "login": f"user{i}",
+            "id": 5000000 + i,
+            "type": "User",
+            "site_admin": False,
+            "role": "admin" if rng.random() < 0.05 else "member",
+            "mfa_enabled": rng.random() < 0.9,
+            "avatar_url": f"https://avatars.githubusercontent.com/u/{5000000 + i}",
+        }
+
+
+def _google_users(rng: random.Random, count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {
+            "id": f"1{i:020d}",
+            "primaryEmail": f"user{i}@{INTERNAL_DOMAIN}",
+            "name": {"givenName": "User", "familyName": str(i)},
+            "isAdmin": rng.random() < 0.01,
+            "isEnrolledIn2Sv": rng.random() < 0.85,
+            "suspended": False,
+            "orgUnitPath": rng.choice(["/", "/Engineering", "/Sales", "/Ops"]),
+            "creationTime": "2023-01-01T00:00:00.000Z",
+            "customerId": "C01abcdef",
+        }
+
+
+def _permission(rng: random.Random, people: int) -> Dict[str, Any]:
+    roll = rng.random()
+    kind = "anyone" if roll < 0.01 else "domain" if roll < 0.1 else "user"
+    permission = {
+        "kind": "drive#permission",
+        "id": str(rng.randrange(10**12)),
+        "type": kind,
+        "role": rng.choice(["reader", "writer", "commenter"]),
+    }
+    if kind == "user":
+        permission["emailAddress"] = _email(rng, people)
+    elif kind == "domain":
+        permission["domain"] = rng.choice(DOMAINS)
+    return permission
+
+
+def _drive_files(
+    rng: random.Random, count: int, people: int, fanout: int
+) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        # Most files are shared with a few principals; a long tail is shared
+        # with many, averaging roughly ``fanout`` permissions per file.
+        shares = min(int(rng.expovariate(1 / fanout)) + 1, 50 * fanout)
+        yield {
+            "id": f"1{i:032d}",
+            "name": f"Document {i}",
+            "mimeType": "application/vnd.google-apps.document",
+            "owners": [{"emailAddress": _email(rng, people), "kind": "drive#user"}],
+            "createdTime": "2023-01-01T00:00:00.000Z",
+            "modifiedTime": "2024-01-01T00:00:00.000Z",
+            "sharedWithMe": False,
+            "permissions": [_permission(rng, people) for _ in range(shares)],
+        }
+
+
+def generate_tenant(
+    resources: int, seed: int = 7, fanout: int = 3
+) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+    """
+    Yields ``(kind, resources)`` for each inventory kind, e.g.
+    ``("github_repos", <iterator of repository dicts>)``.
+
+    Resources are produced lazily; consume each kind before the next.
+    """
+    counts = kind_counts(resources)
+    people = counts["slack_users"]
+    # One generator per kind so a kind's content does not depend on how much
+    # of the previous kinds was consumed.
+    rngs = {kind: random.Random(f"{seed}:{kind}") for kind in MIX}
+
+    yield "slack_users", _slack_users(rngs["slack_users"], counts["slack_users"])
+    yield "slack_channels", _slack_channels(
+        rngs["slack_channels"], counts["slack_channels"], people
+    )
+    yield "github_repos", _github_repos(
+        rngs["github_repos"], counts["github_repos"], people
+    )
+    yield "github_members", _github_members(
+        rngs["github_members"], counts["github_members"]
+    )
+    yield "google_users", _google_users(rngs["google_users"], counts["google_users"])
+    yield "google_files", _drive_files(
+        rngs["google_files"], counts["google_files"], people, fanout
+    )
+
+
+def write_tenant(
+    directory: str,
+    resources: int,
+    seed: int = 7,
+    fanout: int = 3,
+    tenant_id: str = "synthetic",
+) -> Tenant:
+    """
+    Writes a synthetic tenant as one mock file per provider.
+
+    Files are streamed resource by resource, so writing a million-resource
+    tenant does not hold it in memory.
+
+    Returns:
+        Tenant: A tenant whose integrations read the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    files: Dict[str, Any] = {}
+    try:
+        for kind, items in generate_tenant(resources, seed, fanout):
+            provider, _, key = kind.partition("_")
+            f = files.get(provider)
+            if f is None:
+                path = os.path.join(directory, MOCK_FILES[provider])
+                f = files[provider] = open(path, "w", encoding="utf-8")
+                f.write("{")
+            else:
+                f.write(",")
+            f.write(f"{json.dumps(key)}:[")
+            for n, item in enumerate(items):
+                if n:
+                    f.write(",")
+                f.write(json.dumps(item, separators=(",", ":")))
+            f.write("]")
+    finally:
+        for f in files.values():
+            f.write("}")
+            f.close()
+
+    def mock(provider: str) -> Dict[str, Any]:
+        return {"mock_file": os.path.join(directory, MOCK_FILES[provider])}
+
+    return Tenant(
+        id=tenant_id,
+        name=f"Synthetic tenant ({resources} resources, seed {seed})",
+        slack=mock("slack"),
+        github=mock("github"),
+        google=mock("google"),
+    )
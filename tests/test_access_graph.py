@@ -0,0 +1,80 @@
+from fastapi.testclient import TestClient
+
+from sspm_engine.analytics.access_graph import AccessGraph
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.records import DriveFile, GitHubMember, GitHubRepo, normalize
+
+
+def test_blast_radius_of_mock_inventory():
+    graph = AccessGraph.from_inventory(SSPMEngine().collect("all"))
+
+    alice = graph.blast_radius("alice")
+    assert alice.accounts == ["slack_user:U12345", "github_user:alice"]
+    assert alice.counts == {"slack_channel": 2, "github_repo": 2, "google_file": 0}
+    assert {(r.resource, r.access) for r in alice.resources} >= {
+        ("slack_channel:C67890", "member"),
+        ("github_repo:internal-backend", "collaborator"),
+    }
+
+    partner = graph.blast_radius("Partner@External.com")
+    assert [(r.name, r.access) for r in partner.resources] == [
+        ("Project Specs", "writer")
+    ]
+    assert graph.blast_radius("nobody").accounts == []
+    public = graph.blast_radius("nobody", include_public=True)
+    assert public.counts["google_file"] == 1
+
+
+def test_group_grants_and_limits():
+    graph = AccessGraph()
+    graph.add(
+        "github_members",
+        normalize(GitHubMember, [{"login": "root", "role": "admin"}]),
+    )
+    graph.add(
+        "github_repos",
+        normalize(GitHubRepo, [{"name": f"repo-{i}"} for i in range(5)]),
+    )
+    graph.add(
+        "google_files",
+        normalize(
+            DriveFile,
+            [
+                {
+                    "id": "f1",
+                    "name": "Plan",
+                    "permissions": [{"type": "domain", "domain": "corp.io"}],
+                }
+            ],
+        ),
+    )
+    root = graph.blast_radius("root", limit=2)
+    assert root.counts["github_repo"] == 5
+    assert len(root.resources) == 2 and root.truncated
+    assert root.resources[0].via == "github_org:admins"
+
+    # Added after the first query: the index is rebuilt.
+    graph.add("google_users", [{"email": "dana@corp.io"}])
+    dana = graph.blast_radius("dana@corp.io")
+    assert [(r.resource, r.via) for r in dana.resources] == [
+        ("google_file:f1", "google_domain:corp.io")
+    ]
+
+
+def test_blast_radius_endpoint():
+    from sspm_engine.api import server
+
+    server.inventory.loaded = False
+    client = TestClient(server.app)
+
+    response = client.get("/blast-radius/bob_guest")
+    assert response.status_code == 200
+    assert response.json()["resources"] == [
+        {
+            "resource": "slack_channel:C12345",
+            "name": "general",
+            "access": "member",
+            "via": "slack_user:U67890",
+        }
+    ]
+    assert client.get("/blast-radius/nobody").status_code == 404
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+
+from benchmarks.fake_saas import FakeSaaS, FakeSaaSServer, tenant
+from sspm_engine.checkpoint import ProviderCheckpoint, ScanCheckpoint
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.integrations.base import BaseIntegration
+from sspm_engine.records import SlackUser
+
+
+def _users(*names):
+    return [SlackUser(id=name, name=name) for name in names]
+
+
+def test_checkpoint_resumes_from_last_flush(tmp_path):
+    checkpoint = ProviderCheckpoint(str(tmp_path), key="k", interval=3600)
+    assert checkpoint.resume("users", SlackUser) == ([], None, False)
+    checkpoint.advance("users", _users("a", "b"), cursor="page-2")
+    checkpoint.flush()
+    # Not flushed before the "crash": dropped and fetched again on resume.
+    checkpoint.advance("users", _users("c"), cursor="page-3")
+
+    resumed = ProviderCheckpoint(str(tmp_path), key="k")
+    resources, cursor, complete = resumed.resume("users", SlackUser)
+
+    assert resumed.resumed
+    assert [r["name"] for r in resources] == ["a", "b"]
+    assert (cursor, complete) == ("page-2", False)
+
+    resumed.advance("users", _users("c"), cursor=None)
+    resumed.finish("users")
+    resources, cursor, complete = ProviderCheckpoint(str(tmp_path), "k").resume(
+        "users", SlackUser
+    )
+    assert [r["name"] for r in resources] == ["a", "b", "c"]
+    assert complete
+
+
+def test_checkpoint_for_other_settings_is_discarded(tmp_path):
+    scan_checkpoint = ScanCheckpoint(str(tmp_path))
+    checkpoint = scan_checkpoint.provider("slack", {"token": "a"})
+    checkpoint.resume("users", SlackUser)
+    checkpoint.advance("users", _users("a"), cursor="next")
+    checkpoint.close()
+
+    assert scan_checkpoint.provider("slack", {"token": "a"}).resumed
+    other = scan_checkpoint.provider("slack", {"token": "b"})
+    assert not other.resumed
+    assert other.resume("users", SlackUser) == ([], None, False)
+
+
+def test_checkpoint_is_private_and_does_not_hash_tokens(tmp_path):
+    directory = tmp_path / "checkpoint"
+    checkpoint = ScanCheckpoint(str(directory)).provider("slack", {"token": "a"})
+    checkpoint.resume("users", SlackUser)
+    checkpoint.advance("users", _users("a"), cursor="next")
+    checkpoint.close()
+
+    modes = {
+        path.relative_to(directory).as_posix(): stat.S_IMODE(path.stat().st_mode)
+        for path in [directory, *directory.rglob("*")]
+    }
+    assert modes == {
+        ".": 0o700,
+        "salt": 0o600,
+        "slack": 0o700,
+        "slack/state.json": 0o600,
+        "slack/users.ndjson": 0o600,
+    }
+    plain = hashlib.sha256(json.dumps({"token": "a"}).encode()).hexdigest()
+    assert checkpoint.key != plain
+    assert ScanCheckpoint(str(directory)).provider("slack", {"token": "a"}).resumed
+
+
+def test_interrupted_scan_resumes(tmp_path):
+    app = FakeSaaS(600, seed=3, rate_limit=0.05, retry_after=0)
+    server = FakeSaaSServer(app).start()
+    try:
+        settings = {"page_size": 20, "max_retries": 0}
+        engine = SSPMEngine(tenant=tenant(server.url, str(tmp_path), **settings))
+        checkpoint = ScanCheckpoint(str(tmp_path / "checkpoint"), interval=0)
+
+        first = engine.run_scan("all", checkpoint=checkpoint)
+        providers = first.metadata["providers"]
+        assert not all(status["complete"] for status in providers.values())
+        assert any("error" in status for status in providers.values())
+        fetched = app.stats()["requests"]
+
+        app.rate_limit = 0.0
+        second = engine.run_scan("all", checkpoint=checkpoint)
+        refetched = {
+            call: count - fetched.get(call, 0)
+            for call, count in app.stats()["requests"].items()
+        }
+        reference = SSPMEngine(tenant=tenant(server.url, str(tmp_path))).run_scan()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert all(status["complete"] for status in second.metadata["providers"].values())
+    assert all(status["resumed"] for status in second.metadata["providers"].values())
+    assert refetched["github:repos.collaborators"] < len(app.repos)
+    assert sorted(f.fingerprint for f in second.findings) == sorted(
+        f.fingerprint for f in reference.findings
+    )
+    assert not os.path.exists(tmp_path / "checkpoint")
+
+
+class SlowIntegration(BaseIntegration):
+    # Fails shard 1 after a delay, during which another fetch starts.
+    def connect(self):
+        return True
+
+    def fetch_data(self):
+        time.sleep(0.05)
+        if self.shard[0] == 1:
+            self.error = "rate limited"
+        return {"repos": [], "members": []}
+
+
+def test_concurrent_fetches_keep_their_own_status():
+    engine = SSPMEngine()
+    engine._integrations["github"] = SlowIntegration()
+    statuses = [{}, {}]
+
+    def fetch(index):
+        engine.fetch_provider("github", status=statuses[index], shard=(index, 2))
+
+    threads = [threading.Thread(target=fetch, args=(i,)) for i in (1, 0)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert statuses[0]["github"]["complete"]
+    assert statuses[1]["github"] == {
+        "complete": False,
+        "resources": 0,
+        "resumed": False,
+        "error": "rate limited",
+    }
@@ -0,0 +1,125 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from typer.testing import CliRunner
+
+from sspm_engine.cli.sspmctl import app
+from sspm_engine.daemon import DaemonClient, DaemonUnavailable, ScanDaemon
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.models import Tenant
+
+EXAMPLES = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "sspm_engine", "examples"
+)
+
+
+@pytest.fixture
+def workdir():
+    # Unix socket paths are limited to ~100 characters, so avoid tmp_path.
+    path = tempfile.mkdtemp(prefix="sspmd")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class CountingEngine(SSPMEngine):
+    scanned = 0
+
+    def scan_data(self, data):
+        self.scanned += sum(len(resources) for resources in data.values())
+        return super().scan_data(data)
+
+
+def _engine(workdir, engine_class=SSPMEngine):
+    mock_file = os.path.join(workdir, "mock_github.json")
+    shutil.copy(os.path.join(EXAMPLES, "mock_github.json"), mock_file)
+    tenant = Tenant(
+        id="t",
+        github={"mock_file": mock_file},
+        slack={"mock_file": os.path.join(EXAMPLES, "mock_slack.json")},
+    )
+    return engine_class(tenant=tenant), mock_file
+
+
+def test_refresh_skips_unchanged_providers(workdir):
+    engine, mock_file = _engine(workdir, CountingEngine)
+    daemon = ScanDaemon(engine, socket_path=os.path.join(workdir, "d.sock"))
+
+    first = daemon.refresh()
+    baseline = daemon.result()
+    scanned = engine.scanned
+
+    assert set(first) == {"slack", "github"}
+    assert daemon.refresh() == {}
+    assert daemon.result() is baseline
+    assert engine.scanned == scanned
+
+    with open(mock_file) as f:
+        data = json.load(f)
+    data["repos"][0]["private"] = not data["repos"][0]["private"]
+    with open(mock_file, "w") as f:
+        json.dump(data, f)
+    os.utime(mock_file, ns=(0, 1))
+
+    assert daemon.refresh() == {"github": 1}
+    assert engine.scanned == scanned + 1
+    assert daemon.result() is not baseline
+
+
+def test_client_reads_resident_result(workdir):
+    engine, _ = _engine(workdir)
+    socket_path = os.path.join(workdir, "d.sock")
+    daemon = ScanDaemon(engine, socket_path=socket_path)
+    daemon.refresh()
+    daemon.serve()
+    try:
+        client = DaemonClient(socket_path)
+        result = client.result()
+        assert result.score == daemon.result().score
+        assert len(result.findings) == len(daemon.result().findings)
+        assert client.risk()["refreshes"] == 1
+
+        with pytest.raises(RuntimeError):
+            ScanDaemon(engine, socket_path=socket_path).serve()
+    finally:
+        daemon.close()
+
+    assert not os.path.exists(socket_path)
+    with pytest.raises(DaemonUnavailable):
+        DaemonClient(socket_path).result()
+
+
+def test_risk_score_uses_running_daemon(workdir, monkeypatch):
+    socket_path = os.path.join(workdir, "d.sock")
+    monkeypatch.setenv("SSPM_DAEMON_SOCKET", socket_path)
+    daemon = ScanDaemon(SSPMEngine(), socket_path=socket_path)
+    daemon.refresh()
+    daemon.result().score = 12.5
+    daemon.serve()
+    try:
+        output = CliRunner().invoke(app, ["risk-score"]).output
+        fresh = CliRunner().invoke(app, ["risk-score", "--no-daemon"]).output
+    finally:
+        daemon.close()
+
+    assert "12.5" in output
+    assert "12.5" not in fresh
+
+
+def test_incomplete_fetch_keeps_inventory(workdir):
+    engine, mock_file = _engine(workdir)
+    daemon = ScanDaemon(engine, socket_path=os.path.join(workdir, "d.sock"))
+    daemon.refresh()
+    repos = daemon.inventory.snapshot()["github_repos"]
+
+    with open(mock_file, "w") as f:
+        f.write("{truncated")
+    os.utime(mock_file, ns=(1, 1))
+
+    assert "github" not in daemon.refresh()
+    assert daemon.inventory.snapshot()["github_repos"] == repos
+    # The failed provider is fetched again by the next refresh.
+    shutil.copy(os.path.join(EXAMPLES, "mock_github.json"), mock_file)
+    assert "github" in daemon.refresh()
@@ -0,0 +1,84 @@
+from typer.testing import CliRunner
+
+from sspm_engine.analytics.diff import DiffStatus, iter_diff, iter_snapshot
+from sspm_engine.cli.sspmctl import app
+from sspm_engine.models import Finding, ResourceType, ScanResult, Severity
+from sspm_engine.reporting.exporters import NDJSONExporter, export
+
+
+def _finding(i, **data):
+    return Finding(
+        rule_id=f"RULE_{i % 5}",
+        resource_id=f"github_repo:repo-{i}",
+        resource_type=ResourceType.REPO,
+        details=f"finding {i}",
+        severity=Severity.HIGH,
+        data=data or None,
+    )
+
+
+def test_fingerprint_ignores_provider_noise():
+    a = _finding(1, name="repo-1", updated_at="2024-01-01")
+    b = _finding(1, name="repo-1", updated_at="2024-06-01", stars=3)
+
+    assert a.fingerprint == b.fingerprint
+    assert len(a.fingerprint) == 32
+    assert _finding(1, pattern="AWS").fingerprint != _finding(1).fingerprint
+    assert _finding(1).fingerprint != _finding(2).fingerprint
+
+
+def test_iter_diff_classifies_findings():
+    old = [_finding(i) for i in range(0, 1000)]
+    new = [_finding(i) for i in range(500, 1500)] + [_finding(600)]
+
+    counts = {status: 0 for status in DiffStatus}
+    for entry in iter_diff(old, new):
+        counts[entry.status] += 1
+
+    assert counts[DiffStatus.NEW] == 500
+    assert counts[DiffStatus.RESOLVED] == 500
+    assert counts[DiffStatus.UNCHANGED] == 500
+
+
+def test_diff_streams_snapshots_and_cli(tmp_path):
+    def snapshot(path, indexes):
+        result = ScanResult(
+            score=0.0, findings=[_finding(i) for i in indexes], counts={}
+        )
+        export(result, [NDJSONExporter(str(path))])
+
+    old_path, new_path = tmp_path / "old.ndjson.gz", tmp_path / "new.ndjson"
+    snapshot(old_path, range(0, 10))
+    snapshot(new_path, range(5, 12))
+
+    records = list(iter_snapshot(str(old_path)))
+    assert len(records) == 10
+    assert records[0]["fingerprint"] == _finding(0).fingerprint
+
+    result = CliRunner().invoke(app, ["diff", str(old_path), str(new_path)])
+    assert result.exit_code == 0, result.output
+    assert "New: 2  Resolved: 5  Unchanged: 5" in result.output
+
+    result = CliRunner().invoke(
+        app, ["diff", str(old_path), str(new_path), "--format", "md"]
+    )
+    assert result.exit_code == 2
+    assert "Unknown format: md" in result.output
+
+    report = tmp_path / "diff.md"
+    result = CliRunner().invoke(
+        app,
+        [
+            "diff",
+            str(old_path),
+            str(new_path),
+            "--format",
+            "markdown",
+            "--output",
+            str(report),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    content = report.read_text()
+    assert content.index("## New Findings") < content.index("## Resolved Findings")
+    assert "| Unchanged | 5 |" in content
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+
+from sspm_engine.orchestration.coordinator import Coordinator
+from sspm_engine.orchestration.queue import (
+    SQLiteWorkQueue,
+    UnitResult,
+    WorkUnit,
+    open_queue,
+)
+from sspm_engine.orchestration.registry import TenantRegistry
+from sspm_engine.orchestration.scheduler import TenantScheduler
+from sspm_engine.orchestration.worker import Worker, serve
+
+REGISTRY = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "sspm_engine",
+    "examples",
+    "tenants.yaml",
+)
+
+
+def _unit(unit_id, job_id="job"):
+    return WorkUnit(id=unit_id, job_id=job_id, tenant_id="acme", provider="slack")
+
+
+def test_sqlite_queue_retries_expired_leases(tmp_path):
+    queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    queue.publish([_unit("a"), _unit("b")])
+
+    first = queue.claim("w1", lease_seconds=60)
+    assert first.id == "a" and first.attempts == 1
+    # "b" is leased with an already expired lease, as if its worker died.
+    assert queue.claim("w2", lease_seconds=-1).id == "b"
+    retried = queue.claim("w3", lease_seconds=-1)
+    assert retried.id == "b" and retried.attempts == 2
+    # Out of attempts: completed with an error instead of handed out again.
+    assert queue.claim("w4", lease_seconds=60) is None
+    assert queue.remaining("job") == 1
+
+    queue.complete(
+        UnitResult(unit_id="a", job_id="job", tenant_id="acme", label="slack")
+    )
+    assert queue.remaining("job") == 0
+    results = {r.unit_id: r for r in queue.results("job")}
+    assert results["a"].error is None
+    assert "lease expired" in results["b"].error
+
+    queue.purge("job")
+    assert queue.results("job") == []
+    queue.close()
+
+
+def test_coordinator_matches_single_process_scan(tmp_path):
+    registry = TenantRegistry.from_file(REGISTRY)
+    queue = open_queue(f"sqlite:///{tmp_path / 'queue.db'}")
+    coordinator = Coordinator(registry, queue, shards=3, poll_interval=0.05)
+    job_id = coordinator.submit()
+    # slack + google + 3 GitHub shards for acme, 3 GitHub shards for globex
+    assert queue.remaining(job_id) == 8
+
+    Worker(registry, queue, worker_id="local").run(idle_timeout=0)
+    results = coordinator.wait(job_id, timeout=10)
+
+    expected = TenantScheduler(registry).run()
+    assert set(results) == set(expected)
+    for tenant_id, result in results.items():
+        assert result.metadata["errors"] == {}
+        assert result.metadata["providers"] == expected[tenant_id].metadata["providers"]
+        assert result.score == expected[tenant_id].score
+        assert sorted(f.fingerprint for f in result.findings) == sorted(
+            f.fingerprint for f in expected[tenant_id].findings
+        )
+    assert queue.remaining(job_id) == 0 and queue.results(job_id) == []
+
+
+def test_worker_processes_share_the_queue(tmp_path):
+    url = str(tmp_path / "queue.db")
+    registry = TenantRegistry.from_file(REGISTRY)
+    coordinator = Coordinator(registry, open_queue(url), shards=4, poll_interval=0.1)
+    job_id = coordinator.submit()
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=serve, args=(REGISTRY, url), kwargs={"idle_timeout": 2})
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        results = coordinator.wait(job_id, timeout=60)
+    finally:
+        for process in processes:
+            process.join(timeout=30)
+    assert all(p.exitcode == 0 for p in processes)
+
+    expected = TenantScheduler(registry).run()
+    for tenant_id, result in results.items():
+        assert result.metadata["errors"] == {}
+        assert result.metadata["workers"]
+        assert sorted(f.fingerprint for f in result.findings) == sorted(
+            f.fingerprint for f in expected[tenant_id].findings
+        )
+
+
+def test_polling_worker_stops_cleanly_on_sigterm(tmp_path):
+    url = str(tmp_path / "queue.db")
+    coordinator = Coordinator(
+        TenantRegistry.from_file(REGISTRY), open_queue(url), poll_interval=0.1
+    )
+    job_id = coordinator.submit(provider="slack")
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(REGISTRY, url)
+    )
+    process.start()
+    try:
+        results = coordinator.wait(job_id, timeout=60)
+    finally:
+        process.terminate()
+        process.join(timeout=30)
+
+    assert process.exitcode == 0
+    assert all(result.metadata["errors"] == {} for result in results.values())
@@ -0,0 +1,89 @@
+import gzip
+import json
+
+import pytest
+
+from sspm_engine.models import Finding, ResourceType, ScanResult, Severity
+from sspm_engine.reporting.exporters import (
+    NDJSONExporter,
+    ParquetExporter,
+    SARIFExporter,
+    create_exporter,
+    export,
+)
+
+
+class CountingFindings(list):
+    iterations = 0
+
+    def __iter__(self):
+        CountingFindings.iterations += 1
+        return super().__iter__()
+
+
+def _result(n):
+    findings = CountingFindings(
+        Finding(
+            rule_id=f"RULE_{i % 3}",
+            resource_id=f"github_repo:repo-{i}",
+            resource_type=ResourceType.REPO,
+            details=f"finding {i}",
+            severity=[Severity.CRITICAL, Severity.MEDIUM, Severity.LOW][i % 3],
+            data={"index": i},
+        )
+        for i in range(n)
+    )
+    return ScanResult(score=42.0, findings=[], counts={"CRITICAL": 1}).copy(
+        update={"findings": findings}
+    )
+
+
+def test_single_pass_ndjson_and_sarif(tmp_path):
+    result = _result(1000)
+    ndjson_path = tmp_path / "findings.ndjson.gz"
+    sarif_path = tmp_path / "findings.sarif"
+    CountingFindings.iterations = 0
+
+    export(
+        result,
+        [
+            NDJSONExporter(str(ndjson_path)),
+            SARIFExporter(str(sarif_path), rules={"RULE_0": {"name": "Rule zero"}}),
+        ],
+    )
+
+    assert CountingFindings.iterations == 1
+    with gzip.open(ndjson_path, "rt") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 1000
+    assert lines[0]["resource_id"] == "github_repo:repo-0"
+
+    sarif = json.loads(sarif_path.read_text())
+    run = sarif["runs"][0]
+    assert sarif["version"] == "2.1.0"
+    assert len(run["results"]) == 1000
+    assert run["results"][0]["level"] == "error"
+    assert [r["id"] for r in run["tool"]["driver"]["rules"]] == [
+        "RULE_0",
+        "RULE_1",
+        "RULE_2",
+    ]
+    assert run["properties"]["riskScore"] == 42.0
+
+
+def test_parquet_export_in_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "findings.parquet"
+
+    export(_result(250), [ParquetExporter(str(path), batch_size=100)])
+
+    parquet = pq.ParquetFile(str(path))
+    assert parquet.metadata.num_rows == 250
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert json.loads(table.column("data")[10].as_py()) == {"index": 10}
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        create_exporter("xml", "out.xml")
@@ -0,0 +1,68 @@
+import pytest
+
+from benchmarks.fake_saas import FakeSaaS, FakeSaaSServer, tenant
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.synthetic import write_tenant
+
+
+@pytest.fixture
+def fake_saas():
+    servers = []
+
+    def start(**options):
+        app = FakeSaaS(600, seed=3, **options)
+        servers.append(FakeSaaSServer(app).start())
+        return app, servers[-1].url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_live_scan_matches_mock_scan(fake_saas, tmp_path):
+    app, url = fake_saas()
+
+    live = SSPMEngine(tenant=tenant(url, str(tmp_path))).run_scan("all")
+    mock = SSPMEngine(tenant=write_tenant(str(tmp_path), 600, seed=3)).run_scan("all")
+
+    assert live.findings
+    assert sorted(f.fingerprint for f in live.findings) == sorted(
+        f.fingerprint for f in mock.findings
+    )
+    calls = live.metadata["instrumentation"]["api_calls"]
+    assert calls["github"]["repos.collaborators"]["count"] == len(app.repos)
+    assert calls["google"]["drive.files.list"]["count"] >= 1
+
+
+def test_integrations_follow_capped_pages(fake_saas, tmp_path):
+    app, url = fake_saas(max_page_size=7)
+    engine = SSPMEngine(tenant=tenant(url, str(tmp_path)))
+
+    data = engine.collect("slack")
+
+    users = len(app.data["slack_users"])
+    assert len(data["slack_users"]) == users
+    assert app.stats()["requests"]["slack:users.list"] == -(-users // 7)
+
+
+def test_rate_limited_requests_are_retried(fake_saas, tmp_path):
+    app, url = fake_saas(rate_limit=0.2, retry_after=0)
+    engine = SSPMEngine(tenant=tenant(url, str(tmp_path), page_size=50))
+
+    data = engine.collect("github")
+
+    assert app.stats()["rate_limited"] > 0
+    assert len(data["github_repos"]) == len(app.data["github_repos"])
+    assert [r["collaborators"] for r in data["github_repos"]] == [
+        tuple(r["collaborators"]) for r in app.data["github_repos"]
+    ]
+
+
+def test_requests_without_credentials_are_rejected():
+    app = FakeSaaS(100)
+
+    status, body, _ = app.handle("GET", "/github/orgs/company", {}, False)
+
+    assert status == 401
+    assert app.handle("GET", "/nope", {}, True)[0] == 404
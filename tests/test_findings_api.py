@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sspm_engine.api.findings import (
+    FindingFilter,
+    FindingIndex,
+    InvalidCursor,
+    decode_cursor,
+)
+from sspm_engine.models import Finding, ResourceType, Severity
+
+
+def _findings(n):
+    severities = [Severity.HIGH, Severity.MEDIUM, Severity.LOW]
+    providers = ["slack_user", "github_repo", "google_file"]
+    return [
+        Finding(
+            rule_id=f"RULE_{i % 4}",
+            resource_id=f"{providers[i % 3]}:r{i // 2}",
+            resource_type=ResourceType.UNKNOWN,
+            details="",
+            severity=severities[i % 3],
+        )
+        for i in range(n)
+    ]
+
+
+def test_keyset_pages_cover_every_match_once():
+    index = FindingIndex(_findings(250) + _findings(10))
+    finding_filter = FindingFilter(severity=["high", "medium"])
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = index.page(cursor, finding_filter, limit=17)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    expected = [f for f in index.findings if f.severity != Severity.LOW]
+    assert [id(f) for f in seen] == [id(f) for f in expected]
+
+
+def test_filter_by_provider_and_rule():
+    index = FindingIndex(_findings(60))
+    page, cursor = index.page(
+        None, FindingFilter(provider=["github"], rule_id=["RULE_1"]), limit=100
+    )
+
+    assert cursor is None
+    assert page
+    assert all(f.provider == "github" and f.rule_id == "RULE_1" for f in page)
+
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+def test_findings_endpoint_json_and_ndjson():
+    from sspm_engine.api.server import app
+
+    client = TestClient(app)
+
+    first = client.get("/findings", params={"limit": 2})
+    body = first.json()
+    assert body["count"] == 2
+    rest = client.get("/findings", params={"cursor": body["next_cursor"]}).json()
+    assert rest["next_cursor"] is None
+
+    streamed = client.get(
+        "/findings", params={"format": "ndjson"}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert len(lines) == body["count"] + rest["count"]
+
+    high = client.get("/findings", params={"severity": "HIGH", "provider": "github"})
+    assert {f["rule_id"] for f in high.json()["findings"]} == {"GH_PUBLIC_REPO"}
+
+    assert client.get("/findings", params={"cursor": "bogus"}).status_code == 400
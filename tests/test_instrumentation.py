@@ -0,0 +1,87 @@
+from fastapi.testclient import TestClient
+
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.instrumentation import (
+    MetricsRegistry,
+    ScanTrace,
+    api_call,
+    profiled,
+    span,
+    trace,
+)
+
+
+def test_run_scan_records_spans_and_api_calls(tmp_path):
+    engine = SSPMEngine()
+    result = engine.run_scan("all")
+    engine.generate_report(result, "json", str(tmp_path / "report.json"))
+
+    instrumentation = result.metadata["instrumentation"]
+    names = [s["name"] for s in instrumentation["spans"]]
+    assert names[:3] == ["fetch:slack", "fetch:github", "fetch:google"]
+    assert "scan:SecretScanner" in names
+    assert names[-2:] == ["scan", "report:json"]
+    analyze = next(s for s in instrumentation["spans"] if s["name"] == "analyze")
+    assert analyze["findings"] == len(result.findings)
+    assert instrumentation["api_calls"]["github"]["mock_file"]["count"] == 1
+
+
+def test_trace_aggregates_calls_and_errors():
+    with trace() as scan_trace:
+        for _ in range(3):
+            with api_call("slack", "users.list"):
+                pass
+        try:
+            with api_call("slack", "users.list"):
+                raise RuntimeError("rate limited")
+        except RuntimeError:
+            pass
+        with span("fetch:slack") as attributes:
+            attributes["resources"] = 2
+
+    metadata: dict = {}
+    scan_trace.merge_into(metadata)
+    stats = metadata["instrumentation"]["api_calls"]["slack"]["users.list"]
+    assert (stats["count"], stats["errors"]) == (4, 1)
+    assert metadata["instrumentation"]["spans"][0]["resources"] == 2
+    assert ScanTrace().spans == []
+
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter.", ("kind",))
+    histogram = registry.histogram("demo_seconds", "Demo histogram.", ("kind",))
+    counter.inc(kind='a"b')
+    histogram.observe(0.002, kind="x")
+    histogram.observe(7, kind="x")
+
+    text = registry.render()
+    assert 'demo_total{kind="a\\"b"} 1.0' in text
+    assert 'demo_seconds_bucket{kind="x",le="0.005"} 1.0' in text
+    assert 'demo_seconds_bucket{kind="x",le="+Inf"} 2.0' in text
+    assert 'demo_seconds_count{kind="x"} 2.0' in text
+    assert histogram.count(kind="x") == 2
+
+
+def test_metrics_and_profile_endpoints(monkeypatch):
+    from sspm_engine.api import server
+
+    client = TestClient(server.app)
+    client.get("/scan/github", params={"refresh": True})
+
+    body = client.get("/metrics").text
+    assert 'sspm_scans_total{provider="github",status="ok"}' in body
+    assert 'sspm_span_duration_seconds_bucket{span="fetch:github",le="+Inf"}' in body
+    assert 'sspm_scan_cache_requests_total{result="miss"}' in body
+
+    assert client.get("/scan/github", params={"profile": "cprofile"}).status_code == 403
+    monkeypatch.setitem(server.engine.config, "api", {"profiling": True})
+    response = client.get("/scan/github", params={"profile": "cprofile"})
+    assert response.status_code == 200
+    assert "run_scan" in response.text
+
+
+def test_profiled_reports_cprofile_stats():
+    with profiled("cprofile") as profile:
+        sum(range(1000))
+    assert "function calls" in profile.report
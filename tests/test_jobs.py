@@ -0,0 +1,110 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from sspm_engine.api.jobs import JobManager, JobStatus
+from sspm_engine.models import ScanResult
+
+
+def _wait_for(manager, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.status == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}")
+
+
+def test_job_reports_phases_and_result():
+    release = threading.Event()
+
+    def scan(provider, progress):
+        progress("fetching")
+        progress("scanning")
+        release.wait(5)
+        progress("analyzing")
+        return ScanResult(score=7.0, findings=[], counts={"HIGH": 1})
+
+    manager = JobManager(scan, max_workers=2)
+    job = manager.submit("github")
+
+    running = _wait_for(manager, job.id, JobStatus.RUNNING)
+    while manager.get(job.id).phase != "scanning":
+        time.sleep(0.01)
+    assert 0 < manager.get(job.id).progress < 1
+    assert running.started_at is not None
+
+    release.set()
+    done = _wait_for(manager, job.id, JobStatus.SUCCEEDED)
+    assert done.progress == 1.0
+    assert done.result.score == 7.0
+    manager.shutdown()
+
+
+def test_failed_job_records_error():
+    def scan(provider, progress):
+        raise RuntimeError("token revoked")
+
+    manager = JobManager(scan)
+    job = manager.submit("slack")
+
+    failed = _wait_for(manager, job.id, JobStatus.FAILED)
+    assert failed.error == "token revoked"
+    manager.shutdown()
+
+
+def test_results_expire_but_status_is_kept():
+    now = [0.0]
+    scores = iter(range(10))
+
+    def scan(provider, progress):
+        return ScanResult(score=next(scores), findings=[], counts={})
+
+    manager = JobManager(
+        scan, max_results=2, result_ttl_seconds=60, clock=lambda: now[0]
+    )
+    ids = []
+    for _ in range(3):
+        ids.append(manager.submit("all").id)
+        _wait_for(manager, ids[-1], JobStatus.SUCCEEDED)
+
+    oldest = manager.get(ids[0])
+    assert oldest.result is None and oldest.result_expired
+    assert manager.get(ids[2]).result.score == 2
+
+    now[0] = 61
+    expired = manager.get(ids[2])
+    assert expired.status == JobStatus.SUCCEEDED
+    assert expired.result is None and expired.result_expired
+    manager.shutdown()
+
+
+def test_api_jobs_do_not_block_health_checks(monkeypatch):
+    from sspm_engine.api import server
+
+    release = threading.Event()
+
+    def scan(provider, progress):
+        progress("fetching")
+        release.wait(5)
+        return server.engine.run_scan(provider, progress)
+
+    manager = JobManager(scan, max_workers=1)
+    monkeypatch.setattr(server, "jobs", manager)
+    client = TestClient(server.app)
+
+    submitted = [client.post("/scans", json={"provider": "all"}) for _ in range(3)]
+    assert all(r.status_code == 202 for r in submitted)
+    assert client.get("/").json()["status"] == "ok"
+    assert client.post("/scans", json={"provider": "jira"}).status_code == 400
+    assert client.get("/scans/missing").status_code == 404
+
+    release.set()
+    for response in submitted:
+        job = _wait_for(manager, response.json()["id"], JobStatus.SUCCEEDED)
+        body = client.get(f"/scans/{job.id}").json()
+        assert body["status"] == "succeeded"
+        assert body["result"]["findings"]
+    manager.shutdown()
@@ -0,0 +1,106 @@
+import json
+import logging
+import threading
+from pathlib import Path
+
+import pytest
+
+from sspm_engine import logging_config
+from sspm_engine.logging_config import (
+    RateLimitFilter,
+    log_format,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _record(lineno=10, level=logging.WARNING):
+    return logging.LogRecord(
+        "sspm_engine.test", level, "scan.py", lineno, "x", (), None
+    )
+
+
+def test_json_logs_are_written_off_the_calling_thread(capsys):
+    threads = []
+
+    class Recorder(logging.Filter):
+        def filter(self, record):
+            threads.append(threading.current_thread())
+            return True
+
+    setup_logging(fmt="json")
+    logging_config._listener.handlers[0].addFilter(Recorder())
+    logger = logging.getLogger("sspm_engine.test")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed %s", "repo-1", extra={"tenant_id": "acme"})
+    shutdown_logging()
+
+    document = json.loads(capsys.readouterr().err.strip())
+    assert document["level"] == "ERROR"
+    assert document["message"] == "Failed repo-1"
+    assert document["tenant_id"] == "acme"
+    assert "ValueError: boom" in document["exception"]
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_json_logs_unserializable_extras():
+    formatter = logging_config.JsonFormatter()
+    record = _record()
+    record.path = Path("/tmp")
+    record.attempts = {1: "first"}
+
+    document = json.loads(formatter.format(record))
+
+    assert document["path"] == "/tmp"
+    assert document["attempts"] == {"1": "first"}
+
+
+def test_rate_limit_filter_suppresses_per_call_site(clock):
+    limiter = RateLimitFilter(burst=3, window=60)
+
+    passed = [limiter.filter(_record()) for _ in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+    # Other call sites and errors are not affected.
+    assert limiter.filter(_record(lineno=11))
+    assert limiter.filter(_record(level=logging.ERROR))
+
+    clock[0] += 60
+    record = _record()
+    assert limiter.filter(record)
+    assert record.suppressed == 7
+
+
+def test_text_format_notes_suppressed_records(capsys, clock):
+    setup_logging(fmt="text", burst=2)
+    logger = logging.getLogger("sspm_engine.test")
+    for n in range(5):
+        clock[0] += 20
+        logger.warning(f"Resource {n} is public")
+    shutdown_logging()
+
+    lines = capsys.readouterr().err.splitlines()
+    assert [line.split(": ", 1)[1] for line in lines] == [
+        "Resource 0 is public",
+        "Resource 1 is public",
+        "Resource 3 is public (1 similar suppressed)",
+        "Resource 4 is public",
+    ]
+
+
+def test_log_format_selection(monkeypatch):
+    monkeypatch.delenv("SSPM_LOG_FORMAT", raising=False)
+    assert log_format(interactive=False) == "json"
+    monkeypatch.setenv("SSPM_LOG_FORMAT", "Text")
+    assert log_format(interactive=True) == "text"
+    monkeypatch.setenv("SSPM_LOG_FORMAT", "xml")
+    with pytest.raises(ValueError):
+        log_format()
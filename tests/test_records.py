@@ -0,0 +1,97 @@
+import json
+import pickle
+
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.records import (
+    DriveFile,
+    GitHubRepo,
+    GoogleUser,
+    SlackUser,
+    as_dict,
+    normalize,
+)
+
+RAW_USER = {
+    "id": "U1",
+    "name": "alice",
+    "team_id": "T1",
+    "is_admin": True,
+    "has_2fa": False,
+    "profile": {"email": "alice@company.com", "image_72": "https://x/72.png"},
+    "tz": "Europe/Berlin",
+}
+
+
+def test_records_normalize_provider_fields():
+    user = SlackUser.from_raw(RAW_USER)
+    google_user = GoogleUser.from_raw(
+        {"primaryEmail": "bob@company.com", "isAdmin": True, "orgUnitPath": "/"}
+    )
+    drive_file = DriveFile.from_raw(
+        {
+            "id": "f1",
+            "name": "Plan",
+            "owners": [{"emailAddress": "bob@company.com"}],
+            "permissions": [{"type": "domain", "role": "reader", "domain": "x.io"}],
+        }
+    )
+
+    assert user.get("email") == "alice@company.com"
+    assert user.get("tz") is None
+    assert "tz" not in user.keys()
+    assert google_user["is_super_admin"] is True
+    assert drive_file["owner"] == "bob@company.com"
+    assert drive_file["permissions"][0].get("domain") == "x.io"
+    assert SlackUser.from_raw(user) is user
+
+
+def test_repeated_strings_are_interned():
+    repos = normalize(
+        GitHubRepo,
+        json.loads(
+            json.dumps(
+                [{"name": f"r{i}", "collaborators": ["alice"]} for i in range(3)]
+            )
+        ),
+    )
+
+    assert repos[0]["collaborators"][0] is repos[2]["collaborators"][0]
+
+
+def test_records_behave_like_dicts_for_consumers():
+    user = SlackUser.from_raw(RAW_USER)
+    merged = {**user, "has_2fa": True}
+
+    assert merged["name"] == "alice" and merged["has_2fa"] is True
+    assert SlackUser.from_raw(dict(RAW_USER)) == user
+    assert pickle.loads(pickle.dumps(user)) == user
+    assert json.loads(json.dumps(as_dict({"users": [user]})))["users"][0]["id"] == "U1"
+
+
+def test_scan_findings_carry_plain_data():
+    result = SSPMEngine().run_scan("all")
+
+    drive = next(f for f in result.findings if f.rule_id == "GW_PUBLIC_DOC")
+    assert type(drive.data) is dict
+    assert type(drive.data["permissions"][0]) is dict
+    assert None not in drive.data.values()
+    json.loads(result.json())
+
+    user = SlackUser.from_raw(RAW_USER)
+    assert as_dict(user) == {
+        "id": "U1",
+        "name": "alice",
+        "email": "alice@company.com",
+        "team_id": "T1",
+        "is_admin": True,
+        "has_2fa": False,
+    }
+
+
+def test_compact_inventory_uses_less_memory():
+    from benchmarks.memory_inventory import run
+
+    stats = run(5_000)
+
+    assert stats["resources"] == 5_000
+    assert stats["ratio"] > 2
@@ -0,0 +1,53 @@
+import os
+
+from sspm_engine.models import Finding, ResourceType, ScanResult, Severity
+from sspm_engine.reporting.reporter import Reporter, summarize_by_rule
+
+TEMPLATES = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "sspm_engine", "reporting", "templates"
+)
+
+
+def _result(n):
+    findings = [
+        Finding(
+            rule_id="GH_PUBLIC_REPO" if i % 3 else "SLACK_NO_MFA",
+            resource_id=f"resource:{i}",
+            resource_type=ResourceType.UNKNOWN,
+            details=f"finding {i}",
+            severity=Severity.HIGH if i % 3 else Severity.CRITICAL,
+        )
+        for i in range(n)
+    ]
+    counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "UNKNOWN": 0}
+    for f in findings:
+        counts[f.severity.value] += 1
+    return ScanResult(score=100.0, findings=findings, counts=counts)
+
+
+def test_summarize_by_rule_single_pass():
+    groups = summarize_by_rule(
+        _result(30).findings,
+        rules={"SLACK_NO_MFA": {"name": "Slack Admin without MFA"}},
+        max_resources=3,
+    )
+
+    assert [g["rule_id"] for g in groups] == ["SLACK_NO_MFA", "GH_PUBLIC_REPO"]
+    assert groups[0]["rule_name"] == "Slack Admin without MFA"
+    assert groups[0]["count"] == 10
+    assert groups[1]["count"] == 20
+    assert len(groups[1]["resources"]) == 3
+
+
+def test_markdown_report_truncates_large_sections(tmp_path):
+    output = tmp_path / "report.md"
+    Reporter(TEMPLATES).generate_markdown_report(
+        _result(5000), str(output), max_findings=25, max_resources_per_rule=5
+    )
+    content = output.read_text()
+
+    assert "A total of **5000** risks" in content
+    assert content.count("\n### [") == 25
+    assert "4975 more findings not shown" in content
+    assert "| GH_PUBLIC_REPO | HIGH | general | 3333 |" in content
+    assert "... and 3328 more" in content
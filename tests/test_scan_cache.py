@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sspm_engine.api.cache import ScanCache
+from sspm_engine.models import ScanResult
+
+
+def _result(score=1.0):
+    return ScanResult(score=score, findings=[], counts={})
+
+
+def test_concurrent_requests_share_one_scan():
+    calls = []
+
+    def slow_scan(provider):
+        calls.append(provider)
+        time.sleep(0.05)
+        return _result()
+
+    cache = ScanCache(slow_scan, ttl_seconds=60)
+    entries = []
+    threads = [
+        threading.Thread(target=lambda: entries.append(cache.get("all")))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ["all"]
+    assert len({id(e.result) for e in entries}) == 1
+    assert cache.get("all").hit
+
+
+def test_ttl_expiry_and_refresh():
+    now = [0.0]
+    scores = iter(range(1, 10))
+    cache = ScanCache(
+        lambda provider: _result(next(scores)), ttl_seconds=30, clock=lambda: now[0]
+    )
+
+    assert cache.get("slack").result.score == 1
+    now[0] = 10
+    assert cache.get("slack").result.score == 1
+    assert cache.get("slack", refresh=True).result.score == 2
+    now[0] = 45
+    entry = cache.get("slack")
+    assert entry.result.score == 3
+    assert not entry.hit
+
+
+def test_errors_are_shared_and_not_cached():
+    def failing_scan(provider):
+        raise RuntimeError("rate limited")
+
+    cache = ScanCache(failing_scan)
+
+    with pytest.raises(RuntimeError):
+        cache.get("github")
+    with pytest.raises(RuntimeError):
+        cache.get("github")
+
+
+def test_invalidation_during_scan_is_not_overwritten():
+    scores = iter(range(1, 10))
+    cache = ScanCache(lambda provider: _result(next(scores)))
+
+    def scan(provider):
+        # A webhook invalidates the cache while this scan is running.
+        cache.invalidate("github")
+        return _result(next(scores))
+
+    cache.scan = scan
+    assert cache.get("github").result.score == 1
+    cache.scan = lambda provider: _result(next(scores))
+    entry = cache.get("github")
+    assert entry.result.score == 2
+    assert not entry.hit
+
+    cache.scan = lambda provider: (cache.invalidate(), _result(next(scores)))[1]
+    assert cache.get("github", refresh=True).result.score == 3
+    assert cache.get("github").result.score == 4
+
+
+def test_api_sets_cache_headers():
+    from sspm_engine.api.server import app, cache
+
+    cache.invalidate()
+    client = TestClient(app)
+
+    first = client.get("/risk")
+    second = client.get("/scan/all")
+    refreshed = client.get("/risk", params={"refresh": "true"})
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["Cache-Control"].startswith("private, max-age=")
+    assert refreshed.headers["X-Cache"] == "MISS"
+
+
+def test_incomplete_results_are_not_cached():
+    results = iter(
+        [
+            ScanResult(
+                score=1.0,
+                findings=[],
+                counts={},
+                metadata={"providers": {"github": {"complete": False}}},
+            ),
+            _result(2.0),
+        ]
+    )
+    cache = ScanCache(lambda provider: next(results))
+
+    assert cache.get("github").result.score == 1
+    assert cache.get("github").result.score == 2
+    assert cache.get("github").hit
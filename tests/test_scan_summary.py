@@ -0,0 +1,62 @@
+import json
+
+from typer.testing import CliRunner
+
+from sspm_engine.api.findings import FindingFilter
+from sspm_engine.cli.sspmctl import app
+from sspm_engine.models import Finding, Severity
+from sspm_engine.reporting.summary import ScanSummary
+
+SEVERITIES = [Severity.LOW, Severity.MEDIUM, Severity.HIGH, Severity.CRITICAL]
+
+
+def _findings(count):
+    for i in range(count):
+        yield Finding(
+            rule_id=f"RULE_{i % 5}",
+            resource_id=f"{'github' if i % 2 else 'slack'}_repo:r{i:06d}",
+            details="d",
+            severity=SEVERITIES[i % 4],
+        )
+
+
+def test_summary_groups_and_pages_in_one_pass():
+    summary = ScanSummary(FindingFilter(severity=["critical"]), limit=10, offset=10)
+    for finding in _findings(20_000):
+        summary.add(finding)
+
+    assert summary.total == 20_000
+    assert summary.matched == 5_000
+    assert summary.counts["LOW"] == 5_000
+    assert summary.score == 100.0
+    assert len(summary._window) < 40
+
+    groups = summary.grouped()
+    assert {(g["rule_id"], g["provider"]) for g in groups} == {
+        ("RULE_3", "github"),
+        ("RULE_1", "github"),
+        ("RULE_4", "github"),
+        ("RULE_2", "github"),
+        ("RULE_0", "github"),
+    }
+    assert sum(g["count"] for g in groups) == 5_000
+
+    detail = summary.detail()
+    assert len(detail) == 10
+    assert all(f.severity == Severity.CRITICAL for f in detail)
+    assert [f.resource_id for f in detail] == sorted(f.resource_id for f in detail)
+    first_page = ScanSummary(FindingFilter(severity=["critical"]), limit=10)
+    for finding in _findings(20_000):
+        first_page.add(finding)
+    assert detail[0].rule_id == first_page.detail()[-1].rule_id
+    assert detail[0].resource_id > first_page.detail()[-1].resource_id
+
+
+def test_scan_ndjson_streams_filtered_findings():
+    result = CliRunner().invoke(
+        app, ["scan", "--format", "ndjson", "--rule", "GH_PUBLIC_REPO"]
+    )
+
+    rows = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [row["rule_id"] for row in rows] == ["GH_PUBLIC_REPO"]
+    assert rows[0]["fingerprint"]
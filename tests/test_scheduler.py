@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+from sspm_engine.engine import PROVIDERS, SSPMEngine
+from sspm_engine.models import Tenant
+from sspm_engine.orchestration.registry import TenantRegistry
+from sspm_engine.orchestration.scheduler import TenantScheduler
+
+EXAMPLES = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "sspm_engine", "examples"
+)
+
+
+def _mock_tenant(tenant_id, providers=("slack", "github", "google")):
+    files = {"slack": "mock_slack.json", "github": "mock_github.json"}
+    files["google"] = "mock_gw.json"
+    settings = {p: {"mock_file": os.path.join(EXAMPLES, files[p])} for p in providers}
+    return Tenant(id=tenant_id, **settings)
+
+
+def test_scheduler_isolates_tenant_results():
+    registry = TenantRegistry(
+        [_mock_tenant(f"tenant-{i}") for i in range(6)]
+        + [_mock_tenant("github-only", providers=("github",))]
+    )
+    results = TenantScheduler(registry, max_workers=4).run()
+
+    expected = SSPMEngine(tenant=_mock_tenant("reference")).run_scan()
+    assert len(results) == 7
+    for i in range(6):
+        result = results[f"tenant-{i}"]
+        assert result.metadata["tenant_id"] == f"tenant-{i}"
+        assert result.metadata["errors"] == {}
+        assert result.score == expected.score
+        assert sorted(f.rule_id for f in result.findings) == sorted(
+            f.rule_id for f in expected.findings
+        )
+
+    github_only = results["github-only"]
+    assert github_only.metadata["providers"] == ["github"]
+    assert all(f.resource_id.startswith("github_") for f in github_only.findings)
+
+
+def test_scheduler_caps_workers_per_tenant():
+    lock = threading.Lock()
+    active = {}
+    peaks = {}
+
+    class SlowEngine:
+        def __init__(self, tenant):
+            self.tenant = tenant
+            self.risk_engine = SSPMEngine().risk_engine
+
+        def fetch_provider(self, name):
+            with lock:
+                active[self.tenant.id] = active.get(self.tenant.id, 0) + 1
+                peaks[self.tenant.id] = max(
+                    peaks.get(self.tenant.id, 0), active[self.tenant.id]
+                )
+            time.sleep(0.02)
+            with lock:
+                active[self.tenant.id] -= 1
+            return {}
+
+        def scan_data(self, data):
+            return []
+
+    registry = TenantRegistry(
+        [_mock_tenant("large")]
+        + [_mock_tenant(f"small-{i}", ("slack",)) for i in range(3)]
+    )
+    scheduler = TenantScheduler(registry, max_workers=4, engine_factory=SlowEngine)
+    results = scheduler.run()
+
+    assert set(results) == {"large", "small-0", "small-1", "small-2"}
+    assert max(peaks.values()) == 1
+    assert set(scheduler.cost_estimates) == set(results)
+
+
+def test_registry_loads_example_file():
+    registry = TenantRegistry.from_file(os.path.join(EXAMPLES, "tenants.yaml"))
+
+    assert registry.ids() == ["acme", "globex"]
+    assert registry.get("globex").providers == ["github"]
+    assert os.path.exists(registry.get("acme").slack["mock_file"])
+
+
+def test_tenant_providers_follow_engine_order():
+    tenant = Tenant(id="t", google={"mock_file": "gw.json"}, slack={"token": "x"})
+    assert tenant.providers == ["slack", "google"]
+    assert _mock_tenant("all").providers == list(PROVIDERS)
@@ -0,0 +1,79 @@
+import pytest
+
+from benchmarks.secret_scan import run
+from sspm_engine.scanners import entropy
+from sspm_engine.scanners.entropy import EntropyDetector, token_hash
+from sspm_engine.scanners.secret_scanner import SecretScanner
+
+TOKEN = "9fK2mQx7Lp0sVt4RbN8cZw1yHe5"
+
+
+def test_entropy_scores_and_charsets():
+    tokens = ["a" * 20, "ab" * 10, "0123456789abcdef" * 2, TOKEN]
+    scores = entropy.shannon_entropy(tokens, batch_size=3)
+    assert scores[:3] == pytest.approx([0.0, 1.0, 4.0])
+    assert scores == pytest.approx([entropy._entropy(t) for t in tokens])
+
+    candidates = entropy.extract_candidates(
+        [None, f"id 12345678901234567890123 salt {'0a' * 16} key={TOKEN}"]
+    )
+    assert [(c.source, c.charset) for c in candidates] == [
+        (1, "hex"),
+        (1, "base64"),
+    ]
+    assert candidates[1].token == TOKEN
+
+    with pytest.raises(ValueError):
+        EntropyDetector(thresholds={"decimal": 3.0})
+
+
+def test_scanner_reports_unknown_formats_once():
+    repos = [
+        {"name": "api", "description": f"deploy token {TOKEN}"},
+        {
+            "name": "legacy",
+            "description": "api_key = 'Zx9Qw2Er4Ty6Ui8Op0As1Df3Gh5Jk7Lm'",
+        },
+        {"name": "docs", "description": "nothing_secret_in_this_long_identifier"},
+        {
+            "name": "release",
+            "description": "Built from commit 3f2a9c1b7d4e5f60718293a4b5c6d7e8f9012345"
+            " as image sha256:9b2c4e6f8a0b1c3d5e7f9a1b3c5d7e9f0a2b4c6d8e0f1a3b5c7d9e1f3"
+            " (md5:9b2c4e6f8a0b1c3d5e7f9a1b3c5d7e9f)",
+        },
+    ]
+    findings = SecretScanner({}).scan({"github_repos": repos})
+
+    # The generic API key is reported by its pattern, not again by entropy.
+    assert [(f.rule_id, f.resource_id, f.data["pattern"]) for f in findings] == [
+        ("GH_SECRET_LEAK", "github_repo:legacy", "GENERIC_API_KEY"),
+        ("GH_HIGH_ENTROPY_STRING", "github_repo:api", "HIGH_ENTROPY_BASE64"),
+    ]
+    leak = findings[1]
+    assert leak.data["sha256"] == token_hash(TOKEN)
+    assert TOKEN not in leak.details
+
+    config = {"scanning": {"secret_allowlist": [token_hash(TOKEN).upper()]}}
+    assert SecretScanner(config).scan({"github_repos": repos[:1]}) == []
+
+
+def test_only_labelled_hex_is_treated_as_a_digest():
+    key = "3f2a9c1b7d4e5f60718293a4b5c6d7e8f9012345"
+    texts = [
+        f"deploy token {key}",
+        f"Built from commit {key}",
+        f'{{"sha": "{key}"}}',
+        f"image sha256:{key}{key[:24]}",
+        f"recommit {key}",
+    ]
+
+    hits = EntropyDetector().detect(texts)
+
+    assert [(hit.source, hit.charset) for hit in hits] == [(0, "hex"), (4, "hex")]
+
+
+def test_secret_scan_benchmark():
+    results = run(repos=300, text_bytes=512, secret_share=0.2)
+    assert results["planted"] > 0
+    assert results["planted_found"] >= 0.9 * results["planted"]
+    assert results["unplanted_findings"] == 0
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import budget for `sspmctl --help`, in milliseconds. CI machines
+# vary a lot, so this is deliberately generous; override it locally with
+# SSPM_STARTUP_BUDGET_MS to track regressions more tightly.
+STARTUP_BUDGET_MS = float(os.getenv("SSPM_STARTUP_BUDGET_MS", "1500"))
+
+HEAVY_MODULES = ["github", "slack_sdk", "googleapiclient", "jinja2", "yaml"]
+
+
+def _import_times(*args):
+    """Runs Python with -X importtime and returns {module: self time in us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def test_cli_help_startup_budget():
+    times = _import_times("-m", "sspm_engine.cli.sspmctl", "--help")
+
+    for module in HEAVY_MODULES + ["sspm_engine.engine"]:
+        assert module not in times, f"{module} imported by `sspmctl --help`"
+
+    total_ms = sum(times.values()) / 1000
+    assert total_ms < STARTUP_BUDGET_MS, f"startup took {total_ms:.0f}ms"
+
+
+def test_single_provider_scan_imports_only_its_sdk():
+    code = (
+        "import sys\n"
+        "from sspm_engine.engine import SSPMEngine\n"
+        "SSPMEngine().run_scan('slack')\n"
+        "print(','.join(m for m in ('slack_sdk', 'github', 'jinja2') "
+        "if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert proc.stdout.strip() == "slack_sdk"
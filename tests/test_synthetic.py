@@ -0,0 +1,55 @@
+from benchmarks.run_benchmarks import compare, run_case
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.synthetic import generate_tenant, kind_counts, write_tenant
+
+
+def _materialize(resources, seed):
+    return {kind: list(items) for kind, items in generate_tenant(resources, seed)}
+
+
+def test_generate_tenant_is_deterministic():
+    first = _materialize(500, seed=3)
+
+    assert first == _materialize(500, seed=3)
+    assert first != _materialize(500, seed=4)
+    assert {kind: len(items) for kind, items in first.items()} == kind_counts(500)
+
+
+def test_write_tenant_is_scannable(tmp_path):
+    tenant = write_tenant(str(tmp_path), 2000, seed=1)
+
+    result = SSPMEngine(tenant=tenant).run_scan("all")
+
+    assert {f.provider for f in result.findings} == {"slack", "github", "google"}
+    assert {f.rule_id for f in result.findings} >= {
+        "SLACK_EXT_GUEST",
+        "GH_PUBLIC_REPO",
+        "GH_NO_BRANCH_PROTECTION",
+        "GW_PUBLIC_DOC",
+    }
+
+
+def test_run_case_reports_throughput(tmp_path):
+    tenant = write_tenant(str(tmp_path / "data"), 1000)
+
+    stats = run_case("analyze", tenant, str(tmp_path))
+
+    assert stats["items"] > 0
+    assert stats["throughput"] > 0
+    assert stats["runs"] >= 3
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "scan:A": {"throughput": 1000.0, "peak_rss_mb": 100.0},
+        "scan:B": {"throughput": 1000.0, "peak_rss_mb": 100.0},
+    }
+    results = {
+        "scan:A": {"throughput": 900.0, "peak_rss_mb": 110.0},
+        "scan:B": {"throughput": 500.0, "peak_rss_mb": 200.0},
+    }
+
+    regressions = compare(results, baseline, tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert all(r.startswith("scan:B") for r in regressions)
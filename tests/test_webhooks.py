@@ -0,0 +1,187 @@
+import hashlib
+import hmac
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sspm_engine.api.webhooks import verify_github_signature, verify_slack_signature
+from sspm_engine.engine import SSPMEngine
+from sspm_engine.inventory import Inventory
+
+WEBHOOKS = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "sspm_engine", "examples", "webhooks"
+)
+
+
+def _payload(name):
+    with open(os.path.join(WEBHOOKS, name), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(autouse=True)
+def unsigned_webhooks(monkeypatch):
+    # Replay the recorded payloads unsigned, as with api.webhooks.insecure.
+    from sspm_engine.api import server
+
+    for variable in ("GITHUB_WEBHOOK_SECRET", "SLACK_SIGNING_SECRET"):
+        monkeypatch.delenv(variable, raising=False)
+    api = server.engine.config.setdefault("api", {})
+    monkeypatch.setitem(api, "webhooks", {"insecure": True})
+
+
+def _client():
+    from sspm_engine.api import server
+
+    server.inventory.loaded = False
+    return TestClient(server.app), server
+
+
+def test_inventory_reevaluates_single_resource():
+    engine = SSPMEngine()
+    inventory = Inventory(engine)
+    inventory.load(engine.collect("all"))
+    baseline = {f.rule_id for f in inventory.findings()}
+
+    findings = inventory.upsert(
+        "github_repos", {"name": "website-public", "private": True}
+    )
+
+    assert findings == []
+    assert "GH_PUBLIC_REPO" in baseline
+    assert "GH_PUBLIC_REPO" not in {f.rule_id for f in inventory.findings()}
+    assert inventory.result().metadata["resources"]["github_repos"] == 2
+
+
+def test_github_repository_publicized():
+    client, server = _client()
+
+    started = time.monotonic()
+    response = client.post(
+        "/webhooks/github",
+        content=_payload("github_repository_publicized.json"),
+        headers={"X-GitHub-Event": "repository"},
+    )
+    elapsed = time.monotonic() - started
+
+    changes = response.json()["changes"]
+    assert [c["key"] for c in changes] == ["internal-backend"]
+    assert {f["rule_id"] for f in changes[0]["findings"]} == {"GH_PUBLIC_REPO"}
+    assert elapsed < 1.0
+
+    resource_ids = {
+        f["resource_id"] for f in client.get("/inventory").json()["findings"]
+    }
+    assert "github_repo:internal-backend" in resource_ids
+
+
+def test_github_admin_member_added_without_mfa():
+    client, _ = _client()
+    response = client.post(
+        "/webhooks/github",
+        content=_payload("github_organization_member_added.json"),
+        headers={"X-GitHub-Event": "organization"},
+    )
+
+    findings = response.json()["changes"][0]["findings"]
+    assert [f["resource_id"] for f in findings] == ["github_user:mallory"]
+
+
+def test_slack_admin_loses_2fa():
+    client, _ = _client()
+    response = client.post(
+        "/webhooks/slack", content=_payload("slack_user_change.json")
+    )
+
+    changes = response.json()["changes"]
+    assert changes[0]["key"] == "U12345"
+    assert [f["rule_id"] for f in changes[0]["findings"]] == ["SLACK_NO_MFA"]
+
+
+def test_slack_url_verification():
+    client, _ = _client()
+    response = client.post(
+        "/webhooks/slack", content=_payload("slack_url_verification.json")
+    )
+
+    assert response.json()["challenge"].startswith("3eZbrw1aBm2r")
+
+
+def test_signatures(monkeypatch):
+    body = _payload("github_repository_publicized.json")
+    digest = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    assert verify_github_signature("s3cret", body, f"sha256={digest}")
+    assert not verify_github_signature("s3cret", body, "sha256=deadbeef")
+
+    ts = str(int(time.time()))
+    base = f"v0:{ts}:".encode() + body
+    signature = "v0=" + hmac.new(b"s3cret", base, hashlib.sha256).hexdigest()
+    assert verify_slack_signature("s3cret", body, ts, signature)
+    assert not verify_slack_signature("s3cret", body, "1", signature)
+
+    monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "s3cret")
+    client, _ = _client()
+    response = client.post(
+        "/webhooks/github",
+        content=json.dumps({"zen": "hi"}),
+        headers={"X-GitHub-Event": "ping", "X-Hub-Signature-256": "sha256=bad"},
+    )
+    assert response.status_code == 401
+
+
+def test_unsigned_webhooks_need_a_secret(monkeypatch):
+    client, server = _client()
+    monkeypatch.setitem(server.engine.config["api"], "webhooks", {"insecure": False})
+    body = _payload("github_repository_publicized.json")
+    headers = {"X-GitHub-Event": "repository"}
+
+    for path in ("/webhooks/github", "/webhooks/slack"):
+        response = client.post(path, content=body, headers=headers)
+        assert response.status_code == 503, path
+
+    monkeypatch.setenv("GITHUB_WEBHOOK_SECRET", "s3cret")
+    response = client.post("/webhooks/github", content=body, headers=headers)
+    assert response.status_code == 401
+
+    digest = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+    headers["X-Hub-Signature-256"] = f"sha256={digest}"
+    response = client.post("/webhooks/github", content=body, headers=headers)
+    assert response.status_code == 200
+    assert [c["key"] for c in response.json()["changes"]] == ["internal-backend"]
+
+
+def test_malformed_payloads_are_rejected():
+    client, _ = _client()
+    for path, body in [
+        ("/webhooks/github", b"{not json"),
+        ("/webhooks/github", b"[1, 2]"),
+        ("/webhooks/slack", b"\xff"),
+        ("/webhooks/slack", json.dumps({"event": "member_joined"})),
+    ]:
+        response = client.post(path, content=body, headers={"X-GitHub-Event": "push"})
+        assert response.status_code == 400, (path, body)
+
+
+def test_incomplete_provider_is_loaded_later(monkeypatch):
+    client, server = _client()
+    fetch_provider = server.engine.fetch_provider
+    failures = ["slack"]
+
+    def flaky_fetch(name, status=None, **kwargs):
+        data = fetch_provider(name, status=status, **kwargs)
+        if name in failures:
+            failures.remove(name)
+            status[name].update(complete=False, error="rate limited")
+            return {key: [] for key in data}
+        return data
+
+    monkeypatch.setattr(server.engine, "fetch_provider", flaky_fetch)
+
+    first = client.get("/inventory").json()
+    assert not any(f["resource_id"].startswith("slack") for f in first["findings"])
+    assert "slack" in server._pending_providers
+    second = client.get("/inventory").json()
+    assert any(f["resource_id"].startswith("slack") for f in second["findings"])
+    assert not server._pending_providers